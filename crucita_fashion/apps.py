@@ -0,0 +1,9 @@
+# pylint: skip-file
+from django.apps import AppConfig
+
+
+class CrucitaFashionConfig(AppConfig):
+    name = 'crucita_fashion'
+
+    def ready(self):
+        from crucita_fashion import conexiones  # noqa: F401
@@ -0,0 +1,205 @@
+"""
+Modulo con las utilidades que usan los comandos
+benchmark_*: mide el tiempo y el numero de consultas
+de una peticion repetida y muestra los resultados
+"""
+import json
+import math
+import time
+from contextlib import contextmanager
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from inventario.cache import CACHE_CODIGOS, GRUPO_PRODUCTOS, GRUPO_CATEGORIAS
+from usuarios.models import Usuario
+from crucita_fashion.datos_sinteticos import crear_productos
+from crucita_fashion.respuestas import invalidar_grupo
+
+PERCENTILES = (50, 95, 99)
+
+USUARIO = "benchmark"
+CLAVE = "benchmark-clave-64"
+
+class _Revertir(Exception):
+    """
+    Excepcion usada para revertir los
+    datos creados por un benchmark
+    """
+
+def cliente():
+    """
+    Devuelve un cliente de la api. Se usa localhost
+    porque testserver no esta en ALLOWED_HOSTS fuera
+    de las pruebas
+    """
+    return APIClient(SERVER_NAME='localhost')
+
+def crear_usuario(grupo, username=USUARIO):
+    """
+    Crea un usuario del grupo con la clave de los
+    benchmarks, debe llamarse dentro de datos_temporales
+    """
+    grupo, _ = Group.objects.get_or_create(name=grupo)
+    usuario = Usuario(username=username, email="{}@crucita.fashion".format(username),
+                      grupo=grupo, is_superuser=grupo.name == "SuperUsuario")
+    usuario.set_password(CLAVE)
+    usuario.save()
+    return usuario
+
+def crear_usuario_staff():
+    """
+    Crea el usuario administrador que usan los
+    benchmarks, debe llamarse dentro de datos_temporales
+    """
+    return crear_usuario("Administrador")
+
+def cliente_sesion():
+    """
+    Devuelve un cliente con la sesion iniciada
+    con el usuario de los benchmarks
+    """
+    api = cliente()
+    api.post(reverse('usuarios:login'), {'username': USUARIO, 'password': CLAVE})
+    return api
+
+def cliente_jwt(username=USUARIO):
+    """
+    Devuelve un cliente autenticado con el token
+    JWT del usuario (por defecto el de los benchmarks)
+    """
+    api = cliente()
+    tokens = api.post(reverse('usuarios:token'), {'username': username, 'password': CLAVE}).data
+    api.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+    return api
+
+@contextmanager
+def datos_temporales():
+    """
+    Ejecuta el bloque dentro de una transaccion que
+    se revierte al final, asi los datos creados por el
+    benchmark no quedan en la base de datos. Despues se
+    descartan las respuestas y codigos guardados en cache
+    durante el bloque, que incluyen los datos revertidos
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise _Revertir()
+    except _Revertir:
+        pass
+    finally:
+        CACHE_CODIGOS.limpiar()
+        for grupo in (GRUPO_PRODUCTOS, GRUPO_CATEGORIAS):
+            invalidar_grupo(grupo)
+
+@contextmanager
+def catalogo_temporal(productos):
+    """
+    Crea un catalogo sintetico con el numero de productos
+    indicado y devuelve un cliente JWT del usuario de los
+    benchmarks. Todo se revierte al terminar el bloque
+    """
+    with datos_temporales():
+        crear_productos(productos)
+        crear_usuario_staff()
+        yield cliente_jwt()
+
+def percentil(valores, porcentaje):
+    """
+    Devuelve el percentil indicado de los valores
+    (metodo del rango mas cercano)
+    """
+    ordenados = sorted(valores)
+    posicion = max(int(math.ceil(porcentaje / 100.0 * len(ordenados))) - 1, 0)
+    return ordenados[posicion]
+
+def medir(peticion, repeticiones, calentamiento=5):
+    """
+    Ejecuta la peticion (funcion sin argumentos que
+    devuelve la respuesta o el resultado de una consulta)
+    varias veces y devuelve el promedio de consultas, los
+    percentiles del tiempo en milisegundos y las peticiones
+    por segundo de un solo cliente
+    """
+    for _ in range(calentamiento):
+        peticion()
+
+    tiempos = []
+    consultas = 0
+    for _ in range(repeticiones):
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = time.perf_counter()
+            respuesta = peticion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas += len(capturadas)
+
+    resultado = {
+        'estado': getattr(respuesta, 'status_code', '-'),
+        'consultas': consultas / float(repeticiones),
+        'por_segundo': repeticiones / max(sum(tiempos) / 1000, 1e-9),
+    }
+    for porcentaje in PERCENTILES:
+        resultado['p{}'.format(porcentaje)] = percentil(tiempos, porcentaje)
+    return resultado
+
+def tabla(resultados):
+    """
+    Devuelve las lineas de una tabla con los
+    resultados de cada caso medido
+    """
+    columnas = ['estado', 'consultas'] + ['p{}'.format(p) for p in PERCENTILES] + ['por_seg']
+    ancho = max(len(nombre) for nombre in resultados) + 2
+    lineas = ['caso'.ljust(ancho) + ''.join(columna.rjust(11) for columna in columnas)]
+    for nombre, resultado in resultados.items():
+        celdas = [str(resultado['estado']), '{:.2f}'.format(resultado['consultas'])]
+        celdas += ['{:.2f}ms'.format(resultado['p{}'.format(p)]) for p in PERCENTILES]
+        celdas.append('{:.1f}'.format(resultado['por_segundo']))
+        lineas.append(nombre.ljust(ancho) + ''.join(celda.rjust(11) for celda in celdas))
+    return lineas
+
+def guardar(ruta, resultados):
+    """
+    Guarda los resultados en un
+    archivo JSON
+    """
+    with open(ruta, 'w') as archivo:
+        json.dump(resultados, archivo, indent=2, sort_keys=True)
+        archivo.write('\n')
+
+def cargar(ruta):
+    """
+    Devuelve los resultados guardados
+    en un archivo JSON
+    """
+    with open(ruta) as archivo:
+        return json.load(archivo)
+
+def regresiones(actuales, base, tolerancia, minimo_ms):
+    """
+    Compara los casos medidos con los de la base y devuelve
+    (caso, motivo) de cada regresion: un p95 mas de tolerancia
+    (fraccion) y mas de minimo_ms por encima del de la base,
+    mas consultas o un codigo de estado distinto. Los casos
+    que no estan en la base no se comparan
+    """
+    encontradas = []
+    for nombre, resultado in actuales.items():
+        anterior = base.get(nombre)
+        if anterior is None:
+            continue
+        if resultado['estado'] != anterior['estado']:
+            encontradas.append((nombre, "estado {} (base {})".format(
+                resultado['estado'], anterior['estado']
+            )))
+        if resultado['consultas'] > anterior['consultas']:
+            encontradas.append((nombre, "{:.2f} consultas (base {:.2f})".format(
+                resultado['consultas'], anterior['consultas']
+            )))
+        diferencia = resultado['p95'] - anterior['p95']
+        if diferencia > minimo_ms and diferencia > anterior['p95'] * tolerancia:
+            encontradas.append((nombre, "p95 {:.2f}ms (base {:.2f}ms, {:+.0%})".format(
+                resultado['p95'], anterior['p95'], diferencia / max(anterior['p95'], 1e-9)
+            )))
+    return encontradas
@@ -0,0 +1,264 @@
+"""
+Modulo con los casos del comando benchmark_endpoints: una
+o mas peticiones por cada url de inventario, ventas y
+usuarios. Los casos usan los datos que ya existen en la base
+de datos y crean los usuarios y el producto que necesitan, por
+lo que deben prepararse dentro de datos_temporales
+"""
+import itertools
+import time
+from collections import namedtuple
+from datetime import date
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+from inventario import urls as urls_inventario
+from inventario.models import Categoria, Producto
+from usuarios import urls as urls_usuarios
+from ventas import urls as urls_ventas
+from ventas.models import Ventas
+from crucita_fashion import benchmark
+
+MODULOS_URLS = (urls_inventario, urls_ventas, urls_usuarios)
+
+# Productos pedidos por inventario:lote y filas de inventario:importar
+PRODUCTOS_LOTE = 50
+FILAS_IMPORTAR = 100
+
+# Segundos despues de los cuales se piden nuevos tokens JWT, menos
+# que la duracion de los access token (JWT_ACCESS_MINUTOS)
+RENOVAR_TOKENS = 60
+
+# nombre: nombre del caso, url: nombre de la url que mide, peticion:
+# funcion sin argumentos que devuelve la respuesta, pesado: se mide con
+# menos repeticiones (ej: exportaciones), ajustes: settings del caso
+Caso = namedtuple('Caso', ('nombre', 'url', 'peticion', 'pesado', 'ajustes'))
+
+def caso(nombre, url, peticion, pesado=False, ajustes=None):
+    """
+    Crea un caso, por defecto no es
+    pesado y no cambia settings
+    """
+    return Caso(nombre, url, peticion, pesado, ajustes or {})
+
+def nombres_de_urls():
+    """
+    Devuelve los nombres (con el namespace) de
+    todas las urls de inventario, ventas y usuarios
+    """
+    return {
+        '{}:{}'.format(modulo.app_name, patron.name)
+        for modulo in MODULOS_URLS
+        for patron in modulo.urlpatterns if patron.name
+    }
+
+def urls_sin_caso(casos):
+    """
+    Devuelve ordenados los nombres de las
+    urls que no tienen ningun caso
+    """
+    return sorted(nombres_de_urls() - {caso.url for caso in casos})
+
+def consumir(respuesta):
+    """
+    Lee el contenido de una respuesta por partes (ej:
+    exportaciones), asi se mide la respuesta completa
+    """
+    if respuesta.streaming:
+        for _ in respuesta.streaming_content:
+            pass
+    return respuesta
+
+class Escenario: # pylint: disable=too-many-instance-attributes
+    """
+    Usuarios, clientes y objetos que usan los casos. Se
+    crea un usuario de cada grupo y un producto con
+    existencias suficientes para las ventas
+    """
+
+    def __init__(self):
+        """
+        Crea los usuarios y el producto
+        y lee los objetos existentes
+        """
+        self.numeros = itertools.count()
+        self.admin = benchmark.crear_usuario("Administrador")
+        self.vendedor = benchmark.crear_usuario("Vendedor", "benchmark-vendedor")
+        self.cliente = benchmark.crear_usuario("Cliente", "benchmark-cliente")
+        self.categoria, _ = Categoria.objects.get_or_create(nombre="Accesorio")
+        self.producto = Producto.objects.create(codigo="benchmark-producto", cantidad=10 ** 9,
+                                                costo=10, categoria=self.categoria)
+        self.venta = Ventas.objects.order_by('pk').first()
+        self.lote = ','.join(str(pk) for pk in Producto.objects.order_by('pk').values_list(
+            'pk', flat=True
+        )[:PRODUCTOS_LOTE])
+        self.anonimo = benchmark.cliente()
+        self.api_admin = benchmark.cliente()
+        self.api_vendedor = benchmark.cliente()
+        self.api_cliente = benchmark.cliente()
+        self.tokens = {}
+        self.renovado = None
+        self.renovar()
+
+    def renovar(self):
+        """
+        Pide nuevos tokens JWT para los clientes si pasaron
+        RENOVAR_TOKENS segundos, los access token vencen a
+        los pocos minutos
+        """
+        if self.renovado is not None and time.monotonic() - self.renovado < RENOVAR_TOKENS:
+            return
+        self.renovado = time.monotonic()
+        for api, usuario in ((self.api_admin, self.admin), (self.api_vendedor, self.vendedor),
+                             (self.api_cliente, self.cliente)):
+            self.tokens = self.anonimo.post(reverse('usuarios:token'), {
+                'username': usuario.username, 'password': benchmark.CLAVE
+            }).data
+            api.credentials(HTTP_AUTHORIZATION='Bearer ' + self.tokens['access'])
+
+    def unico(self, prefijo):
+        """
+        Devuelve un valor distinto en cada
+        llamada, para las peticiones que crean
+        """
+        return "{}-{}".format(prefijo, next(self.numeros))
+
+    def datos_usuario(self, grupo):
+        """
+        Devuelve los datos de
+        un usuario nuevo
+        """
+        username = self.unico("benchmark-nuevo")
+        return {
+            'username': username, 'email': "{}@crucita.fashion".format(username),
+            'first_name': "Nuevo", 'last_name': "Usuario", 'password': benchmark.CLAVE,
+            'repeat_password': benchmark.CLAVE, 'grupo': grupo,
+        }
+
+    def importar(self):
+        """
+        Importa un CSV de FILAS_IMPORTAR productos,
+        a partir de la segunda vez los actualiza
+        """
+        filas = ''.join(
+            "benchmark-importado-{},{},10.5,{},,\n".format(numero, numero + 1, self.categoria.pk)
+            for numero in range(FILAS_IMPORTAR)
+        )
+        archivo = SimpleUploadedFile(
+            "productos.csv", ("codigo,cantidad,costo,categoria,talla,foto\n" + filas).encode()
+        )
+        return self.api_admin.post(reverse('inventario:importar'), {'archivo': archivo},
+                                   format='multipart')
+
+    def casos_inventario(self):
+        """
+        Devuelve los casos de
+        las urls de inventario
+        """
+        api = self.api_admin
+        producto = self.producto
+        buscar = reverse('inventario:buscar')
+        return [
+            caso("GET inventario:buscar", 'inventario:buscar', lambda: api.get(buscar)),
+            caso("GET inventario:buscar sin cache", 'inventario:buscar',
+                 lambda: api.get(buscar, {'categoria': self.categoria.pk}),
+                 ajustes={'RESPUESTAS_CACHE_ACTIVO': False}),
+            caso("GET inventario:editar", 'inventario:editar',
+                 lambda: api.get(reverse('inventario:editar', args=(producto.pk,)))),
+            # ProductoSerializer.validate necesita la categoria aunque sea parcial
+            caso("PATCH inventario:editar", 'inventario:editar',
+                 lambda: api.patch(reverse('inventario:editar', args=(producto.pk,)),
+                                   {'costo': 11, 'categoria': self.categoria.pk}, format='json')),
+            caso("GET inventario:codigo", 'inventario:codigo',
+                 lambda: api.get(reverse('inventario:codigo', args=(producto.codigo,)))),
+            caso("GET inventario:lote", 'inventario:lote',
+                 lambda: api.get(reverse('inventario:lote'), {'ids': self.lote})),
+            caso("POST inventario:crear", 'inventario:crear',
+                 lambda: api.post(reverse('inventario:crear'), {
+                     'codigo': self.unico("benchmark-creado"), 'cantidad': 1, 'costo': 10,
+                     'categoria': self.categoria.pk,
+                 }, format='json')),
+            caso("POST inventario:importar", 'inventario:importar', self.importar),
+            caso("GET inventario:exportar", 'inventario:exportar',
+                 lambda: consumir(api.get(reverse('inventario:exportar'))), pesado=True),
+            caso("GET inventario:categorias", 'inventario:categorias',
+                 lambda: api.get(reverse('inventario:categorias'))),
+            caso("GET inventario:cache", 'inventario:cache',
+                 lambda: api.get(reverse('inventario:cache'))),
+        ]
+
+    def casos_ventas(self):
+        """
+        Devuelve los casos de
+        las urls de ventas
+        """
+        api = self.api_admin
+        casos = [
+            # Las ventas no tienen paginacion, se devuelven todas
+            caso("GET ventas:buscar", 'ventas:buscar',
+                 lambda: api.get(reverse('ventas:buscar'), {'fields': 'codigo,costo_total'}),
+                 pesado=True),
+            caso("POST ventas:crear", 'ventas:crear',
+                 lambda: api.post(reverse('ventas:crear'), {
+                     'codigo': self.unico("benchmark-venta"), 'fecha': str(date.today()),
+                     'hora': str(timezone.now()),
+                     'lineas': [{'producto': self.producto.pk, 'cantidad': 1}],
+                 }, format='json')),
+        ]
+        if self.venta is not None:
+            fecha = str(self.venta.fecha)
+            casos += [
+                caso("GET ventas:detalles", 'ventas:detalles',
+                     lambda: api.get(reverse('ventas:detalles', args=(self.venta.pk,)))),
+                # Un dia de ventas, exportar todas puede tomar minutos
+                caso("GET ventas:exportar", 'ventas:exportar',
+                     lambda: consumir(api.get(reverse('ventas:exportar'),
+                                              {'desde': fecha, 'hasta': fecha})),
+                     pesado=True),
+            ]
+        return casos
+
+    def casos_usuarios(self):
+        """
+        Devuelve los casos de
+        las urls de usuarios
+        """
+        anonimo = self.anonimo
+        credenciales = {'username': self.cliente.username, 'password': benchmark.CLAVE}
+        vendedor = self.vendedor.grupo_id
+        return [
+            caso("POST usuarios:crear", 'usuarios:crear',
+                 lambda: self.api_admin.post(reverse('usuarios:crear'),
+                                             self.datos_usuario(vendedor), format='json')),
+            caso("POST usuarios:registro", 'usuarios:registro',
+                 lambda: anonimo.post(reverse('usuarios:registro'),
+                                      self.datos_usuario(self.cliente.grupo_id), format='json')),
+            caso("GET usuarios:administracion", 'usuarios:administracion',
+                 lambda: self.api_admin.get(reverse('usuarios:administracion',
+                                                    args=(self.cliente.pk,)))),
+            caso("POST usuarios:login", 'usuarios:login',
+                 lambda: benchmark.cliente().post(reverse('usuarios:login'), credenciales)),
+            caso("POST usuarios:token", 'usuarios:token',
+                 lambda: anonimo.post(reverse('usuarios:token'), credenciales)),
+            caso("POST usuarios:token_refrescar", 'usuarios:token_refrescar',
+                 lambda: anonimo.post(reverse('usuarios:token_refrescar'),
+                                      {'refresh': self.tokens['refresh']})),
+            caso("POST usuarios:token_verificar", 'usuarios:token_verificar',
+                 lambda: anonimo.post(reverse('usuarios:token_verificar'),
+                                      {'token': self.tokens['access']})),
+            caso("GET usuarios:vendedor_detalles", 'usuarios:vendedor_detalles',
+                 lambda: self.api_vendedor.get(reverse('usuarios:vendedor_detalles',
+                                                       args=(self.cliente.pk,)))),
+            caso("GET usuarios:perfil", 'usuarios:perfil',
+                 lambda: self.api_cliente.get(reverse('usuarios:perfil',
+                                                      args=(self.cliente.pk,)))),
+            caso("GET usuarios:buscar", 'usuarios:buscar',
+                 lambda: self.api_admin.get(reverse('usuarios:buscar'),
+                                            {'grupo': self.cliente.grupo_id})),
+        ]
+
+    def casos(self):
+        """
+        Devuelve todos los casos
+        """
+        return self.casos_inventario() + self.casos_ventas() + self.casos_usuarios()
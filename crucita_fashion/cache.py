@@ -0,0 +1,88 @@
+"""
+Modulo que contiene un cache en memoria del proceso,
+acotado (LRU) y con tiempo de vida por entrada. El tiempo
+de vida limita cuanto puede durar un dato viejo en los
+procesos que no vieron la invalidacion (cada proceso de
+gunicorn tiene su propio cache)
+"""
+import time
+from collections import OrderedDict
+from threading import Lock
+
+class CacheLRU:
+    """
+    Cache que guarda como maximo `maximo` entradas, descartando
+    la usada hace mas tiempo, y en el que cada entrada vence
+    `ttl` segundos despues de guardarse. Es seguro usarlo
+    desde varios hilos
+    """
+
+    def __init__(self, maximo, ttl):
+        """
+        Crea el cache vacio
+        """
+        self.maximo = maximo
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._candado = Lock()
+
+    def __len__(self):
+        """
+        Devuelve el numero de entradas
+        guardadas
+        """
+        return len(self._entradas)
+
+    def obtener(self, llave):
+        """
+        Devuelve el valor guardado en la llave, o
+        None si no existe o ya vencio
+        """
+        with self._candado:
+            entrada = self._entradas.get(llave)
+            if entrada is None or entrada[0] < time.monotonic():
+                if entrada is not None:
+                    del self._entradas[llave]
+                self.fallos += 1
+                return None
+            self._entradas.move_to_end(llave)
+            self.aciertos += 1
+            return entrada[1]
+
+    def guardar(self, llave, valor):
+        """
+        Guarda el valor en la llave, descartando la
+        entrada usada hace mas tiempo si el cache esta lleno
+        """
+        with self._candado:
+            self._entradas[llave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(llave)
+            while len(self._entradas) > self.maximo:
+                self._entradas.popitem(last=False)
+
+    def eliminar(self, llave):
+        """
+        Elimina la entrada de la llave
+        si existe
+        """
+        with self._candado:
+            self._entradas.pop(llave, None)
+
+    def eliminar_si(self, condicion):
+        """
+        Elimina las entradas cuyo valor cumple
+        la condicion
+        """
+        with self._candado:
+            llaves = [llave for llave, (_, valor) in self._entradas.items() if condicion(valor)]
+            for llave in llaves:
+                del self._entradas[llave]
+
+    def limpiar(self):
+        """
+        Elimina todas las entradas
+        """
+        with self._candado:
+            self._entradas.clear()
@@ -0,0 +1,111 @@
+"""
+Modulo que permite pedir solo algunos campos de un
+serializer con los parametros fields y omit (ej:
+?fields=codigo,cantidad o ?omit=foto). Se reduce tanto la
+respuesta como las columnas que se leen de la base de datos
+"""
+from rest_framework.request import Request
+
+def _nombres(request, parametro):
+    """
+    Devuelve el conjunto de nombres del parametro
+    separado por comas, o None si no esta
+    """
+    if parametro not in request.query_params:
+        return None
+    valores = request.query_params[parametro].split(',')
+    return {valor.strip() for valor in valores if valor.strip()}
+
+def _lookups(relaciones, prefijo=''):
+    """
+    Convierte el diccionario de select_related de un
+    query en la lista de lookups que lo generan
+    """
+    for relacion, anidadas in relaciones.items():
+        yield prefijo + relacion
+        for lookup in _lookups(anidadas, prefijo + relacion + '__'):
+            yield lookup
+
+def campos_de_ordenamiento(vista, queryset):
+    """
+    Devuelve los campos por los que ordenan los filtros
+    de la vista, la paginacion por cursor los lee de cada fila
+    """
+    campos = set()
+    for backend in getattr(vista, 'filter_backends', ()):
+        if hasattr(backend, 'get_ordering'):
+            ordenamiento = backend().get_ordering(vista.request, queryset, vista) or ()
+            campos.update(campo.lstrip('-') for campo in ordenamiento)
+    return campos
+
+class CamposDinamicosMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin para serializers que elimina los campos que no
+    se pidieron en los parametros fields u omit del request
+    del contexto. Solo aplica a peticiones GET, los nombres
+    que no son campos se ignoran. En dependencias se indican
+    los atributos del modelo que usa cada campo calculado
+    """
+    dependencias = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Elimina los campos que no
+        se pidieron
+        """
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if not isinstance(request, Request) or request.method != 'GET':
+            return
+
+        pedidos = _nombres(request, 'fields')
+        omitidos = _nombres(request, 'omit') or set()
+        for nombre in list(self.fields):
+            if (pedidos is not None and nombre not in pedidos) or nombre in omitidos:
+                self.fields.pop(nombre)
+
+    def atributos_usados(self):
+        """
+        Devuelve los atributos del modelo que
+        usan los campos que se van a mostrar
+        """
+        atributos = set()
+        for nombre, campo in self.fields.items():
+            if nombre in self.dependencias:
+                atributos.update(self.dependencias[nombre])
+            elif campo.source != '*':
+                atributos.add(campo.source.split('.')[0])
+        return atributos
+
+class CamposDinamicosViewMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin para vistas con un serializer con CamposDinamicosMixin.
+    Si se pidieron fields u omit, el queryset solo lee las
+    columnas y relaciones que usan los campos que se muestran
+    """
+
+    def get_queryset(self):
+        """
+        Limita las columnas, select_related y
+        prefetch_related del queryset
+        """
+        queryset = super().get_queryset()
+        if self.request.method != 'GET' or not (
+                'fields' in self.request.query_params or 'omit' in self.request.query_params):
+            return queryset
+
+        usados = self.get_serializer().atributos_usados() | campos_de_ordenamiento(self, queryset)
+        columnas = [campo.name for campo in queryset.model._meta.concrete_fields
+                    if campo.name in usados]
+        queryset = queryset.only(*columnas) if columnas else queryset.only('pk')
+
+        if isinstance(queryset.query.select_related, dict):
+            relaciones = [lookup for lookup in _lookups(queryset.query.select_related)
+                          if lookup.split('__')[0] in usados]
+            queryset = queryset.select_related(None).select_related(*relaciones)
+
+        prefetch = [
+            lookup for lookup in queryset._prefetch_related_lookups # pylint: disable=protected-access
+            if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in usados
+        ]
+        return queryset.prefetch_related(None).prefetch_related(*prefetch)
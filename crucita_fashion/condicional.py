@@ -0,0 +1,58 @@
+"""
+Modulo que contiene el soporte de peticiones GET
+condicionales (If-None-Match / If-Modified-Since) para
+las vistas de la api
+"""
+import hashlib
+from calendar import timegm
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+def calcular_etag(*partes):
+    """
+    Devuelve un ETag a partir de las partes
+    recibidas
+    """
+    contenido = '|'.join(str(parte) for parte in partes)
+    return quote_etag(hashlib.md5(contenido.encode('utf-8')).hexdigest())
+
+class GetCondicionalMixin:
+    """
+    Mixin para vistas con metodo get que agrega los
+    encabezados ETag y Last-Modified y responde 304 Not
+    Modified cuando el cliente ya tiene la ultima version.
+    Las vistas implementan get_validadores, que debe calcular
+    los validadores sin serializar la informacion
+    """
+
+    def get_validadores(self, request, *args, **kwargs):
+        """
+        Devuelve (etag, ultima modificacion) de la
+        respuesta, o None para responder sin validadores
+        """
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        """
+        Responde 304 si los validadores del cliente
+        coinciden, si no responde normalmente
+        """
+        validadores = self.get_validadores(request, *args, **kwargs)
+        if validadores is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, modificado = validadores
+        ultima_modificacion = timegm(modificado.utctimetuple()) if modificado else None
+        respuesta = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=ultima_modificacion
+        )
+        if respuesta is None:
+            respuesta = super().get(request, *args, **kwargs)
+
+        if respuesta.status_code in (200, 304):
+            respuesta['ETag'] = etag
+            if ultima_modificacion is not None:
+                respuesta['Last-Modified'] = http_date(ultima_modificacion)
+        return respuesta
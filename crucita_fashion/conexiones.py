@@ -0,0 +1,62 @@
+"""
+Modulo que verifica las conexiones persistentes a la base
+de datos (CONN_MAX_AGE) antes de reutilizarlas. Django 2.1
+solo descarta una conexion si tuvo errores o si vencio, una
+conexion que el servidor cerro mientras estaba inactiva
+(reinicio, idle timeout del pooler) hace fallar la primera
+peticion que la usa. Al empezar cada peticion, las conexiones
+inactivas por mas de DB_VERIFICAR_INACTIVA segundos se prueban
+con is_usable() y se cierran si no responden, la siguiente
+consulta abre una nueva. Cada prueba cuesta una ida y vuelta
+al servidor (SELECT 1), las conexiones usadas hace poco no
+se prueban
+"""
+import logging
+import time
+from django.conf import settings
+from django.core.signals import request_started, request_finished
+from django.db import connections
+from django.dispatch import receiver
+
+LOGGER = logging.getLogger(__name__)
+
+def verificar_conexiones():
+    """
+    Cierra las conexiones abiertas que estuvieron inactivas
+    mas de DB_VERIFICAR_INACTIVA segundos y no responden.
+    Devuelve cuantas conexiones se cerraron
+    """
+    intervalo = settings.DB_VERIFICAR_INACTIVA
+    if intervalo is None:
+        return 0
+    ahora = time.monotonic()
+    cerradas = 0
+    for conexion in connections.all():
+        if conexion.connection is None or conexion.in_atomic_block:
+            continue
+        if ahora - getattr(conexion, 'ultimo_uso', 0) < intervalo:
+            continue
+        if not conexion.is_usable():
+            LOGGER.warning("Se descarto la conexion %s, no respondio", conexion.alias)
+            conexion.close()
+            cerradas += 1
+    return cerradas
+
+@receiver(request_started)
+def verificar_al_empezar(sender, **kwargs): # pylint: disable=unused-argument
+    """
+    Verifica las conexiones despues de que Django
+    cierra las que vencieron
+    """
+    verificar_conexiones()
+
+@receiver(request_finished)
+def marcar_ultimo_uso(sender, **kwargs): # pylint: disable=unused-argument
+    """
+    Guarda cuando termino de usarse cada
+    conexion que sigue abierta
+    """
+    ahora = time.monotonic()
+    for conexion in connections.all():
+        if conexion.connection is not None:
+            conexion.ultimo_uso = ahora
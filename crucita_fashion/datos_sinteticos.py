@@ -0,0 +1,169 @@
+"""
+Modulo que genera datos sinteticos para los
+benchmarks. Los datos dependen de una semilla, asi
+dos corridas con la misma semilla son comparables
+"""
+import random
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import CommandError
+from django.utils import timezone
+from inventario.models import Categoria, Producto, TALLA_ROPA, TALLA_ZAPATOS
+from usuarios.models import Usuario, GRUPOS
+from ventas.models import Ventas, LineaVenta
+
+CATEGORIAS = ("Ropa", "Zapato", "Accesorio")
+
+# Fraccion de los productos que se generan agotados
+FRACCION_AGOTADOS = 0.05
+
+# Las ventas se reparten en el anio anterior a esta fecha
+FIN_VENTAS = datetime(2019, 1, 1, tzinfo=timezone.utc)
+
+# Solo puede haber un SuperUsuario, no se generan usuarios de ese grupo
+GRUPOS_SINTETICOS = tuple(grupo for grupo in GRUPOS if grupo != "SuperUsuario")
+
+NOMBRES = ("Ana", "Carlos", "Cruz", "Daniel", "David", "Maria", "Luis", "Rafael", "Rosa", "Sofia")
+APELLIDOS = ("Garcia", "Gonzalez", "Hernandez", "Lopez", "Martinez", "Perez", "Rodriguez",
+             "Sanchez")
+
+def verificar_entorno(permitir_produccion):
+    """
+    Lanza CommandError si DEBUG no esta activo y no se
+    indico --permitir-produccion, asi los comandos que
+    escriben datos de prueba no corren por error sobre
+    la base de datos de produccion
+    """
+    if not settings.DEBUG and not permitir_produccion:
+        raise CommandError(
+            "DEBUG no esta activo, use --permitir-produccion si de verdad quiere "
+            "correr este comando sobre esta base de datos"
+        )
+
+def _avisar(progreso, creados):
+    """
+    Llama a la funcion de progreso
+    si se indico una
+    """
+    if progreso is not None:
+        progreso(creados)
+
+def crear_categorias():
+    """
+    Crea las categorias si no existen y las
+    devuelve en un diccionario por nombre
+    """
+    return {
+        nombre: Categoria.objects.get_or_create(nombre=nombre)[0]
+        for nombre in CATEGORIAS
+    }
+
+def _talla(generador, categoria):
+    """
+    Devuelve una talla valida para
+    la categoria
+    """
+    if categoria == "Ropa":
+        return generador.choice(TALLA_ROPA)
+    if categoria == "Zapato":
+        return generador.choice(TALLA_ZAPATOS)
+    return None
+
+def crear_productos(total, semilla=0, lote=1000, prefijo="sintetico", progreso=None):
+    """
+    Crea total productos sinteticos por lotes con bulk_create
+    y devuelve cuantos se crearon. Despues de cada lote se
+    llama a progreso(creados) si se indica
+    """
+    generador = random.Random(semilla)
+    categorias = crear_categorias()
+    creados = 0
+    while creados < total:
+        productos = []
+        for numero in range(creados, min(creados + lote, total)):
+            categoria = generador.choice(CATEGORIAS)
+            agotado = generador.random() < FRACCION_AGOTADOS
+            productos.append(Producto(
+                codigo="{}-{}".format(prefijo, numero),
+                cantidad=0 if agotado else generador.randint(1, 200),
+                costo=round(generador.uniform(1, 500), 2),
+                categoria=categorias[categoria],
+                talla=_talla(generador, categoria),
+            ))
+        Producto.objects.bulk_create(productos)
+        creados += len(productos)
+        _avisar(progreso, creados)
+    return creados
+
+def crear_ventas(total, semilla=0, lote=1000, prefijo="sintetico", maximo_lineas=4,
+                 progreso=None):
+    """
+    Crea total ventas sinteticas por lotes con bulk_create,
+    cada una con entre 1 y maximo_lineas productos de los
+    existentes. Devuelve cuantas se crearon
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    generador = random.Random(semilla)
+    productos = list(Producto.objects.values_list('pk', 'costo').order_by('pk'))
+    creadas = 0
+    while creadas < total:
+        ventas = []
+        lineas = []
+        for numero in range(creadas, min(creadas + lote, total)):
+            hora = FIN_VENTAS - timedelta(seconds=generador.randint(1, 365 * 24 * 3600))
+            vendidos = generador.sample(productos, min(generador.randint(1, maximo_lineas),
+                                                       len(productos)))
+            cantidades = [generador.randint(1, 3) for _ in vendidos]
+            ventas.append(Ventas(
+                codigo="{}-{}".format(prefijo, numero),
+                costo_total=round(sum(costo * cantidad for (_, costo), cantidad
+                                      in zip(vendidos, cantidades)), 2),
+                fecha=hora.date(),
+                hora=hora,
+            ))
+            lineas.append(list(zip(vendidos, cantidades)))
+        Ventas.objects.bulk_create(ventas)
+        # bulk_create no devuelve los pk en todas las bases de datos
+        pks = dict(Ventas.objects.filter(codigo__in=[venta.codigo for venta in ventas])
+                   .values_list('codigo', 'pk'))
+        LineaVenta.objects.bulk_create([
+            LineaVenta(venta_id=pks[venta.codigo], producto_id=pk, cantidad=cantidad,
+                       precio_unitario=costo)
+            for venta, vendidos in zip(ventas, lineas)
+            for (pk, costo), cantidad in vendidos
+        ])
+        creadas += len(ventas)
+        _avisar(progreso, creadas)
+    return creadas
+
+def crear_usuarios(por_grupo, semilla=0, lote=1000, prefijo="sintetico", progreso=None):
+    """
+    Crea por_grupo usuarios sinteticos de cada grupo de
+    GRUPOS_SINTETICOS por lotes con bulk_create y devuelve
+    cuantos se crearon. Los usuarios no pueden iniciar sesion
+    """
+    generador = random.Random(semilla)
+    clave = make_password(None)
+    creados = 0
+    for nombre_grupo in GRUPOS_SINTETICOS:
+        grupo, _ = Group.objects.get_or_create(name=nombre_grupo)
+        hechos = 0
+        while hechos < por_grupo:
+            usuarios = []
+            for numero in range(hechos, min(hechos + lote, por_grupo)):
+                username = "{}-{}-{}".format(prefijo, nombre_grupo.lower(), numero)
+                usuarios.append(Usuario(
+                    username=username,
+                    email="{}@crucita.fashion".format(username),
+                    first_name=generador.choice(NOMBRES),
+                    last_name=generador.choice(APELLIDOS),
+                    password=clave,
+                    grupo=grupo,
+                ))
+            Usuario.objects.bulk_create(usuarios)
+            hechos += len(usuarios)
+            creados += len(usuarios)
+            _avisar(progreso, creados)
+    return creados
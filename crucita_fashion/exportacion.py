@@ -0,0 +1,98 @@
+"""
+Modulo que contiene las utilidades para exportar
+informacion en CSV o JSONL usando respuestas por
+partes, de forma que la memoria usada no depende
+de cuantas filas se exporten
+"""
+import csv
+from datetime import date, datetime
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+# Numero de filas que se juntan en cada parte de la respuesta
+FILAS_POR_PARTE = 500
+
+class _Eco: # pylint: disable=too-few-public-methods
+    """
+    Objeto con la interfaz de un archivo que devuelve
+    lo que se le escribe, para usar csv.writer sin
+    guardar las filas en memoria
+    """
+    def write(self, valor): # pylint: disable=no-self-use
+        """
+        Devuelve el valor escrito
+        """
+        return valor
+
+def _texto_csv(valor):
+    """
+    Convierte un valor en el texto que
+    se escribe en una celda del CSV
+    """
+    if valor is None:
+        return ''
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return valor
+
+def _lineas_csv(filas, columnas):
+    """
+    Genera el encabezado y las filas
+    del CSV
+    """
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(columnas)
+    for fila in filas:
+        yield escritor.writerow([_texto_csv(fila[columna]) for columna in columnas])
+
+def _lineas_jsonl(filas, columnas): # pylint: disable=unused-argument
+    """
+    Genera un objeto JSON por cada fila
+    """
+    codificador = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for fila in filas:
+        yield codificador.encode(fila) + '\n'
+
+def _por_partes(lineas):
+    """
+    Junta las lineas en partes de FILAS_POR_PARTE
+    lineas para no enviar una parte por fila
+    """
+    parte = []
+    for linea in lineas:
+        parte.append(linea)
+        if len(parte) >= FILAS_POR_PARTE:
+            yield ''.join(parte)
+            parte = []
+    if parte:
+        yield ''.join(parte)
+
+def respuesta_exportacion(filas, columnas, formato, nombre):
+    """
+    Devuelve una respuesta que envia las filas (diccionarios)
+    a medida que se generan, en el formato indicado (csv o jsonl).
+    En CSV solo se escriben las columnas indicadas, en orden
+    """
+    generador = _lineas_csv if formato == 'csv' else _lineas_jsonl
+    respuesta = StreamingHttpResponse(
+        _por_partes(generador(filas, columnas)),
+        content_type=FORMATOS[formato]
+    )
+    respuesta['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(nombre, formato)
+    return respuesta
+
+def formato_exportacion(request):
+    """
+    Devuelve el formato pedido en el parametro formato
+    (csv por defecto). Si no es valido lanza un ValidationError
+    """
+    formato = request.query_params.get('formato', 'csv')
+    if formato not in FORMATOS:
+        raise serializers.ValidationError({'formato': "El formato debe ser csv o jsonl"})
+    return formato
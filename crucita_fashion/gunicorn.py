@@ -0,0 +1,28 @@
+"""
+Configuracion de gunicorn. Junta las metricas de los
+workers (ver crucita_fashion.metricas): al iniciar se borran
+las de la ejecucion anterior y al terminar un worker su
+archivo se suma al acumulado, asi los contadores no bajan
+cuando gunicorn reinicia workers
+"""
+import os
+import shutil
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'crucita_fashion.settings')
+
+def on_starting(server): # pylint: disable=unused-argument
+    """
+    Borra las metricas guardadas por
+    una ejecucion anterior
+    """
+    from django.conf import settings
+    shutil.rmtree(settings.METRICAS_DIR, ignore_errors=True)
+
+def child_exit(server, worker): # pylint: disable=unused-argument
+    """
+    Suma las metricas del worker
+    terminado al acumulado
+    """
+    from django.conf import settings
+    from crucita_fashion.metricas import fusionar_proceso_terminado
+    fusionar_proceso_terminado(worker.pid, settings.METRICAS_DIR)
@@ -0,0 +1,100 @@
+"""
+Modulo que contiene el renderer y el parser JSON de la
+api. Usan orjson si esta instalado y, si no, el modulo json
+de la libreria estandar como JSONRenderer y JSONParser de
+rest_framework. Ambos producen la misma respuesta: las fechas,
+horas y Decimal se convierten con el JSONEncoder de
+rest_framework. Con float que no son finitos (ej: NaN) se
+lanza ValueError como en JSONRenderer con strict
+"""
+import io
+import math
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError: # pragma: no cover
+    orjson = None # pylint: disable=invalid-name
+
+# orjson es una extension en C, pylint no ve sus miembros
+# pylint: disable=no-member
+
+# Los datetime, date y time pasan al JSONEncoder de rest_framework para
+# que el formato sea el mismo (ej: 'Z' en lugar de '+00:00'), y las
+# llaves que no son str se convierten como en json.dumps
+OPCIONES = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_CODIFICADOR = JSONEncoder()
+
+# Los separadores de linea U+2028 y U+2029 se escapan como en
+# JSONRenderer, para que la respuesta sea valida como javascript
+_SEPARADORES_DE_LINEA = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+def tiene_no_finitos(data):
+    """
+    Devuelve True si los datos tienen algun float
+    que no es finito (ej: NaN o infinito)
+    """
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(tiene_no_finitos(valor) for valor in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(tiene_no_finitos(valor) for valor in data)
+    return False
+
+class JSONRapidoRenderer(JSONRenderer):
+    """
+    Renderer JSON que usa orjson. Con indentacion (ej: la
+    api navegable) o con valores que orjson no acepta (ej:
+    enteros de mas de 64 bits) se usa JSONRenderer
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Devuelve los bytes del JSON
+        de los datos
+        """
+        rapido = orjson is not None and self.compact and self.strict and not self.ensure_ascii
+        if not rapido or data is None or self.get_indent(accepted_media_type,
+                                                         renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            contenido = orjson.dumps(data, default=_CODIFICADOR.default, option=OPCIONES)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson escribe null en lugar de NaN, solo se revisan los datos si
+        # aparece null y JSONRenderer lanza el ValueError
+        if b'null' in contenido and tiene_no_finitos(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        for separador, escapado in _SEPARADORES_DE_LINEA:
+            if separador in contenido:
+                contenido = contenido.replace(separador, escapado)
+        return contenido
+
+class JSONRapidoParser(JSONParser): # pylint: disable=too-few-public-methods
+    """
+    Parser JSON que usa orjson. Si el cuerpo no esta en
+    UTF-8 o orjson no lo acepta se usa JSONParser, que
+    devuelve el mismo mensaje de error
+    """
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Devuelve los datos del
+        cuerpo de la peticion
+        """
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        contenido = stream.read()
+        try:
+            return orjson.loads(contenido)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(contenido), media_type, parser_context)
@@ -0,0 +1,251 @@
+"""
+Modulo que serializa listas grandes sin instanciar los
+modelos ni los serializers por fila: las filas se leen con
+values() y cada campo se convierte con una funcion preparada
+una sola vez a partir del serializer, de forma que la
+respuesta es identica a la del serializer
+"""
+from collections import OrderedDict, defaultdict
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.reverse_related import ForeignObjectRel
+from rest_framework import serializers
+from rest_framework.response import Response
+from crucita_fashion.campos import campos_de_ordenamiento
+
+class CampoNoSoportado(Exception):
+    """
+    El serializer tiene un campo que no se puede
+    calcular a partir de values()
+    """
+
+class CampoRapido: # pylint: disable=too-few-public-methods
+    """
+    Indica como calcular un campo calculado del serializer
+    (ej: un SerializerMethodField) a partir de una columna.
+    Si se indica relacion, convertir recibe la lista de
+    valores de la columna en los objetos relacionados
+    """
+    def __init__(self, columna, convertir=None, relacion=None):
+        """
+        Guarda la columna, la funcion convertir(valor, request)
+        (por defecto devuelve el valor) y la relacion inversa
+        """
+        self.columna = columna
+        self.convertir = convertir or (lambda valor, request: valor)
+        self.relacion = relacion
+
+def _conversor_archivo(campo_modelo, request):
+    """
+    Devuelve el conversor de un FileField, equivalente a
+    FileField.to_representation a partir del nombre del archivo
+    """
+    storage = campo_modelo.storage
+
+    def convertir(nombre):
+        """
+        Devuelve la url del archivo
+        """
+        if not nombre:
+            return None
+        url = storage.url(nombre)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convertir
+
+def _conversor(campo, campo_modelo, request):
+    """
+    Devuelve la funcion que convierte el valor de la
+    columna en la representacion del campo del serializer
+    """
+    if isinstance(campo, serializers.FileField):
+        if not getattr(campo, 'use_url', True):
+            return lambda nombre: nombre or None
+        return _conversor_archivo(campo_modelo, request)
+    if isinstance(campo, serializers.PrimaryKeyRelatedField):
+        if campo.pk_field is not None:
+            return campo.pk_field.to_representation
+        return lambda pk: pk
+    if isinstance(campo, serializers.RelatedField):
+        raise CampoNoSoportado(campo.field_name)
+    return campo.to_representation
+
+def _relacion_inversa(modelo, nombre):
+    """
+    Devuelve la relacion inversa (ej: Ventas.lineas)
+    o lanza CampoNoSoportado si no es una
+    """
+    try:
+        relacion = modelo._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        raise CampoNoSoportado(nombre)
+    if not isinstance(relacion, ForeignObjectRel) or relacion.many_to_many:
+        raise CampoNoSoportado(nombre)
+    return relacion
+
+class LecturaRapida:
+    """
+    Convierte las filas de values() en los diccionarios
+    que devuelve el serializer recibido (ya con los campos
+    de fields/omit). Lanza CampoNoSoportado si algun campo
+    no se puede calcular sin el modelo
+    """
+
+    def __init__(self, serializer, request=None):
+        """
+        Prepara las columnas y el
+        conversor de cada campo
+        """
+        self.modelo = serializer.Meta.model
+        self.request = request
+        self.columnas = OrderedDict([('pk', None)])
+        # (nombre, columna, conversor) de los campos simples
+        self.campos = []
+        # (nombre, relacion, lector o CampoRapido) de los campos de relaciones inversas
+        self.relaciones = []
+        rapidos = getattr(serializer, 'campos_rapidos', {})
+        for nombre, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            if nombre in rapidos:
+                self.agregar_rapido(nombre, rapidos[nombre])
+            elif isinstance(campo, serializers.ListSerializer):
+                relacion = _relacion_inversa(self.modelo, campo.source)
+                if not isinstance(campo.child, serializers.ModelSerializer):
+                    raise CampoNoSoportado(nombre)
+                hijo = LecturaRapida(campo.child, request)
+                if hijo.relaciones:
+                    raise CampoNoSoportado(nombre)
+                self.relaciones.append((nombre, relacion, hijo))
+                self.campos.append((nombre, None, None))
+            else:
+                self.agregar_columna(nombre, campo)
+
+    def agregar_columna(self, nombre, campo):
+        """
+        Agrega un campo que sale de una
+        columna del modelo
+        """
+        try:
+            campo_modelo = self.modelo._meta.get_field(campo.source)
+        except FieldDoesNotExist:
+            campo_modelo = next(
+                (campo_modelo for campo_modelo in self.modelo._meta.concrete_fields
+                 if campo_modelo.attname == campo.source),
+                None
+            )
+        if campo_modelo is None or not campo_modelo.concrete:
+            raise CampoNoSoportado(nombre)
+        self.columnas[campo.source] = None
+        self.campos.append((nombre, campo.source, _conversor(campo, campo_modelo, self.request)))
+
+    def agregar_rapido(self, nombre, rapido):
+        """
+        Agrega un campo calculado con
+        un CampoRapido
+        """
+        if rapido.relacion is None:
+            self.columnas[rapido.columna] = None
+            request = self.request
+            self.campos.append((nombre, rapido.columna,
+                                lambda valor: rapido.convertir(valor, request)))
+        else:
+            relacion = _relacion_inversa(self.modelo, rapido.relacion)
+            self.relaciones.append((nombre, relacion, rapido))
+            self.campos.append((nombre, None, None))
+
+    def preparar(self, queryset, extra=()):
+        """
+        Devuelve el queryset de values() con las columnas
+        necesarias y las columnas extra (ej: el ordenamiento)
+        """
+        columnas = list(self.columnas) + [columna for columna in extra
+                                          if columna not in self.columnas]
+        return queryset.prefetch_related(None).values(*columnas)
+
+    def leer_relaciones(self, pks):
+        """
+        Devuelve por cada campo de relacion un diccionario
+        {pk: valor}. Se hace una consulta por relacion aunque
+        varios campos usen la misma (ej: producto y lineas)
+        """
+        por_relacion = OrderedDict()
+        for nombre, relacion, lector in self.relaciones:
+            por_relacion.setdefault(relacion, []).append((nombre, lector))
+
+        resultado = {}
+        for relacion, campos in por_relacion.items():
+            llave = relacion.field.attname
+            columnas = OrderedDict([(llave, None)])
+            for _, lector in campos:
+                if isinstance(lector, CampoRapido):
+                    columnas[lector.columna] = None
+                else:
+                    columnas.update(lector.columnas)
+            agrupados = {nombre: defaultdict(list) for nombre, _ in campos}
+            objetos = relacion.related_model._meta.default_manager.filter(**{llave + '__in': pks})
+            for fila in objetos.values(*columnas):
+                for nombre, lector in campos:
+                    if isinstance(lector, CampoRapido):
+                        agrupados[nombre][fila[llave]].append(fila[lector.columna])
+                    else:
+                        agrupados[nombre][fila[llave]].append(lector.convertir_fila(fila, {}))
+            for nombre, lector in campos:
+                if isinstance(lector, CampoRapido):
+                    resultado[nombre] = {
+                        pk: lector.convertir(agrupados[nombre][pk], self.request) for pk in pks
+                    }
+                else:
+                    resultado[nombre] = agrupados[nombre]
+        return resultado
+
+    def convertir_fila(self, fila, relaciones):
+        """
+        Convierte una fila de values() en la
+        representacion del serializer
+        """
+        resultado = OrderedDict()
+        for nombre, columna, convertir in self.campos:
+            if convertir is None:
+                resultado[nombre] = relaciones[nombre].get(fila['pk'], [])
+                continue
+            valor = fila[columna]
+            resultado[nombre] = None if valor is None else convertir(valor)
+        return resultado
+
+    def convertir(self, filas):
+        """
+        Convierte las filas de values(), las relaciones
+        se leen con una consulta por relacion
+        """
+        filas = list(filas)
+        relaciones = {}
+        if self.relaciones and filas:
+            relaciones = self.leer_relaciones([fila['pk'] for fila in filas])
+        return [self.convertir_fila(fila, relaciones) for fila in filas]
+
+class LecturaRapidaMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin para vistas de listas que genera la respuesta con
+    LecturaRapida en lugar del serializer. Si el serializer
+    tiene campos no soportados, o LECTURA_RAPIDA esta
+    desactivado, se usa el serializer normalmente
+    """
+
+    def list(self, request, *args, **kwargs):
+        """
+        Devuelve la lista, paginada si
+        la vista tiene paginacion
+        """
+        if not settings.LECTURA_RAPIDA:
+            return super().list(request, *args, **kwargs)
+        try:
+            lector = LecturaRapida(self.get_serializer(), request)
+        except CampoNoSoportado:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        filas = lector.preparar(queryset, extra=campos_de_ordenamiento(self, queryset))
+        pagina = self.paginate_queryset(filas)
+        if pagina is not None:
+            return self.get_paginated_response(lector.convertir(pagina))
+        return Response(lector.convertir(filas))
@@ -0,0 +1,47 @@
+"""
+Comando que compara las consultas y el tiempo por
+peticion de la autenticacion por sesion y por token JWT
+"""
+from collections import OrderedDict
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from crucita_fashion import benchmark
+
+class Command(BaseCommand):
+    """
+    Hace la misma peticion autenticada con sesion y con
+    token JWT y muestra las consultas y percentiles de
+    cada una. Los datos creados se revierten al terminar
+    """
+    help = "Compara la autenticacion por sesion y por token JWT"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--peticiones', type=int, default=200,
+                            help="Numero de peticiones medidas por caso")
+        parser.add_argument('--url', default=None,
+                            help="Url a pedir, por defecto la busqueda de productos")
+
+    def handle(self, *args, **options):
+        """
+        Mide cada tipo de autenticacion
+        """
+        url = options['url'] or reverse('inventario:buscar')
+        resultados = OrderedDict()
+        with benchmark.datos_temporales():
+            benchmark.crear_usuario_staff()
+            sesion = benchmark.cliente_sesion()
+            resultados['sesion'] = benchmark.medir(
+                lambda: sesion.get(url), options['peticiones']
+            )
+            jwt = benchmark.cliente_jwt()
+            resultados['jwt'] = benchmark.medir(lambda: jwt.get(url), options['peticiones'])
+
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
+        ahorro = resultados['sesion']['consultas'] - resultados['jwt']['consultas']
+        self.stdout.write(self.style.SUCCESS(
+            "El token JWT ahorra {:.2f} consultas por peticion".format(ahorro)
+        ))
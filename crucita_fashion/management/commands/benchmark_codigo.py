@@ -0,0 +1,56 @@
+"""
+Comando que mide la busqueda de un producto por
+codigo con el cache vacio, con el producto en el
+cache y usando la busqueda general de productos
+"""
+from collections import OrderedDict
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from inventario.cache import CACHE_CODIGOS
+from crucita_fashion import benchmark
+
+class Command(BaseCommand):
+    """
+    Crea un catalogo sintetico y mide la busqueda por
+    codigo en cada caso. Todo se revierte al terminar
+    """
+    help = "Mide la busqueda por codigo con y sin cache"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--productos', type=int, default=10000,
+                            help="Numero de productos del catalogo sintetico")
+        parser.add_argument('--peticiones', type=int, default=200,
+                            help="Numero de peticiones medidas por caso")
+
+    def handle(self, *args, **options):
+        """
+        Mide cada caso con un cliente
+        autenticado con token JWT
+        """
+        resultados = OrderedDict()
+        codigo = "sintetico-{}".format(options['productos'] // 2)
+        url = reverse('inventario:codigo', args=(codigo,))
+        peticiones = options['peticiones']
+        with benchmark.catalogo_temporal(options['productos']) as api:
+            def sin_cache():
+                """
+                Pide el producto con
+                el cache vacio
+                """
+                CACHE_CODIGOS.limpiar()
+                return api.get(url)
+
+            resultados['codigo_sin_cache'] = benchmark.medir(sin_cache, peticiones)
+            resultados['codigo_con_cache'] = benchmark.medir(lambda: api.get(url), peticiones)
+            busqueda = reverse('inventario:buscar')
+            resultados['buscar?codigo='] = benchmark.medir(
+                lambda: api.get(busqueda, {'codigo': codigo}), peticiones
+            )
+        # Los productos sinteticos se revirtieron, no deben quedar en el cache
+        CACHE_CODIGOS.limpiar()
+
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
@@ -0,0 +1,67 @@
+"""
+Comando que mide el costo de abrir una conexion a la
+base de datos por peticion, comparado con reutilizar
+conexiones persistentes con y sin verificacion
+"""
+from collections import OrderedDict
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_started, request_finished
+from django.db import connection
+from django.test import override_settings
+from usuarios.models import Usuario
+from crucita_fashion import benchmark
+
+# (nombre, CONN_MAX_AGE, DB_VERIFICAR_INACTIVA) de cada caso
+CASOS = (
+    ('sin_persistencia', 0, None),
+    ('persistente', 600, None),
+    ('persistente_verificada', 600, 0),
+)
+
+class Command(BaseCommand):
+    """
+    Simula peticiones enviando las senales request_started
+    y request_finished (que abren y cierran las conexiones)
+    alrededor de una consulta, con cada configuracion
+    """
+    help = "Mide el costo de conexion por peticion con y sin conexiones persistentes"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--peticiones', type=int, default=200,
+                            help="Numero de peticiones medidas por caso")
+
+    def peticion(self):
+        """
+        Simula una peticion que hace
+        una consulta
+        """
+        request_started.send(sender=self.__class__)
+        Usuario.objects.filter(pk=0).exists()
+        request_finished.send(sender=self.__class__)
+
+    def handle(self, *args, **options):
+        """
+        Mide cada caso y restaura la
+        configuracion de la conexion
+        """
+        if connection.in_atomic_block:
+            raise CommandError("No se puede medir dentro de una transaccion")
+
+        resultados = OrderedDict()
+        original = connection.settings_dict['CONN_MAX_AGE']
+        try:
+            for nombre, max_age, intervalo in CASOS:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                with override_settings(DB_VERIFICAR_INACTIVA=intervalo):
+                    resultados[nombre] = benchmark.medir(self.peticion, options['peticiones'])
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = original
+            connection.close()
+
+        self.stdout.write("base de datos: {}".format(connection.vendor))
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
@@ -0,0 +1,122 @@
+"""
+Comando que mide la latencia, el throughput y las consultas
+de cada url de inventario, ventas y usuarios con los datos de
+la base de datos (ver generar_datos), guarda los resultados en
+JSON y los compara con los de una corrida base
+"""
+import os
+from collections import OrderedDict
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils import timezone
+from inventario.models import Producto
+from usuarios.models import Usuario
+from ventas.models import Ventas
+from crucita_fashion import benchmark
+from crucita_fashion.benchmark_endpoints import Escenario, urls_sin_caso
+from crucita_fashion.datos_sinteticos import crear_productos, crear_ventas
+
+class Command(BaseCommand):
+    """
+    Mide cada caso de benchmark_endpoints dentro de una
+    transaccion que se revierte al terminar, asi las
+    peticiones que crean o modifican no cambian los datos
+    """
+    help = "Mide la latencia de cada url y la compara con una corrida base"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--peticiones', type=int, default=30,
+                            help="Numero de peticiones medidas por caso")
+        parser.add_argument('--peticiones-pesadas', type=int, default=3,
+                            help="Numero de peticiones de los casos pesados (exportaciones)")
+        parser.add_argument('--productos', type=int, default=0,
+                            help="Productos sinteticos temporales que se agregan a los datos")
+        parser.add_argument('--ventas', type=int, default=0,
+                            help="Ventas sinteticas temporales que se agregan a los datos")
+        parser.add_argument('--omitir', nargs='*', default=[],
+                            help="Nombres de urls que no se miden (ej: ventas:buscar)")
+        parser.add_argument('--salida', default='benchmark_endpoints.json',
+                            help="Archivo JSON donde se guardan los resultados")
+        parser.add_argument('--base',
+                            help="Archivo JSON de una corrida base, si no existe se crea "
+                                 "con los resultados")
+        parser.add_argument('--tolerancia', type=float, default=0.2,
+                            help="Aumento del p95 sobre la base que se considera regresion")
+        parser.add_argument('--minimo-ms', type=float, default=1.0,
+                            help="Aumento minimo del p95 en milisegundos para ser regresion")
+
+    def medir_casos(self, options):
+        """
+        Prepara los datos y el escenario y devuelve
+        los datos medidos y los resultados de cada caso
+        """
+        crear_productos(options['productos'], prefijo="benchmark-sintetico")
+        crear_ventas(options['ventas'], prefijo="benchmark-sintetico")
+        if not Producto.objects.exists():
+            raise CommandError("No hay productos, use generar_datos o --productos")
+        datos = {
+            'productos': Producto.objects.count(),
+            'ventas': Ventas.objects.count(),
+            'usuarios': Usuario.objects.count(),
+        }
+        escenario = Escenario()
+        casos = escenario.casos()
+        faltantes = [url for url in urls_sin_caso(casos) if url not in options['omitir']]
+        if faltantes:
+            raise CommandError("Las urls {} no tienen casos".format(', '.join(faltantes)))
+
+        resultados = OrderedDict()
+        for caso in casos:
+            if caso.url in options['omitir']:
+                continue
+            escenario.renovar()
+            repeticiones = options['peticiones_pesadas' if caso.pesado else 'peticiones']
+            with override_settings(**caso.ajustes):
+                resultado = benchmark.medir(caso.peticion, repeticiones,
+                                            calentamiento=min(repeticiones, 5))
+            resultado['url'] = caso.url
+            resultados[caso.nombre] = resultado
+            self.stdout.write("{}: {:.2f}ms p95".format(caso.nombre, resultado['p95']))
+        return datos, resultados
+
+    def handle(self, *args, **options):
+        """
+        Mide los casos, guarda los resultados
+        y muestra las regresiones
+        """
+        with benchmark.datos_temporales():
+            datos, resultados = self.medir_casos(options)
+
+        corrida = {
+            'fecha': timezone.now().isoformat(),
+            'datos': datos,
+            'peticiones': options['peticiones'],
+            'casos': resultados,
+        }
+        benchmark.guardar(options['salida'], corrida)
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
+        self.stdout.write("Resultados guardados en {}".format(options['salida']))
+
+        base = options['base']
+        if base is None:
+            return
+        if not os.path.exists(base):
+            benchmark.guardar(base, corrida)
+            self.stdout.write("Base creada en {}".format(base))
+            return
+        anterior = benchmark.cargar(base)
+        if anterior['datos'] != datos:
+            self.stderr.write("Los datos de la base {} son distintos a {}".format(
+                anterior['datos'], datos
+            ))
+        encontradas = benchmark.regresiones(resultados, anterior['casos'],
+                                            options['tolerancia'], options['minimo_ms'])
+        if encontradas:
+            for nombre, motivo in encontradas:
+                self.stderr.write("Regresion en {}: {}".format(nombre, motivo))
+            raise CommandError("{} regresiones respecto a {}".format(len(encontradas), base))
+        self.stdout.write(self.style.SUCCESS("Sin regresiones respecto a {}".format(base)))
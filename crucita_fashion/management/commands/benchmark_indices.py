@@ -0,0 +1,108 @@
+"""
+Comando que mide las busquedas de productos con y
+sin los indices del inventario sobre un catalogo
+sintetico, y muestra el plan de cada consulta
+"""
+from collections import OrderedDict
+from django.core.management.base import BaseCommand
+from django.db import connection
+from inventario.models import Producto
+from crucita_fashion import benchmark
+from crucita_fashion.datos_sinteticos import crear_categorias, crear_productos, verificar_entorno
+
+# Indices agregados por la migracion inventario.0003_producto_indices
+INDICES = (
+    'producto_categoria_talla',
+    'producto_cantidad',
+    'producto_costo',
+    'producto_agotados',
+)
+
+# Tamano de pagina de la busqueda, las consultas se
+# hacen igual que la paginacion por cursor
+PAGINA = 101
+
+def consultas(categorias):
+    """
+    Devuelve las consultas que se miden, con los
+    filtros que usa la busqueda de productos
+    """
+    productos = Producto.objects.order_by('pk')
+    return OrderedDict((
+        ('categoria_talla', productos.filter(categoria=categorias['Ropa'], talla="M")),
+        ('poco_stock', productos.filter(cantidad__lte=3)),
+        ('rango_costo', productos.filter(costo__gte=100, costo__lt=105)),
+        ('agotados', productos.filter(cantidad=0)),
+    ))
+
+def medir_consultas(categorias, repeticiones):
+    """
+    Mide cada consulta y devuelve sus
+    resultados y sus planes
+    """
+    resultados = OrderedDict()
+    planes = OrderedDict()
+    for nombre, consulta in consultas(categorias).items():
+        resultados[nombre] = benchmark.medir(
+            lambda consulta=consulta: list(consulta[:PAGINA]), repeticiones
+        )
+        planes[nombre] = consulta[:PAGINA].explain()
+    return resultados, planes
+
+class Command(BaseCommand):
+    """
+    Crea un catalogo sintetico, mide las consultas con
+    los indices, los elimina y vuelve a medir. Todo se
+    revierte al terminar
+    """
+    help = "Compara las busquedas de productos antes y despues de los indices"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--productos', type=int, default=100000,
+                            help="Numero de productos del catalogo sintetico")
+        parser.add_argument('--repeticiones', type=int, default=50,
+                            help="Numero de veces que se ejecuta cada consulta")
+        parser.add_argument('--semilla', type=int, default=0,
+                            help="Semilla de los datos sinteticos")
+        parser.add_argument('--permitir-produccion', action='store_true',
+                            help="Permite correr el comando sin DEBUG activo")
+
+    def mostrar(self, titulo, resultados, planes):
+        """
+        Muestra la tabla de resultados
+        y el plan de cada consulta
+        """
+        self.stdout.write(self.style.MIGRATE_HEADING(titulo))
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
+        for nombre, plan in planes.items():
+            self.stdout.write("-- {}\n{}".format(nombre, plan))
+
+    def handle(self, *args, **options):
+        """
+        Verifica el entorno y mide las consultas
+        despues y antes de los indices
+        """
+        verificar_entorno(options['permitir_produccion'])
+        with benchmark.datos_temporales():
+            crear_productos(options['productos'], semilla=options['semilla'])
+            categorias = crear_categorias()
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE inventario_producto')
+            despues = medir_consultas(categorias, options['repeticiones'])
+
+            with connection.cursor() as cursor:
+                for indice in INDICES:
+                    cursor.execute('DROP INDEX {}'.format(indice))
+                # Indice de la llave foranea que existia antes de la migracion
+                cursor.execute(
+                    'CREATE INDEX benchmark_categoria ON inventario_producto (categoria_id)'
+                )
+                cursor.execute('ANALYZE inventario_producto')
+            antes = medir_consultas(categorias, options['repeticiones'])
+
+        self.mostrar("Antes de los indices", *antes)
+        self.mostrar("Con los indices", *despues)
@@ -0,0 +1,70 @@
+"""
+Comando que mide el tiempo de generar y leer el JSON
+de una pagina de productos y de una lista de ventas con
+JSONRenderer/JSONParser y con los de json_rapido
+"""
+import io
+from collections import OrderedDict
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from inventario.models import Producto
+from inventario.serializers import ProductoSerializer
+from ventas.models import Ventas
+from ventas.serializers import VentasSerializer
+from crucita_fashion import benchmark, json_rapido
+from crucita_fashion.datos_sinteticos import crear_productos, crear_ventas
+
+class Command(BaseCommand):
+    """
+    Crea productos y ventas sinteticos, los serializa
+    y mide cada renderer y parser con esos datos. Todo
+    se revierte al terminar
+    """
+    help = "Mide el renderer y el parser JSON de la api"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--productos', type=int, default=1000,
+                            help="Productos de la pagina (y ventas de la lista)")
+        parser.add_argument('--repeticiones', type=int, default=50,
+                            help="Numero de repeticiones medidas por caso")
+
+    def handle(self, *args, **options):
+        """
+        Mide cada caso y muestra el
+        tamano de cada respuesta
+        """
+        if json_rapido.orjson is None:
+            self.stdout.write("orjson no esta instalado, json_rapido usa json")
+        with benchmark.datos_temporales():
+            crear_productos(options['productos'])
+            crear_ventas(options['productos'])
+            datos = OrderedDict([
+                ('productos', ProductoSerializer(Producto.objects.all(), many=True).data),
+                ('ventas', VentasSerializer(Ventas.objects.prefetch_related('lineas'),
+                                            many=True).data),
+            ])
+
+        resultados = OrderedDict()
+        for nombre, lista in datos.items():
+            contenido = JSONRenderer().render(lista)
+            self.stdout.write("{}: {} bytes".format(nombre, len(contenido)))
+            casos = (
+                ('json', JSONRenderer(), JSONParser()),
+                ('json_rapido', json_rapido.JSONRapidoRenderer(), json_rapido.JSONRapidoParser()),
+            )
+            for caso, renderer, parser in casos:
+                resultados['{} render {}'.format(nombre, caso)] = benchmark.medir(
+                    lambda renderer=renderer, lista=lista: renderer.render(lista),
+                    options['repeticiones']
+                )
+                resultados['{} parse {}'.format(nombre, caso)] = benchmark.medir(
+                    lambda parser=parser, contenido=contenido: parser.parse(io.BytesIO(contenido)),
+                    options['repeticiones']
+                )
+
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
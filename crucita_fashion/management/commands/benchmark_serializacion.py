@@ -0,0 +1,55 @@
+"""
+Comando que mide la busqueda de productos y el listado
+de ventas serializando con el serializer de cada fila y
+con la lectura rapida de values()
+"""
+from collections import OrderedDict
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import reverse
+from crucita_fashion import benchmark
+
+class Command(BaseCommand):
+    """
+    Crea un catalogo sintetico y pide una pagina grande
+    de productos con cada forma de serializar. Todo se
+    revierte al terminar
+    """
+    help = "Mide la serializacion de listas con y sin lectura rapida"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--productos', type=int, default=5000,
+                            help="Numero de productos del catalogo sintetico")
+        parser.add_argument('--pagina', type=int, default=1000,
+                            help="Productos por pagina (?page_size=)")
+        parser.add_argument('--peticiones', type=int, default=50,
+                            help="Numero de peticiones medidas por caso")
+
+    def handle(self, *args, **options):
+        """
+        Verifica que ambas respuestas son iguales
+        y mide cada caso con un cliente JWT
+        """
+        resultados = OrderedDict()
+        url = reverse('inventario:buscar')
+        parametros = {'page_size': options['pagina']}
+        peticiones = options['peticiones']
+        with benchmark.catalogo_temporal(options['productos']) as api:
+            with override_settings(LECTURA_RAPIDA=False):
+                esperada = api.get(url, parametros).content
+            with override_settings(LECTURA_RAPIDA=True):
+                rapida = api.get(url, parametros).content
+            if rapida != esperada:
+                raise CommandError("La lectura rapida no devuelve la misma respuesta")
+
+            for nombre, activa in (('serializer', False), ('lectura_rapida', True)):
+                with override_settings(LECTURA_RAPIDA=activa):
+                    resultados['buscar ' + nombre] = benchmark.medir(
+                        lambda: api.get(url, parametros), peticiones
+                    )
+
+        for linea in benchmark.tabla(resultados):
+            self.stdout.write(linea)
@@ -0,0 +1,110 @@
+"""
+Comando que genera un volumen grande de datos sinteticos
+(productos, ventas y usuarios) para los benchmarks. Los
+datos dependen de la semilla y quedan en la base de datos
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from inventario.models import Producto
+from usuarios.models import Usuario
+from ventas.models import Ventas
+from crucita_fashion import datos_sinteticos
+
+# Cada cuanto se muestra el progreso (fraccion del total)
+PASO_PROGRESO = 0.1
+
+class Command(BaseCommand):
+    """
+    Crea los productos, luego las ventas con sus lineas
+    sobre esos productos y luego los usuarios de cada
+    grupo, cada uno en una transaccion con bulk_create
+    """
+    help = "Genera productos, ventas y usuarios sinteticos para los benchmarks"
+
+    def add_arguments(self, parser):
+        """
+        Argumentos del comando
+        """
+        parser.add_argument('--productos', type=int, default=100000,
+                            help="Numero de productos")
+        parser.add_argument('--ventas', type=int, default=1000000,
+                            help="Numero de ventas")
+        parser.add_argument('--usuarios', type=int, default=1000,
+                            help="Numero de usuarios de cada grupo")
+        parser.add_argument('--maximo-lineas', type=int, default=4,
+                            help="Maximo de productos distintos por venta")
+        parser.add_argument('--semilla', type=int, default=0,
+                            help="Semilla de los datos, la misma semilla genera los mismos datos")
+        parser.add_argument('--lote', type=int, default=1000,
+                            help="Numero de filas por bulk_create")
+        parser.add_argument('--prefijo', default="sintetico",
+                            help="Prefijo de los codigos y nombres de usuario")
+        parser.add_argument('--permitir-produccion', action='store_true',
+                            help="Permite correr el comando sin DEBUG activo")
+
+    def progreso(self, modelo, total):
+        """
+        Devuelve la funcion de progreso que muestra cada
+        PASO_PROGRESO del total las filas creadas
+        """
+        paso = max(int(total * PASO_PROGRESO), 1)
+        siguiente = [paso]
+
+        def mostrar(creados):
+            """
+            Muestra las filas creadas si se
+            alcanzo el siguiente paso
+            """
+            if creados >= siguiente[0] or creados == total:
+                self.stdout.write("  {}: {}/{}".format(modelo, creados, total))
+                siguiente[0] = (creados // paso + 1) * paso
+        return mostrar
+
+    def generar(self, modelo, crear, total):
+        """
+        Ejecuta crear(progreso) en una transaccion y
+        muestra las filas creadas y el tiempo
+        """
+        if total <= 0:
+            return
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            creados = crear(self.progreso(modelo, total))
+        segundos = time.perf_counter() - inicio
+        self.stdout.write("{} {} en {:.1f}s ({:.0f} por segundo)".format(
+            creados, modelo, segundos, creados / max(segundos, 1e-9)
+        ))
+
+    def handle(self, *args, **options):
+        """
+        Verifica el entorno y que no existan datos
+        con el prefijo y genera cada modelo
+        """
+        datos_sinteticos.verificar_entorno(options['permitir_produccion'])
+        prefijo = options['prefijo']
+        opciones = {'semilla': options['semilla'], 'lote': options['lote'], 'prefijo': prefijo}
+        inicio = prefijo + '-'
+        if (Producto.objects.filter(codigo__startswith=inicio).exists() or
+                Ventas.objects.filter(codigo__startswith=inicio).exists() or
+                Usuario.objects.filter(username__startswith=inicio).exists()):
+            raise CommandError("Ya existen datos con el prefijo '{}', use otro --prefijo".format(
+                prefijo
+            ))
+        if options['ventas'] > 0 and options['productos'] <= 0 and not Producto.objects.exists():
+            raise CommandError("Las ventas necesitan productos, use --productos")
+
+        total = time.perf_counter()
+        self.generar('productos', lambda progreso: datos_sinteticos.crear_productos(
+            options['productos'], progreso=progreso, **opciones
+        ), options['productos'])
+        self.generar('ventas', lambda progreso: datos_sinteticos.crear_ventas(
+            options['ventas'], maximo_lineas=options['maximo_lineas'], progreso=progreso,
+            **opciones
+        ), options['ventas'])
+        self.generar('usuarios', lambda progreso: datos_sinteticos.crear_usuarios(
+            options['usuarios'], progreso=progreso, **opciones
+        ), options['usuarios'] * len(datos_sinteticos.GRUPOS_SINTETICOS))
+        self.stdout.write(self.style.SUCCESS(
+            "Datos generados en {:.1f}s".format(time.perf_counter() - total)
+        ))
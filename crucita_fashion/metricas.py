@@ -0,0 +1,323 @@
+"""
+Modulo que contiene las metricas de la api en el formato de
+texto de Prometheus. Cada proceso acumula sus metricas en
+memoria y cada METRICAS_INTERVALO segundos las guarda en un
+archivo <pid>.json en METRICAS_DIR. La vista de metricas suma
+los archivos de todos los procesos, asi funciona con los
+workers de gunicorn, que no comparten memoria. Al terminar un
+worker, el proceso principal suma su archivo al acumulado de
+los procesos terminados (ver crucita_fashion/gunicorn.py)
+"""
+import atexit
+import json
+import os
+import time
+from collections import defaultdict
+from threading import Lock
+from django.conf import settings
+from crucita_fashion.perfilado import Perfil, metodo
+
+# Limites en segundos de los buckets del histograma de duracion
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+PREFIJO = 'crucita_'
+
+# Archivo con las metricas de los procesos terminados
+ACUMULADO = 'acumulado.json'
+
+AYUDA = {
+    'http_request_duration_seconds': ('histogram', "Duracion de las peticiones por url"),
+    'http_responses_total': ('counter', "Respuestas por url y codigo de estado"),
+    'db_queries_total': ('counter', "Consultas a la base de datos por url"),
+    'db_query_duration_seconds_total': ('counter', "Tiempo en consultas por url"),
+    'cache_requests_total': ('counter', "Lecturas de los caches por resultado"),
+    'cache_hit_ratio': ('gauge', "Fraccion de lecturas de los caches que fueron aciertos"),
+}
+
+# Funciones sin argumentos que devuelven muestras (nombre, etiquetas, valor)
+# de contadores que se leen al guardar las metricas (ej: los caches)
+COLECTORES = []
+
+def registrar_colector(colector):
+    """
+    Agrega una funcion que devuelve muestras
+    de contadores del proceso
+    """
+    COLECTORES.append(colector)
+    return colector
+
+def _etiquetas(etiquetas):
+    """
+    Convierte un diccionario de etiquetas en una
+    tupla ordenada, usable como llave
+    """
+    return tuple(sorted(etiquetas.items()))
+
+class Registro:
+    """
+    Contadores e histogramas del proceso. Es seguro
+    usarlo desde varios hilos
+    """
+
+    def __init__(self):
+        """
+        Crea el registro
+        vacio
+        """
+        self.contadores = defaultdict(float)
+        self.histogramas = {}
+        self.guardado = 0
+        self._candado = Lock()
+
+    def sumar(self, nombre, etiquetas, valor=1):
+        """
+        Suma el valor al contador con
+        esas etiquetas
+        """
+        with self._candado:
+            self.contadores[nombre, _etiquetas(etiquetas)] += valor
+
+    def observar(self, nombre, etiquetas, valor):
+        """
+        Agrega una observacion al histograma
+        con esas etiquetas
+        """
+        llave = (nombre, _etiquetas(etiquetas))
+        with self._candado:
+            histograma = self.histogramas.get(llave)
+            if histograma is None:
+                histograma = self.histogramas[llave] = [[0] * len(BUCKETS), 0.0, 0]
+            for posicion, limite in enumerate(BUCKETS):
+                if valor <= limite:
+                    histograma[0][posicion] += 1
+            histograma[1] += valor
+            histograma[2] += 1
+
+    def instantanea(self):
+        """
+        Devuelve las metricas del proceso (incluidas las
+        de los colectores) en un diccionario serializable
+        """
+        with self._candado:
+            contadores = [[nombre, list(etiquetas), valor]
+                          for (nombre, etiquetas), valor in self.contadores.items()]
+            histogramas = [[nombre, list(etiquetas), list(cubetas), suma, cuenta]
+                           for (nombre, etiquetas), (cubetas, suma, cuenta)
+                           in self.histogramas.items()]
+        for colector in COLECTORES:
+            contadores.extend([nombre, list(_etiquetas(etiquetas)), valor]
+                              for nombre, etiquetas, valor in colector())
+        return {'contadores': contadores, 'histogramas': histogramas}
+
+    def guardar(self, directorio=None):
+        """
+        Guarda la instantanea en el archivo del proceso,
+        se reemplaza completo para que nunca se lea a medias
+        """
+        directorio = directorio or settings.METRICAS_DIR
+        os.makedirs(directorio, exist_ok=True)
+        ruta = os.path.join(directorio, '{}.json'.format(os.getpid()))
+        temporal = ruta + '.tmp'
+        with open(temporal, 'w') as archivo:
+            json.dump(self.instantanea(), archivo)
+        os.replace(temporal, ruta)
+        self.guardado = time.monotonic()
+
+    def guardar_si_toca(self):
+        """
+        Guarda la instantanea si pasaron METRICAS_INTERVALO
+        segundos desde la ultima vez
+        """
+        if time.monotonic() - self.guardado >= settings.METRICAS_INTERVALO:
+            self.guardar()
+
+    def reiniciar(self):
+        """
+        Elimina todas las metricas
+        del proceso
+        """
+        with self._candado:
+            self.contadores.clear()
+            self.histogramas.clear()
+
+REGISTRO = Registro()
+
+def _guardar_al_salir():
+    """
+    Guarda las metricas del proceso si las
+    hay, asi no se pierden al terminar el worker
+    """
+    if settings.METRICAS and (REGISTRO.contadores or REGISTRO.histogramas):
+        REGISTRO.guardar()
+
+atexit.register(_guardar_al_salir)
+
+def _leer(ruta):
+    """
+    Devuelve la instantanea guardada en la ruta, o
+    None si ya no existe (el proceso termino)
+    """
+    try:
+        with open(ruta) as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+def combinar(tomadas):
+    """
+    Suma varias instantaneas, devuelve los contadores y
+    los histogramas indexados por (nombre, etiquetas)
+    """
+    contadores = defaultdict(float)
+    histogramas = {}
+    for instantanea in tomadas:
+        for nombre, etiquetas, valor in instantanea['contadores']:
+            contadores[nombre, tuple(map(tuple, etiquetas))] += valor
+        for nombre, etiquetas, cubetas, suma, cuenta in instantanea['histogramas']:
+            llave = (nombre, tuple(map(tuple, etiquetas)))
+            total = histogramas.setdefault(llave, [[0] * len(BUCKETS), 0.0, 0])
+            total[0] = [anterior + nuevo for anterior, nuevo in zip(total[0], cubetas)]
+            total[1] += suma
+            total[2] += cuenta
+    return contadores, histogramas
+
+def instantaneas(directorio=None):
+    """
+    Devuelve las instantaneas de todos los procesos, la
+    del proceso actual se toma de la memoria
+    """
+    directorio = directorio or settings.METRICAS_DIR
+    propio = '{}.json'.format(os.getpid())
+    resultado = [REGISTRO.instantanea()]
+    if os.path.isdir(directorio):
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith('.json') and nombre != propio:
+                instantanea = _leer(os.path.join(directorio, nombre))
+                if instantanea is not None:
+                    resultado.append(instantanea)
+    return resultado
+
+def fusionar_proceso_terminado(pid, directorio):
+    """
+    Suma el archivo de un proceso terminado al acumulado
+    y lo elimina. Solo lo llama el proceso principal de
+    gunicorn, por lo que no hay escrituras simultaneas
+    """
+    ruta = os.path.join(directorio, '{}.json'.format(pid))
+    instantanea = _leer(ruta)
+    if instantanea is None:
+        return
+    acumulado = os.path.join(directorio, ACUMULADO)
+    anterior = _leer(acumulado) or {'contadores': [], 'histogramas': []}
+    contadores, histogramas = combinar([anterior, instantanea])
+    temporal = acumulado + '.tmp'
+    with open(temporal, 'w') as archivo:
+        json.dump({
+            'contadores': [[nombre, etiquetas, valor]
+                           for (nombre, etiquetas), valor in contadores.items()],
+            'histogramas': [[nombre, etiquetas] + datos
+                            for (nombre, etiquetas), datos in histogramas.items()],
+        }, archivo)
+    os.replace(temporal, acumulado)
+    os.remove(ruta)
+
+def _formato(valor):
+    """
+    Devuelve el valor como numero
+    de Prometheus
+    """
+    return repr(float(valor)) if valor != int(valor) else str(int(valor))
+
+def _linea(nombre, etiquetas, valor):
+    """
+    Devuelve la linea de una muestra con
+    las etiquetas escapadas
+    """
+    if not etiquetas:
+        return '{}{} {}'.format(PREFIJO, nombre, _formato(valor))
+    texto = ','.join(
+        '{}="{}"'.format(etiqueta, str(dato).replace('\\', '\\\\').replace('"', '\\"')
+                         .replace('\n', '\\n'))
+        for etiqueta, dato in etiquetas
+    )
+    return '{}{}{{{}}} {}'.format(PREFIJO, nombre, texto, _formato(valor))
+
+def _proporciones(contadores):
+    """
+    Calcula la proporcion de aciertos de cada cache
+    a partir de los contadores combinados
+    """
+    lecturas = defaultdict(lambda: [0, 0])
+    for (nombre, etiquetas), valor in contadores.items():
+        if nombre == 'cache_requests_total':
+            datos = dict(etiquetas)
+            lecturas[datos['cache']][datos['resultado'] == 'acierto'] += valor
+    return {(('cache', cache),): aciertos / (fallos + aciertos)
+            for cache, (fallos, aciertos) in lecturas.items() if fallos + aciertos}
+
+def exposicion(directorio=None):
+    """
+    Devuelve el texto con las metricas de todos
+    los procesos en el formato de Prometheus
+    """
+    contadores, histogramas = combinar(instantaneas(directorio))
+    muestras = defaultdict(list)
+    for (nombre, etiquetas), valor in contadores.items():
+        muestras[nombre].append(_linea(nombre, etiquetas, valor))
+    for etiquetas, valor in _proporciones(contadores).items():
+        muestras['cache_hit_ratio'].append(_linea('cache_hit_ratio', etiquetas, valor))
+    for (nombre, etiquetas), (cubetas, suma, cuenta) in histogramas.items():
+        for limite, cubeta in zip(BUCKETS, cubetas):
+            muestras[nombre].append(
+                _linea(nombre + '_bucket', etiquetas + (('le', _formato(limite)),), cubeta)
+            )
+        muestras[nombre].append(_linea(nombre + '_bucket', etiquetas + (('le', '+Inf'),), cuenta))
+        muestras[nombre].append(_linea(nombre + '_sum', etiquetas, suma))
+        muestras[nombre].append(_linea(nombre + '_count', etiquetas, cuenta))
+
+    lineas = []
+    for nombre in sorted(muestras):
+        tipo, ayuda = AYUDA.get(nombre, ('untyped', nombre))
+        lineas.append('# HELP {}{} {}'.format(PREFIJO, nombre, ayuda))
+        lineas.append('# TYPE {}{} {}'.format(PREFIJO, nombre, tipo))
+        lineas.extend(sorted(muestras[nombre]))
+    return '\n'.join(lineas) + '\n'
+
+class MetricasMiddleware: # pylint: disable=too-few-public-methods
+    """
+    Middleware que registra la duracion, el codigo de
+    estado y las consultas de cada peticion por nombre
+    de url cuando METRICAS esta activo
+    """
+
+    def __init__(self, get_response):
+        """
+        Guarda la siguiente
+        funcion de la cadena
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Atiende la peticion y
+        registra sus metricas
+        """
+        if not settings.METRICAS:
+            return self.get_response(request)
+
+        with Perfil().en_conexiones() as perfil:
+            respuesta = self.get_response(request)
+        consultas, sql, _, total = perfil.resumen()
+
+        coincidencia = getattr(request, 'resolver_match', None)
+        etiquetas = {
+            'url': coincidencia.view_name if coincidencia is not None else 'sin_url',
+            'metodo': metodo(request),
+        }
+        REGISTRO.observar('http_request_duration_seconds', etiquetas, total / 1000)
+        REGISTRO.sumar('db_queries_total', etiquetas, consultas)
+        REGISTRO.sumar('db_query_duration_seconds_total', etiquetas, sql / 1000)
+        etiquetas['estado'] = str(respuesta.status_code)
+        REGISTRO.sumar('http_responses_total', etiquetas)
+        REGISTRO.guardar_si_toca()
+        return respuesta
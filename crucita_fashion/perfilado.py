@@ -0,0 +1,197 @@
+"""
+Modulo que contiene el perfilado de las peticiones. Con
+PERFILADO activo, el middleware mide el numero de consultas,
+el tiempo en SQL y el tiempo en Python de cada peticion, los
+devuelve en el encabezado Server-Timing, registra las
+peticiones lentas con sus consultas mas lentas y acumula las
+estadisticas de cada vista. Las consultas de las respuestas
+que se generan por partes (exportaciones) despues de que la
+vista termina no se cuentan
+"""
+import logging
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from threading import Lock
+from django.conf import settings
+from django.db import connections
+
+LOGGER = logging.getLogger(__name__)
+
+# Metodos que se usan como etiqueta, el resto se agrupa en 'otro' para
+# que un cliente no pueda crear estadisticas sin limite
+METODOS = frozenset(('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'))
+
+class Perfil:
+    """
+    Consultas hechas durante una peticion, se
+    registra como execute_wrapper de las conexiones
+    """
+
+    def __init__(self):
+        """
+        Crea el perfil
+        vacio
+        """
+        self.consultas = []
+        self.inicio = time.perf_counter()
+
+    def __call__(self, execute, sql, params, many, context): # pylint: disable=too-many-arguments
+        """
+        Ejecuta la consulta y guarda
+        su duracion
+        """
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append((time.perf_counter() - inicio, sql))
+
+    @contextmanager
+    def en_conexiones(self):
+        """
+        Registra el perfil en todas las conexiones
+        mientras se ejecuta el bloque
+        """
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(self))
+            yield self
+
+    def resumen(self):
+        """
+        Devuelve el numero de consultas y los milisegundos
+        en SQL, en Python y en total hasta ahora
+        """
+        total = (time.perf_counter() - self.inicio) * 1000
+        sql = sum(duracion for duracion, _ in self.consultas) * 1000
+        return len(self.consultas), sql, total - sql, total
+
+    def mas_lentas(self, cantidad):
+        """
+        Devuelve las consultas mas lentas como
+        (milisegundos, sql)
+        """
+        lentas = sorted(self.consultas, key=lambda consulta: consulta[0], reverse=True)
+        return [(duracion * 1000, sql) for duracion, sql in lentas[:cantidad]]
+
+class _Estadisticas:
+    """
+    Estadisticas acumuladas de cada vista
+    en este proceso
+    """
+
+    def __init__(self):
+        """
+        Crea las estadisticas
+        vacias
+        """
+        self._vistas = {}
+        self._candado = Lock()
+
+    def agregar(self, vista, resumen):
+        """
+        Suma una peticion (el resumen de su perfil)
+        a las estadisticas de la vista
+        """
+        consultas, sql, python, total = resumen
+        with self._candado:
+            datos = self._vistas.setdefault(vista, {
+                'peticiones': 0, 'consultas': 0, 'sql_ms': 0.0, 'python_ms': 0.0,
+                'total_ms': 0.0, 'maximo_ms': 0.0,
+            })
+            datos['peticiones'] += 1
+            datos['consultas'] += consultas
+            datos['sql_ms'] += sql
+            datos['python_ms'] += python
+            datos['total_ms'] += total
+            datos['maximo_ms'] = max(datos['maximo_ms'], total)
+
+    def valores(self):
+        """
+        Devuelve los totales y promedios de cada vista,
+        ordenadas por tiempo total de mayor a menor
+        """
+        with self._candado:
+            vistas = [(vista, dict(datos)) for vista, datos in self._vistas.items()]
+        resultado = OrderedDict()
+        for vista, datos in sorted(vistas, key=lambda vista: -vista[1]['total_ms']):
+            peticiones = datos['peticiones']
+            datos['consultas_promedio'] = datos['consultas'] / peticiones
+            datos['sql_ms_promedio'] = datos['sql_ms'] / peticiones
+            datos['total_ms_promedio'] = datos['total_ms'] / peticiones
+            resultado[vista] = datos
+        return resultado
+
+    def reiniciar(self):
+        """
+        Elimina las estadisticas
+        de todas las vistas
+        """
+        with self._candado:
+            self._vistas.clear()
+
+ESTADISTICAS = _Estadisticas()
+
+def metodo(request):
+    """
+    Devuelve el metodo de la peticion si es uno
+    de METODOS y si no 'otro'
+    """
+    return request.method if request.method in METODOS else 'otro'
+
+def nombre_vista(request):
+    """
+    Devuelve el metodo y el nombre de la url de la
+    vista (ej: GET inventario:buscar)
+    """
+    coincidencia = getattr(request, 'resolver_match', None)
+    nombre = coincidencia.view_name if coincidencia is not None else 'sin_vista'
+    return '{} {}'.format(metodo(request), nombre)
+
+def server_timing(consultas, sql, python, total):
+    """
+    Devuelve el valor del encabezado
+    Server-Timing
+    """
+    return 'sql;dur={:.2f};desc="{} consultas", python;dur={:.2f}, total;dur={:.2f}'.format(
+        sql, consultas, python, total
+    )
+
+class PerfiladoMiddleware: # pylint: disable=too-few-public-methods
+    """
+    Middleware que perfila cada peticion cuando
+    PERFILADO esta activo
+    """
+
+    def __init__(self, get_response):
+        """
+        Guarda la siguiente
+        funcion de la cadena
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Atiende la peticion midiendo
+        sus consultas
+        """
+        if not settings.PERFILADO:
+            return self.get_response(request)
+
+        with Perfil().en_conexiones() as perfil:
+            respuesta = self.get_response(request)
+
+        resumen = perfil.resumen()
+        consultas, sql, _, total = resumen
+        respuesta['Server-Timing'] = server_timing(*resumen)
+        vista = nombre_vista(request)
+        ESTADISTICAS.agregar(vista, resumen)
+        if total > settings.PERFILADO_LENTA_MS or consultas > settings.PERFILADO_MAX_CONSULTAS:
+            lentas = ''.join(
+                '\n  {:.2f}ms {}'.format(duracion, consulta)
+                for duracion, consulta in perfil.mas_lentas(settings.PERFILADO_CONSULTAS_LENTAS)
+            )
+            LOGGER.warning("%s %s: %.2fms, %d consultas (%.2fms en SQL)%s", vista,
+                           request.get_full_path(), total, consultas, sql, lentas)
+        return respuesta
@@ -3,6 +3,7 @@ Modulo que contiene permisos que pueden ser
 usados en distintos modulos
 """
 from rest_framework import permissions
+from usuarios.roles import rol_de
 
 class IsStaff(permissions.BasePermission):
     """
@@ -14,6 +15,4 @@ class IsStaff(permissions.BasePermission):
         Verifica que el usuario que esta creando, viendo o
         buscando sea SuperUsuario, Administrador o Vendedor
         """
-        usuario_loggeado = request.user
-        grupo = usuario_loggeado.grupo.name
-        return grupo in ["SuperUsuario", "Administrador", "Vendedor"]
+        return rol_de(request.user).es_staff
@@ -0,0 +1,33 @@
+"""
+Modulo que contiene el ejecutor de las pruebas
+del proyecto
+"""
+import shutil
+import tempfile
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+class EjecutorPruebas(DiscoverRunner):
+    """
+    Ejecutor que guarda las metricas en un directorio
+    temporal en lugar de METRICAS_DIR, asi las pruebas no
+    escriben en el directorio de los workers
+    """
+
+    def setup_test_environment(self, **kwargs):
+        """
+        Prepara el entorno con el
+        directorio temporal
+        """
+        super().setup_test_environment(**kwargs)
+        self.directorio_metricas = tempfile.mkdtemp() # pylint: disable=attribute-defined-outside-init
+        settings.METRICAS_DIR = self.directorio_metricas
+
+    def teardown_test_environment(self, **kwargs):
+        """
+        Desactiva las metricas, para que no se guarden
+        al salir, y elimina el directorio temporal
+        """
+        settings.METRICAS = False
+        shutil.rmtree(self.directorio_metricas, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
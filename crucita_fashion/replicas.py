@@ -0,0 +1,161 @@
+"""
+Modulo que envia las lecturas de las vistas de listas a
+las replicas de la base de datos (REPLICAS). Las vistas con
+LecturaReplicaMixin eligen una replica por peticion y el
+router dirige a ella todas las lecturas de la vista, las
+escrituras siempre van a default. Despues de que un cliente
+modifica algo, sus lecturas van a default durante
+REPLICAS_RETRASO segundos para que vea sus cambios aunque
+las replicas esten atrasadas. El cliente se marca con una
+cookie firmada y, si esta autenticado, tambien el usuario en
+el cache REPLICAS_CACHE, asi los clientes con JWT que no
+guardan cookies leen sus cambios
+"""
+import random
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+# Cookie firmada que indica que el cliente escribio hace poco
+COOKIE = 'leer_primaria'
+
+_ESTADO = threading.local()
+
+@contextmanager
+def leer_de(alias):
+    """
+    Dirige las lecturas del hilo a la base de
+    datos indicada dentro del bloque
+    """
+    anterior = getattr(_ESTADO, 'alias', None)
+    _ESTADO.alias = alias
+    try:
+        yield
+    finally:
+        _ESTADO.alias = anterior
+
+def llave_usuario(usuario):
+    """
+    Devuelve la llave del cache que indica
+    que el usuario escribio hace poco
+    """
+    return '{}:{}'.format(COOKIE, usuario.pk)
+
+def usuario_escribio(request):
+    """
+    Devuelve True si el usuario autenticado de la
+    peticion escribio hace menos de REPLICAS_RETRASO
+    """
+    usuario = getattr(request, 'user', None)
+    if usuario is None or not usuario.is_authenticated:
+        return False
+    return caches[settings.REPLICAS_CACHE].get(llave_usuario(usuario)) is not None
+
+def replica_para(request):
+    """
+    Devuelve la replica que debe usar la peticion, o
+    None si no hay replicas o el cliente escribio hace
+    menos de REPLICAS_RETRASO segundos
+    """
+    if not settings.REPLICAS:
+        return None
+    reciente = request.get_signed_cookie(COOKIE, default=None, salt=COOKIE,
+                                         max_age=settings.REPLICAS_RETRASO)
+    if reciente is not None or usuario_escribio(request):
+        return None
+    return random.choice(settings.REPLICAS)
+
+class ReplicaRouter:
+    """
+    Router que envia las lecturas a la base de datos
+    elegida con leer_de, fuera de esos bloques no opina y
+    Django usa default. Las escrituras van a default
+    """
+
+    def db_for_read(self, model, **hints): # pylint: disable=unused-argument,no-self-use
+        """
+        Devuelve la base de datos de
+        las lecturas del hilo
+        """
+        return getattr(_ESTADO, 'alias', None)
+
+    def db_for_write(self, model, **hints): # pylint: disable=unused-argument,no-self-use
+        """
+        Los objetos leidos de una replica
+        se guardan en default
+        """
+        instancia = hints.get('instance')
+        if instancia is not None and instancia._state.db in settings.REPLICAS: # pylint: disable=protected-access
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints): # pylint: disable=unused-argument,no-self-use
+        """
+        Las replicas tienen los mismos datos que
+        default, se permiten relaciones entre ellas
+        """
+        bases = {DEFAULT_DB_ALIAS} | set(settings.REPLICAS)
+        if {obj1._state.db, obj2._state.db} <= bases: # pylint: disable=protected-access
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints): # pylint: disable=unused-argument,no-self-use,invalid-name
+        """
+        Solo se migra default, las replicas
+        reciben los cambios por la replicacion
+        """
+        return db == DEFAULT_DB_ALIAS
+
+class LecturaReplicaMixin: # pylint: disable=too-few-public-methods
+    """
+    Mixin para vistas de solo lectura que hace las consultas
+    del metodo get en una replica. La autenticacion y los
+    permisos se resuelven antes en default. request.replica
+    indica la replica usada (None si se uso default)
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Responde leyendo de la replica
+        elegida para la peticion
+        """
+        request.replica = replica_para(request)
+        if request.replica is None:
+            return super().get(request, *args, **kwargs)
+        with leer_de(request.replica):
+            return super().get(request, *args, **kwargs)
+
+class PrimariaDespuesDeEscribirMiddleware: # pylint: disable=too-few-public-methods
+    """
+    Middleware que marca con una cookie a los clientes que
+    hicieron una peticion que modifica datos (POST, PUT, PATCH
+    o DELETE exitosos), para que sus lecturas vayan a default.
+    Si el usuario esta autenticado tambien se marca en el cache
+    """
+
+    def __init__(self, get_response):
+        """
+        Guarda la siguiente
+        funcion de la cadena
+        """
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """
+        Agrega la cookie a la respuesta y marca al
+        usuario si la peticion pudo modificar datos
+        """
+        respuesta = self.get_response(request)
+        if settings.REPLICAS and request.method not in SAFE_METHODS \
+                and respuesta.status_code < 400:
+            respuesta.set_signed_cookie(COOKIE, '1', salt=COOKIE,
+                                        max_age=settings.REPLICAS_RETRASO, httponly=True)
+            # Con JWT rest_framework asigna request.user al autenticar
+            usuario = getattr(request, 'user', None)
+            if usuario is not None and usuario.is_authenticated:
+                caches[settings.REPLICAS_CACHE].set(llave_usuario(usuario), 1,
+                                                    settings.REPLICAS_RETRASO)
+        return respuesta
@@ -0,0 +1,218 @@
+"""
+Modulo que contiene el cache de respuestas de las vistas
+de listas. Las respuestas se guardan en el cache de Django
+indicado en RESPUESTAS_CACHE, con una llave que depende de
+los parametros normalizados, el rol del usuario y la version
+del grupo de la vista. Al modificar un modelo se incrementa
+la version de su grupo, asi las respuestas anteriores dejan
+de usarse sin tener que buscarlas. La version solo la ven
+todos los workers si el cache es compartido, por eso con el
+cache local de cada proceso queda desactivado por defecto
+"""
+import hashlib
+import time
+from collections import defaultdict
+from threading import Lock
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe, urlencode
+from rest_framework.response import Response
+from usuarios.roles import rol_de
+from crucita_fashion.metricas import registrar_colector
+
+# Encabezados de validacion que se guardan junto con los datos
+ENCABEZADOS = ('ETag', 'Last-Modified')
+
+class _Contadores:
+    """
+    Aciertos y fallos de cada grupo en
+    este proceso
+    """
+
+    def __init__(self):
+        """
+        Crea los contadores
+        en cero
+        """
+        self._valores = defaultdict(lambda: {'aciertos': 0, 'fallos': 0})
+        self._candado = Lock()
+
+    def sumar(self, grupo, contador):
+        """
+        Suma uno al contador
+        del grupo
+        """
+        with self._candado:
+            self._valores[grupo][contador] += 1
+
+    def valores(self):
+        """
+        Devuelve una copia de los
+        contadores de cada grupo
+        """
+        with self._candado:
+            return {grupo: dict(valores) for grupo, valores in self._valores.items()}
+
+    def reiniciar(self):
+        """
+        Deja todos los contadores
+        en cero
+        """
+        with self._candado:
+            self._valores.clear()
+
+CONTADORES = _Contadores()
+
+@registrar_colector
+def metricas_respuestas():
+    """
+    Devuelve las lecturas del cache de respuestas
+    de cada grupo para las metricas
+    """
+    muestras = []
+    for grupo, valores in CONTADORES.valores().items():
+        cache = 'respuestas_{}'.format(grupo)
+        muestras.append(('cache_requests_total', {'cache': cache, 'resultado': 'acierto'},
+                         valores['aciertos']))
+        muestras.append(('cache_requests_total', {'cache': cache, 'resultado': 'fallo'},
+                         valores['fallos']))
+    return muestras
+
+def _cache():
+    """
+    Devuelve el cache de Django
+    de las respuestas
+    """
+    return caches[settings.RESPUESTAS_CACHE]
+
+def _llave_version(grupo):
+    """
+    Devuelve la llave de la
+    version del grupo
+    """
+    return 'respuestas:version:{}'.format(grupo)
+
+def version(grupo):
+    """
+    Devuelve la version actual del grupo. Si no existe
+    se crea a partir de la hora, asi si el cache la descarta
+    la nueva version no coincide con las anteriores
+    """
+    cache = _cache()
+    llave = _llave_version(grupo)
+    actual = cache.get(llave)
+    if actual is None:
+        cache.add(llave, int(time.time() * 1000), timeout=None)
+        actual = cache.get(llave)
+    return actual
+
+def _llave_cambio(grupo):
+    """
+    Devuelve la llave de la hora del
+    ultimo cambio del grupo
+    """
+    return 'respuestas:cambio:{}'.format(grupo)
+
+def _incrementar(grupo):
+    """
+    Incrementa la version del grupo y
+    guarda la hora del cambio
+    """
+    _cache().set(_llave_cambio(grupo), time.time(), timeout=None)
+    try:
+        _cache().incr(_llave_version(grupo))
+    except ValueError:
+        # La version no existe, la siguiente lectura crea una nueva
+        pass
+
+def invalidar_grupo(grupo):
+    """
+    Incrementa la version del grupo ahora y de nuevo al
+    confirmar la transaccion, por si otra peticion guardo la
+    respuesta anterior mientras la transaccion seguia abierta
+    """
+    _incrementar(grupo)
+    transaction.on_commit(lambda: _incrementar(grupo))
+
+def cambio_reciente(grupo):
+    """
+    Indica si el grupo cambio hace menos de REPLICAS_RETRASO
+    segundos, una replica podria no tener el cambio todavia
+    """
+    return time.time() - _cache().get(_llave_cambio(grupo), 0) < settings.REPLICAS_RETRASO
+
+def parametros_normalizados(request):
+    """
+    Devuelve los parametros del request ordenados por
+    nombre y valor, asi ?a=1&b=2 y ?b=2&a=1 usan la misma llave
+    """
+    return urlencode(sorted(
+        (nombre, valor)
+        for nombre in request.query_params
+        for valor in request.query_params.getlist(nombre)
+    ))
+
+class RespuestaCacheMixin:
+    """
+    Mixin para vistas con metodo get que guarda la respuesta
+    en el cache. Las vistas indican en cache_grupo el grupo
+    que se invalida cuando cambian sus modelos. Las respuestas
+    incluyen el encabezado X-Cache (HIT o MISS), y si la vista
+    devuelve ETag o Last-Modified se responde 304 sin leer la
+    base de datos. Las respuestas leidas de una replica justo
+    despues de un cambio del grupo no se guardan
+    """
+    cache_grupo = None
+
+    def llave_cache(self, request):
+        """
+        Devuelve la llave de la respuesta: la url sin
+        parametros (incluye el host de las urls absolutas), el
+        formato, el rol del usuario y los parametros normalizados
+        """
+        partes = (
+            request.build_absolute_uri(request.path),
+            request.accepted_renderer.format,
+            rol_de(request.user).nombre,
+            parametros_normalizados(request),
+        )
+        resumen = hashlib.md5('|'.join(partes).encode('utf-8')).hexdigest()
+        return 'respuestas:{}:{}:{}'.format(self.cache_grupo, version(self.cache_grupo), resumen)
+
+    def get(self, request, *args, **kwargs):
+        """
+        Responde con la respuesta guardada si existe, si
+        no responde normalmente y guarda la respuesta
+        """
+        if not settings.RESPUESTAS_CACHE_ACTIVO:
+            return super().get(request, *args, **kwargs)
+
+        llave = self.llave_cache(request)
+        guardada = _cache().get(llave)
+        if guardada is not None:
+            CONTADORES.sumar(self.cache_grupo, 'aciertos')
+            datos, encabezados = guardada
+            respuesta = get_conditional_response(
+                request,
+                etag=encabezados.get('ETag'),
+                last_modified=parse_http_date_safe(encabezados.get('Last-Modified', ''))
+            )
+            if respuesta is None:
+                respuesta = Response(datos)
+            for encabezado, valor in encabezados.items():
+                respuesta[encabezado] = valor
+            respuesta['X-Cache'] = 'HIT'
+            return respuesta
+
+        CONTADORES.sumar(self.cache_grupo, 'fallos')
+        respuesta = super().get(request, *args, **kwargs)
+        leida_de_replica = getattr(request, 'replica', None) is not None
+        if respuesta.status_code == 200 and not (leida_de_replica and
+                                                 cambio_reciente(self.cache_grupo)):
+            encabezados = {encabezado: respuesta[encabezado] for encabezado in ENCABEZADOS
+                           if respuesta.has_header(encabezado)}
+            _cache().set(llave, (respuesta.data, encabezados), settings.RESPUESTAS_CACHE_TTL)
+        respuesta['X-Cache'] = 'MISS'
+        return respuesta
@@ -0,0 +1,224 @@
+"""
+Script que contiene las pruebas de las
+utilidades de los benchmarks
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from inventario.cache import CACHE_CODIGOS, GRUPO_PRODUCTOS, GRUPO_CATEGORIAS
+from inventario.models import Producto
+from usuarios.models import Usuario
+from ventas.models import Ventas
+from crucita_fashion.benchmark import percentil, datos_temporales, regresiones
+from crucita_fashion.benchmark_endpoints import nombres_de_urls
+from crucita_fashion.datos_sinteticos import crear_productos, crear_ventas, crear_usuarios
+from crucita_fashion.respuestas import version
+
+class BenchmarkTest(TestCase):
+    """
+    Clase que contiene las pruebas de
+    los benchmarks
+    """
+
+    def test_percentil(self):
+        """
+        Prueba el calculo de los percentiles
+        """
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil([7], 95), 7)
+
+    def test_datos_temporales_se_revierten(self):
+        """
+        Prueba que los datos creados dentro de
+        datos_temporales no quedan guardados
+        """
+        with datos_temporales():
+            Group.objects.create(name="Temporal")
+        self.assertFalse(Group.objects.filter(name="Temporal").exists())
+
+    def test_datos_temporales_invalidan_los_caches(self):
+        """
+        Prueba que al revertir los datos temporales se
+        descartan las respuestas y codigos guardados en
+        cache durante el bloque
+        """
+        with datos_temporales():
+            anteriores = {grupo: version(grupo) for grupo in (GRUPO_PRODUCTOS, GRUPO_CATEGORIAS)}
+            CACHE_CODIGOS.guardar("temporal", (0, {'codigo': "temporal"}))
+        for grupo, anterior in anteriores.items():
+            self.assertNotEqual(version(grupo), anterior)
+        self.assertEqual(len(CACHE_CODIGOS), 0)
+
+    def test_benchmark_autenticacion(self):
+        """
+        Prueba que el comando mide ambos tipos de
+        autenticacion y no deja datos guardados
+        """
+        salida = io.StringIO()
+        call_command('benchmark_autenticacion', peticiones=3, stdout=salida)
+        self.assertIn("sesion", salida.getvalue())
+        self.assertIn("jwt", salida.getvalue())
+        self.assertFalse(Usuario.objects.filter(username="benchmark").exists())
+
+    def test_crear_productos_sinteticos(self):
+        """
+        Prueba que se crean los productos pedidos y que
+        la misma semilla genera los mismos productos
+        """
+        self.assertEqual(crear_productos(30, semilla=1, lote=7, prefijo="a"), 30)
+        crear_productos(30, semilla=1, prefijo="b")
+        columnas = ('cantidad', 'costo', 'talla')
+        primeros = list(Producto.objects.filter(codigo__startswith="a-")
+                        .order_by('pk').values_list(*columnas))
+        segundos = list(Producto.objects.filter(codigo__startswith="b-")
+                        .order_by('pk').values_list(*columnas))
+        self.assertEqual(primeros, segundos)
+
+    def test_benchmark_indices(self):
+        """
+        Prueba que el comando muestra los planes de
+        las consultas y revierte el catalogo y los indices,
+        y que no corre sin DEBUG ni --permitir-produccion
+        """
+        salida = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('benchmark_indices', productos=50, repeticiones=2, stdout=salida)
+        call_command('benchmark_indices', productos=50, repeticiones=2,
+                     permitir_produccion=True, stdout=salida)
+        self.assertIn("producto_categoria_talla", salida.getvalue())
+        self.assertFalse(Producto.objects.exists())
+        with connection.cursor() as cursor:
+            indices = connection.introspection.get_constraints(cursor, 'inventario_producto')
+        self.assertIn('producto_agotados', indices)
+
+    def test_benchmark_codigo(self):
+        """
+        Prueba que el comando mide la busqueda por
+        codigo y deja el cache vacio
+        """
+        salida = io.StringIO()
+        call_command('benchmark_codigo', productos=20, peticiones=2, stdout=salida)
+        self.assertIn("codigo_con_cache", salida.getvalue())
+        self.assertEqual(len(CACHE_CODIGOS), 0)
+
+    def test_benchmark_serializacion(self):
+        """
+        Prueba que el comando compara ambas
+        formas de serializar
+        """
+        salida = io.StringIO()
+        call_command('benchmark_serializacion', productos=20, pagina=10, peticiones=2,
+                     stdout=salida)
+        self.assertIn("buscar lectura_rapida", salida.getvalue())
+        self.assertFalse(Producto.objects.exists())
+
+    def test_crear_ventas_sinteticas(self):
+        """
+        Prueba que cada venta sintetica tiene
+        lineas de productos existentes
+        """
+        crear_productos(10)
+        self.assertEqual(crear_ventas(25, lote=10), 25)
+        self.assertEqual(Ventas.objects.count(), 25)
+        self.assertFalse(Ventas.objects.filter(lineas__isnull=True).exists())
+
+    def test_crear_usuarios_sinteticos(self):
+        """
+        Prueba que se crean los usuarios de cada grupo
+        menos SuperUsuario y que no pueden iniciar sesion
+        """
+        self.assertEqual(crear_usuarios(3, lote=2), 9)
+        for grupo in Group.objects.exclude(name="SuperUsuario"):
+            self.assertEqual(Usuario.objects.filter(grupo=grupo).count(), 3)
+        self.assertFalse(Usuario.objects.filter(grupo__name="SuperUsuario").exists())
+        self.assertFalse(Usuario.objects.filter(is_superuser=True).exists())
+        usuario = Usuario.objects.get(username="sintetico-administrador-0")
+        self.assertFalse(usuario.has_usable_password())
+
+    def test_generar_datos(self):
+        """
+        Prueba que el comando genera todos los datos,
+        no repite un prefijo existente y no corre sin
+        DEBUG ni --permitir-produccion
+        """
+        salida = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('generar_datos', productos=1, ventas=0, usuarios=0, stdout=salida)
+        self.assertFalse(Producto.objects.exists())
+        call_command('generar_datos', productos=20, ventas=30, usuarios=2, lote=7,
+                     permitir_produccion=True, stdout=salida)
+        self.assertIn("30 ventas", salida.getvalue())
+        self.assertEqual(Producto.objects.count(), 20)
+        self.assertEqual(Ventas.objects.count(), 30)
+        self.assertEqual(Usuario.objects.filter(username__startswith="sintetico-").count(), 6)
+        with self.assertRaises(CommandError):
+            call_command('generar_datos', productos=1, ventas=0, usuarios=0,
+                         permitir_produccion=True, stdout=salida)
+
+    def test_benchmark_json(self):
+        """
+        Prueba que el comando mide ambos
+        renderers y revierte los datos
+        """
+        salida = io.StringIO()
+        call_command('benchmark_json', productos=10, repeticiones=2, stdout=salida)
+        self.assertIn("ventas parse json_rapido", salida.getvalue())
+        self.assertFalse(Ventas.objects.exists())
+
+    def test_regresiones(self):
+        """
+        Prueba que se marcan como regresion los aumentos
+        del p95 sobre la tolerancia, mas consultas y
+        cambios de estado
+        """
+        base = {
+            'a': {'estado': 200, 'consultas': 2, 'p95': 10.0},
+            'b': {'estado': 200, 'consultas': 2, 'p95': 10.0},
+            'c': {'estado': 200, 'consultas': 2, 'p95': 10.0},
+        }
+        actuales = {
+            'a': {'estado': 200, 'consultas': 2, 'p95': 11.0},
+            'b': {'estado': 200, 'consultas': 3, 'p95': 13.0},
+            'c': {'estado': 500, 'consultas': 2, 'p95': 10.5},
+            'nuevo': {'estado': 200, 'consultas': 9, 'p95': 99.0},
+        }
+        encontradas = regresiones(actuales, base, tolerancia=0.2, minimo_ms=1)
+        self.assertEqual(sorted(nombre for nombre, _ in encontradas), ['b', 'b', 'c'])
+        self.assertEqual(regresiones(actuales, base, tolerancia=0.2, minimo_ms=5)[0][0], 'b')
+
+    def test_benchmark_endpoints(self):
+        """
+        Prueba que el comando mide todas las urls, guarda
+        los resultados, crea la base y detecta regresiones
+        """
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        salida = os.path.join(directorio, 'resultados.json')
+        base = os.path.join(directorio, 'base.json')
+        opciones = {'productos': 5, 'ventas': 3, 'peticiones': 1, 'peticiones_pesadas': 1,
+                    'salida': salida, 'base': base, 'stdout': io.StringIO()}
+        call_command('benchmark_endpoints', **opciones)
+        with open(salida) as archivo:
+            corrida = json.load(archivo)
+        self.assertEqual({caso['url'] for caso in corrida['casos'].values()}, nombres_de_urls())
+        self.assertTrue(all(caso['estado'] < 400 for caso in corrida['casos'].values()))
+        self.assertEqual(corrida['datos']['productos'], 5)
+        self.assertTrue(os.path.exists(base))
+        self.assertFalse(Producto.objects.exists())
+
+        corrida['casos']['GET ventas:detalles']['consultas'] = 0
+        with open(base, 'w') as archivo:
+            json.dump(corrida, archivo)
+        # Con una sola peticion los tiempos varian, solo se comparan las consultas
+        opciones['tolerancia'] = 1000
+        with self.assertRaisesRegex(CommandError, "1 regresiones"):
+            call_command('benchmark_endpoints', stderr=io.StringIO(), **opciones)
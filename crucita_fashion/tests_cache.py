@@ -0,0 +1,61 @@
+"""
+Script que contiene las pruebas
+del cache LRU en memoria
+"""
+from unittest import mock
+from django.test import SimpleTestCase
+from crucita_fashion.cache import CacheLRU
+
+class CacheLRUTest(SimpleTestCase):
+    """
+    Clase que contiene las pruebas
+    del CacheLRU
+    """
+
+    def test_guardar_y_obtener(self):
+        """
+        Prueba que se obtiene lo guardado y que
+        se cuentan los aciertos y fallos
+        """
+        cache = CacheLRU(maximo=2, ttl=60)
+        cache.guardar("a", 1)
+        self.assertEqual(cache.obtener("a"), 1)
+        self.assertIsNone(cache.obtener("b"))
+        self.assertEqual((cache.aciertos, cache.fallos), (1, 1))
+
+    def test_descarta_la_entrada_usada_hace_mas_tiempo(self):
+        """
+        Prueba que al llenarse se descarta la
+        entrada usada hace mas tiempo
+        """
+        cache = CacheLRU(maximo=2, ttl=60)
+        cache.guardar("a", 1)
+        cache.guardar("b", 2)
+        cache.obtener("a")
+        cache.guardar("c", 3)
+        self.assertIsNone(cache.obtener("b"))
+        self.assertEqual((cache.obtener("a"), cache.obtener("c")), (1, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_entradas_vencen(self):
+        """
+        Prueba que las entradas vencen despues
+        de su tiempo de vida
+        """
+        cache = CacheLRU(maximo=2, ttl=10)
+        with mock.patch('crucita_fashion.cache.time.monotonic', return_value=100):
+            cache.guardar("a", 1)
+        with mock.patch('crucita_fashion.cache.time.monotonic', return_value=111):
+            self.assertIsNone(cache.obtener("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_eliminar_si(self):
+        """
+        Prueba que se eliminan las entradas
+        que cumplen la condicion
+        """
+        cache = CacheLRU(maximo=5, ttl=60)
+        for llave, valor in (("a", 1), ("b", 2), ("c", 3)):
+            cache.guardar(llave, valor)
+        cache.eliminar_si(lambda valor: valor % 2 == 1)
+        self.assertEqual((cache.obtener("a"), cache.obtener("b")), (None, 2))
@@ -0,0 +1,87 @@
+"""
+Script que contiene las pruebas de la verificacion
+de las conexiones persistentes
+"""
+import io
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from crucita_fashion.conexiones import verificar_conexiones
+
+class VerificarConexionesTest(TransactionTestCase):
+    """
+    Clase que contiene las pruebas de la
+    verificacion de las conexiones
+    """
+
+    def setUp(self):
+        """
+        Abre la conexion y la marca como
+        usada hace mucho tiempo
+        """
+        connection.ensure_connection()
+        connection.ultimo_uso = float('-inf')
+
+    def test_cierra_conexion_que_no_responde(self):
+        """
+        Prueba que una conexion que no
+        responde se cierra
+        """
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as cerrar, \
+                self.assertLogs('crucita_fashion.conexiones', 'WARNING') as registro:
+            self.assertEqual(verificar_conexiones(), 1)
+        cerrar.assert_called_once_with()
+        self.assertEqual(registro.output, [
+            "WARNING:crucita_fashion.conexiones:Se descarto la conexion default, no respondio"
+        ])
+
+    def test_no_cierra_conexion_que_responde(self):
+        """
+        Prueba que una conexion que responde
+        se sigue usando
+        """
+        with mock.patch.object(connection, 'close') as cerrar:
+            self.assertEqual(verificar_conexiones(), 0)
+        cerrar.assert_not_called()
+
+    @override_settings(DB_VERIFICAR_INACTIVA=60)
+    def test_no_verifica_conexion_reciente(self):
+        """
+        Prueba que las conexiones usadas hace menos
+        de DB_VERIFICAR_INACTIVA no se verifican
+        """
+        connection.ultimo_uso = float('inf')
+        with mock.patch.object(connection, 'is_usable') as verificar:
+            self.assertEqual(verificar_conexiones(), 0)
+        verificar.assert_not_called()
+
+    def test_no_verifica_dentro_de_transaccion(self):
+        """
+        Prueba que no se cierra una conexion
+        con una transaccion abierta
+        """
+        with transaction.atomic(), \
+                mock.patch.object(connection, 'is_usable', return_value=False):
+            self.assertEqual(verificar_conexiones(), 0)
+
+    @override_settings(DB_VERIFICAR_INACTIVA=None)
+    def test_desactivada(self):
+        """
+        Prueba que sin DB_VERIFICAR_INACTIVA
+        no se verifica nada
+        """
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            self.assertEqual(verificar_conexiones(), 0)
+
+    def test_benchmark_conexiones(self):
+        """
+        Prueba que el comando mide cada caso y
+        restaura la configuracion de la conexion
+        """
+        original = connection.settings_dict['CONN_MAX_AGE']
+        salida = io.StringIO()
+        call_command('benchmark_conexiones', peticiones=3, stdout=salida)
+        self.assertIn("persistente_verificada", salida.getvalue())
+        self.assertEqual(connection.settings_dict['CONN_MAX_AGE'], original)
@@ -0,0 +1,145 @@
+"""
+Script que contiene las pruebas del renderer y
+el parser JSON de la api
+"""
+import io
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from crucita_fashion import json_rapido
+from crucita_fashion.json_rapido import JSONRapidoRenderer, JSONRapidoParser
+
+def datos_de_prueba():
+    """
+    Devuelve datos con los tipos que
+    aparecen en las respuestas de la api
+    """
+    return OrderedDict([
+        ('fecha', date(2019, 1, 20)),
+        ('hora', datetime(2019, 1, 20, 10, 5, 3, 123456, tzinfo=timezone.utc)),
+        ('hora_local', datetime(2019, 1, 20, 10, 5)),
+        ('apertura', time(9, 30)),
+        ('duracion', timedelta(minutes=90)),
+        ('costos', [10.5, 7.0, 0.1 + 0.2, 1e16, 1e-7, 3]),
+        ('total', Decimal('12.50')),
+        ('texto', "Camisa ñandú \u2028 linea\u2029"),
+        ('mensaje', gettext_lazy("This field is required.")),
+        ('errores', [ErrorDetail("Requerido", code='required')]),
+        ('llaves', {1: "uno", 2.5: "dos"}),
+        ('anidados', (None, True, False, {'vacio': []})),
+        ('grande', 2 ** 70),
+    ])
+
+@skipIf(json_rapido.orjson is None, "orjson no esta instalado")
+class JSONRapidoRendererTest(SimpleTestCase):
+    """
+    Clase que compara el renderer con
+    el JSONRenderer de rest_framework
+    """
+
+    def test_mismo_json(self):
+        """
+        Prueba que se producen los mismos
+        valores que con JSONRenderer
+        """
+        datos = datos_de_prueba()
+        grande = datos.pop('grande')
+        rapido = JSONRapidoRenderer().render(datos)
+        normal = JSONRenderer().render(datos)
+        self.assertEqual(JSONParser().parse(io.BytesIO(rapido)),
+                         JSONParser().parse(io.BytesIO(normal)))
+        self.assertIn(b'"hora":"2019-01-20T10:05:03.123456Z"', rapido)
+        self.assertIn(b'\\u2028', rapido)
+        datos['grande'] = grande
+        self.assertEqual(JSONRapidoRenderer().render(datos)[-25:],
+                         JSONRenderer().render(datos)[-25:])
+
+    def test_indentacion(self):
+        """
+        Prueba que con indentacion la
+        respuesta es la de JSONRenderer
+        """
+        datos = {'codigo': "1", 'costo': 10.5}
+        media_type = 'application/json; indent=4'
+        self.assertEqual(JSONRapidoRenderer().render(datos, media_type),
+                         JSONRenderer().render(datos, media_type))
+
+    def test_nada(self):
+        """
+        Prueba que None produce
+        una respuesta vacia
+        """
+        self.assertEqual(JSONRapidoRenderer().render(None), b'')
+
+    def test_tipo_no_soportado(self):
+        """
+        Prueba que un objeto que no se puede
+        convertir lanza el mismo error
+        """
+        with self.assertRaises(TypeError):
+            JSONRapidoRenderer().render({'objeto': object()})
+
+    def test_no_finitos(self):
+        """
+        Prueba que los float que no son finitos lanzan
+        ValueError como en JSONRenderer y que null no
+        """
+        for valor in (float('nan'), float('inf'), -float('inf')):
+            with self.assertRaises(ValueError):
+                JSONRapidoRenderer().render({'costos': [1.5, None, valor]})
+        self.assertEqual(JSONRapidoRenderer().render({'talla': None}), b'{"talla":null}')
+
+class JSONRapidoParserTest(SimpleTestCase):
+    """
+    Clase que contiene las pruebas
+    del parser
+    """
+
+    def test_parse(self):
+        """
+        Prueba que se leen los mismos datos
+        con y sin orjson
+        """
+        contenido = '{"codigo":"ñ1","costo":10.5,"lineas":[1,2],"foto":null}'.encode('utf-8')
+        esperados = JSONParser().parse(io.BytesIO(contenido))
+        self.assertEqual(JSONRapidoParser().parse(io.BytesIO(contenido)), esperados)
+        with mock.patch.object(json_rapido, 'orjson', None):
+            self.assertEqual(JSONRapidoParser().parse(io.BytesIO(contenido)), esperados)
+
+    def test_json_invalido(self):
+        """
+        Prueba que el error es el mismo
+        que con JSONParser
+        """
+        for contenido in (b'{"codigo":', b'{"costo": NaN}'):
+            with self.assertRaises(ParseError) as normal:
+                JSONParser().parse(io.BytesIO(contenido))
+            with self.assertRaises(ParseError) as rapido:
+                JSONRapidoParser().parse(io.BytesIO(contenido))
+            self.assertEqual(str(rapido.exception), str(normal.exception))
+
+    def test_otra_codificacion(self):
+        """
+        Prueba que se aceptan cuerpos que
+        no estan en UTF-8
+        """
+        contenido = '{"codigo":"ñ"}'.encode('latin-1')
+        datos = JSONRapidoParser().parse(io.BytesIO(contenido),
+                                         parser_context={'encoding': 'latin-1'})
+        self.assertEqual(datos, {'codigo': "ñ"})
+
+    def test_sin_orjson(self):
+        """
+        Prueba que sin orjson el renderer
+        es igual a JSONRenderer
+        """
+        datos = datos_de_prueba()
+        with mock.patch.object(json_rapido, 'orjson', None):
+            self.assertEqual(JSONRapidoRenderer().render(datos), JSONRenderer().render(datos))
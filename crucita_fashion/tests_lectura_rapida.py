@@ -0,0 +1,121 @@
+"""
+Script que contiene las pruebas de la lectura
+rapida de listas, que debe producir la misma
+respuesta que los serializers
+"""
+from datetime import date, datetime
+from unittest import mock
+from django.test import override_settings
+from django.utils import timezone
+from django.urls import reverse_lazy
+from rest_framework import serializers, status
+from rest_framework.test import APITestCase
+from inventario.models import Producto, Categoria
+from inventario.serializers import ProductoSerializer
+from ventas.models import Ventas, LineaVenta
+from crucita_fashion.lectura_rapida import LecturaRapida, CampoNoSoportado
+
+@override_settings(LECTURA_RAPIDA=True)
+class LecturaRapidaTest(APITestCase):
+    """
+    Clase que compara las respuestas de la lectura
+    rapida con las de los serializers
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        """
+        Crea productos y ventas, e inicia sesion
+        con un usuario del staff
+        """
+        ropa = Categoria.objects.create(nombre="Ropa")
+        accesorio = Categoria.objects.create(nombre="Accesorio")
+        productos = [
+            Producto.objects.create(codigo="1", cantidad=3, costo=10.5, categoria=ropa,
+                                    talla="M", foto="coleccion/camisa.jpg"),
+            Producto.objects.create(codigo="2", cantidad=0, costo=7, categoria=accesorio),
+            Producto.objects.create(codigo="3", cantidad=1, costo=2.25, categoria=accesorio,
+                                    foto=""),
+        ]
+        for numero in range(3):
+            venta = Ventas.objects.create(
+                codigo=str(numero),
+                costo_total=12.5,
+                fecha=date(2019, 1, 20),
+                hora=datetime(2019, 1, 20, 10, numero, tzinfo=timezone.utc)
+            )
+            LineaVenta.objects.bulk_create([
+                LineaVenta(venta=venta, producto=producto, cantidad=numero + 1,
+                           precio_unitario=producto.costo)
+                for producto in productos[numero:]
+            ])
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def comparar(self, url, parametros=None):
+        """
+        Verifica que la respuesta con lectura rapida es
+        identica byte a byte a la de los serializers
+        """
+        with override_settings(LECTURA_RAPIDA=False):
+            normal = self.client.get(url, parametros)
+        rapida = self.client.get(url, parametros)
+        self.assertEqual(normal.status_code, status.HTTP_200_OK)
+        self.assertEqual(rapida.content, normal.content)
+
+    def test_productos_identicos(self):
+        """
+        Prueba la busqueda de productos, con
+        campos, orden y paginas
+        """
+        url = reverse_lazy('inventario:buscar')
+        self.comparar(url)
+        self.comparar(url, {'fields': "codigo,variantes"})
+        self.comparar(url, {'omit': "foto", 'ordering': "-costo", 'page_size': 2})
+        siguiente = self.client.get(url, {'ordering': "-costo", 'page_size': 2}).data['next']
+        self.comparar(siguiente)
+
+    def test_ventas_identicas(self):
+        """
+        Prueba el listado de ventas con
+        sus lineas
+        """
+        url = reverse_lazy('ventas:buscar')
+        self.comparar(url)
+        self.comparar(url, {'fields': "codigo,producto"})
+
+    def test_usuarios_identicos(self):
+        """
+        Prueba la busqueda de usuarios
+        """
+        self.comparar(reverse_lazy('usuarios:buscar'))
+        self.comparar(reverse_lazy('usuarios:buscar'), {'omit': "email"})
+
+    def test_no_usa_el_serializer_por_fila(self):
+        """
+        Prueba que la lectura rapida no llama al
+        serializer de los productos
+        """
+        with mock.patch.object(ProductoSerializer, 'to_representation',
+                               side_effect=AssertionError):
+            response = self.client.get(reverse_lazy('inventario:buscar'))
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_campo_no_soportado(self):
+        """
+        Prueba que los campos que no salen de una
+        columna no se aceptan
+        """
+        class CategoriaDeProductoSerializer(serializers.ModelSerializer):
+            """
+            Serializer con un campo de
+            una relacion
+            """
+            nombre_categoria = serializers.CharField(source='categoria.nombre')
+
+            class Meta:
+                model = Producto
+                fields = ('codigo', 'nombre_categoria')
+
+        with self.assertRaises(CampoNoSoportado):
+            LecturaRapida(CategoriaDeProductoSerializer())
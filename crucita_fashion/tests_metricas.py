@@ -0,0 +1,154 @@
+"""
+Script que contiene las pruebas de las
+metricas de la api
+"""
+import json
+import os
+import shutil
+import tempfile
+from django.test import override_settings
+from django.urls import reverse_lazy
+from rest_framework.test import APITestCase
+from rest_framework import status
+from inventario.models import Producto, Categoria
+from crucita_fashion import metricas
+from crucita_fashion.metricas import REGISTRO, exposicion, fusionar_proceso_terminado
+from crucita_fashion.respuestas import CONTADORES
+
+# Pid de un worker que no existe
+PID_AJENO = 999999999
+
+class MetricasTest(APITestCase):
+    """
+    Clase que contiene las pruebas
+    de las metricas
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        """
+        Reinicia las metricas en un directorio temporal,
+        crea un producto e inicia sesion con un usuario
+        """
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, True)
+        configuracion = override_settings(METRICAS=True, METRICAS_DIR=self.directorio,
+                                          METRICAS_TOKEN='secreto', RESPUESTAS_CACHE_ACTIVO=True)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+        REGISTRO.reiniciar()
+        CONTADORES.reiniciar()
+        categoria = Categoria.objects.create(nombre="Accesorio")
+        Producto.objects.create(codigo="1", cantidad=1, costo=1, categoria=categoria)
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def leer_metricas(self):
+        """
+        Devuelve la respuesta de la vista
+        de metricas con el token
+        """
+        return self.client.get(reverse_lazy('metricas'), HTTP_AUTHORIZATION='Bearer secreto')
+
+    def escribir_ajeno(self, nombre, instantanea):
+        """
+        Escribe la instantanea de otro
+        proceso en el directorio
+        """
+        with open(os.path.join(self.directorio, nombre), 'w') as archivo:
+            json.dump(instantanea, archivo)
+
+    def test_peticiones_por_url(self):
+        """
+        Prueba que se registran la duracion, el codigo
+        y las consultas por nombre de url
+        """
+        for _ in range(2):
+            self.client.get(reverse_lazy('inventario:buscar'))
+        response = self.leer_metricas()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        texto = response.content.decode()
+        self.assertIn('# TYPE crucita_http_request_duration_seconds histogram', texto)
+        self.assertIn('crucita_http_request_duration_seconds_count'
+                      '{metodo="GET",url="inventario:buscar"} 2', texto)
+        self.assertIn('crucita_http_request_duration_seconds_bucket'
+                      '{metodo="GET",url="inventario:buscar",le="+Inf"} 2', texto)
+        self.assertIn('crucita_http_responses_total'
+                      '{estado="200",metodo="GET",url="inventario:buscar"} 2', texto)
+        self.assertRegex(texto, r'crucita_db_queries_total'
+                                r'\{metodo="GET",url="inventario:buscar"\} [1-9]')
+
+    def test_proporcion_de_aciertos(self):
+        """
+        Prueba que se calcula la proporcion de
+        aciertos del cache de respuestas
+        """
+        for _ in range(4):
+            self.client.get(reverse_lazy('inventario:buscar'))
+        texto = self.leer_metricas().content.decode()
+        self.assertIn('crucita_cache_requests_total'
+                      '{cache="respuestas_productos",resultado="acierto"} 3', texto)
+        self.assertIn('crucita_cache_hit_ratio{cache="respuestas_productos"} 0.75', texto)
+
+    def test_suma_procesos(self):
+        """
+        Prueba que se suman las metricas guardadas
+        por otros procesos y las del acumulado
+        """
+        self.client.get(reverse_lazy('inventario:buscar'))
+        REGISTRO.guardar()
+        ajeno = {
+            'contadores': [['http_responses_total',
+                            [['estado', '200'], ['metodo', 'GET'], ['url', 'inventario:buscar']],
+                            2]],
+            'histogramas': [['http_request_duration_seconds',
+                             [['metodo', 'GET'], ['url', 'inventario:buscar']],
+                             [0] * len(metricas.BUCKETS), 30.0, 2]],
+        }
+        self.escribir_ajeno('{}.json'.format(PID_AJENO), ajeno)
+        self.escribir_ajeno(metricas.ACUMULADO, ajeno)
+        texto = exposicion(self.directorio)
+        self.assertIn('crucita_http_responses_total'
+                      '{estado="200",metodo="GET",url="inventario:buscar"} 5', texto)
+        self.assertIn('crucita_http_request_duration_seconds_count'
+                      '{metodo="GET",url="inventario:buscar"} 5', texto)
+
+    def test_fusiona_proceso_terminado(self):
+        """
+        Prueba que el archivo de un proceso terminado
+        se suma al acumulado y se elimina
+        """
+        ajeno = {'contadores': [['db_queries_total', [['url', 'x']], 4]], 'histogramas': []}
+        self.escribir_ajeno('{}.json'.format(PID_AJENO), ajeno)
+        self.escribir_ajeno(metricas.ACUMULADO, ajeno)
+        fusionar_proceso_terminado(PID_AJENO, self.directorio)
+        self.assertFalse(os.path.exists(os.path.join(self.directorio,
+                                                     '{}.json'.format(PID_AJENO))))
+        self.assertIn('crucita_db_queries_total{url="x"} 8', exposicion(self.directorio))
+
+    def test_metodos_desconocidos(self):
+        """
+        Prueba que los metodos que no son de HTTP no
+        crean series nuevas, se agrupan en otro
+        """
+        for metodo in ('BREW', 'XYZ'):
+            self.client.generic(metodo, reverse_lazy('inventario:buscar'))
+        texto = self.leer_metricas().content.decode()
+        self.assertIn('crucita_http_request_duration_seconds_count'
+                      '{metodo="otro",url="inventario:buscar"} 2', texto)
+        self.assertNotIn('BREW', texto)
+
+    def test_requiere_token(self):
+        """
+        Prueba que sin el token no se devuelven
+        las metricas, y que sin METRICAS_TOKEN
+        la vista no existe
+        """
+        response = self.client.get(reverse_lazy('metricas'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse_lazy('metricas'), HTTP_AUTHORIZATION='Bearer otro')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICAS_TOKEN=None):
+            response = self.leer_metricas()
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,107 @@
+"""
+Script que contiene las pruebas del
+perfilado de las peticiones
+"""
+from django.test import override_settings
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.models import Producto, Categoria
+from crucita_fashion.perfilado import ESTADISTICAS
+
+@override_settings(PERFILADO=True, RESPUESTAS_CACHE_ACTIVO=False)
+class PerfiladoTest(APITestCase):
+    """
+    Clase que contiene las pruebas
+    del perfilado
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        """
+        Reinicia las estadisticas, crea un producto
+        e inicia sesion con un usuario del staff
+        """
+        ESTADISTICAS.reiniciar()
+        categoria = Categoria.objects.create(nombre="Accesorio")
+        Producto.objects.create(codigo="1", cantidad=1, costo=1, categoria=categoria)
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def test_server_timing(self):
+        """
+        Prueba que la respuesta indica las
+        consultas y los tiempos
+        """
+        response = self.client.get(reverse_lazy('inventario:buscar'))
+        encabezado = response['Server-Timing']
+        self.assertRegex(encabezado, r'^sql;dur=[\d.]+;desc="\d+ consultas", '
+                                     r'python;dur=[\d.]+, total;dur=[\d.]+$')
+
+    def test_estadisticas_por_vista(self):
+        """
+        Prueba que se acumulan las
+        peticiones de cada vista
+        """
+        for _ in range(2):
+            self.client.get(reverse_lazy('inventario:buscar'))
+        response = self.client.get(reverse_lazy('perfilado'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        buscar = response.data['GET inventario:buscar']
+        self.assertEqual(buscar['peticiones'], 2)
+        self.assertGreater(buscar['consultas'], 0)
+        self.assertEqual(buscar['consultas_promedio'], buscar['consultas'] / 2)
+
+    def test_metodos_desconocidos(self):
+        """
+        Prueba que los metodos que no son de HTTP
+        se agrupan en otro
+        """
+        for metodo in ('BREW', 'XYZ'):
+            self.client.generic(metodo, reverse_lazy('inventario:buscar'))
+        vistas = self.client.get(reverse_lazy('perfilado')).data
+        self.assertEqual(vistas['otro inventario:buscar']['peticiones'], 2)
+        self.assertFalse(any(vista.startswith(('BREW', 'XYZ')) for vista in vistas))
+
+    def test_registra_peticiones_lentas(self):
+        """
+        Prueba que las peticiones con demasiadas
+        consultas se registran con sus consultas
+        """
+        with override_settings(PERFILADO_MAX_CONSULTAS=0), \
+                self.assertLogs('crucita_fashion.perfilado', 'WARNING') as registro:
+            self.client.get(reverse_lazy('inventario:buscar'))
+        self.assertIn("GET inventario:buscar", registro.output[0])
+        self.assertIn("inventario_producto", registro.output[0])
+
+    def test_reiniciar(self):
+        """
+        Prueba que DELETE reinicia
+        las estadisticas
+        """
+        self.client.get(reverse_lazy('inventario:buscar'))
+        response = self.client.delete(reverse_lazy('perfilado'))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertNotIn('GET inventario:buscar', ESTADISTICAS.valores())
+
+    def test_solo_staff(self):
+        """
+        Prueba que un cliente no puede
+        ver las estadisticas
+        """
+        self.client.logout()
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "rafaelrs", "password": "jaja123"})
+        response = self.client.get(reverse_lazy('perfilado'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(PERFILADO=False)
+    def test_desactivado(self):
+        """
+        Prueba que sin PERFILADO no se
+        agrega el encabezado
+        """
+        ESTADISTICAS.reiniciar()
+        response = self.client.get(reverse_lazy('inventario:buscar'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(ESTADISTICAS.valores(), {})
@@ -0,0 +1,188 @@
+"""
+Script que contiene las pruebas del router de replicas,
+con una segunda base de datos SQLite como replica
+"""
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from inventario.models import Producto, Categoria
+from usuarios.models import Usuario
+from crucita_fashion.replicas import COOKIE, ReplicaRouter, leer_de, llave_usuario
+
+ALIAS = 'replica_prueba'
+
+@override_settings(REPLICAS=[ALIAS], REPLICAS_RETRASO=10, RESPUESTAS_CACHE_ACTIVO=True)
+class ReplicaTest(APITestCase):
+    """
+    Clase que contiene las pruebas de las lecturas
+    en la replica. La replica tiene datos distintos a
+    default para saber de donde se leyo
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Crea la replica en una carpeta temporal y la
+        migra, el router solo permite migrar default
+        """
+        cls.carpeta = tempfile.mkdtemp()
+        connections.databases[ALIAS] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(cls.carpeta, 'replica.sqlite3'),
+        }
+        with mock.patch.object(ReplicaRouter, 'allow_migrate', return_value=True):
+            call_command('migrate', database=ALIAS, verbosity=0)
+        categoria = Categoria.objects.using(ALIAS).create(nombre="Replica")
+        Producto.objects.using(ALIAS).create(codigo="replica", cantidad=1, costo=1,
+                                             categoria=categoria)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Elimina la replica
+        """
+        super().tearDownClass()
+        connections[ALIAS].close()
+        del connections.databases[ALIAS]
+        shutil.rmtree(cls.carpeta)
+
+    def setUp(self):
+        """
+        Crea un producto en default e inicia
+        sesion con un usuario del staff
+        """
+        caches['respuestas'].clear()
+        self.categoria = Categoria.objects.create(nombre="Accesorio")
+        Producto.objects.create(codigo="primaria", cantidad=1, costo=1, categoria=self.categoria)
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+        # El inicio de sesion es una escritura
+        self.client.cookies.pop(COOKIE, None)
+        caches['respuestas'].delete(llave_usuario(Usuario.objects.get(username="crucita")))
+
+    def codigos(self):
+        """
+        Devuelve los codigos de la
+        busqueda de productos
+        """
+        response = self.client.get(reverse_lazy('inventario:buscar'))
+        return [producto['codigo'] for producto in response.data['results']]
+
+    def test_lista_se_lee_de_la_replica(self):
+        """
+        Prueba que la busqueda lee
+        de la replica
+        """
+        self.assertEqual(self.codigos(), ["replica"])
+
+    def test_lee_su_escritura(self):
+        """
+        Prueba que despues de modificar algo el
+        cliente lee de default
+        """
+        data = {'codigo': "nuevo", 'cantidad': 1, 'costo': 1, 'categoria': self.categoria.pk}
+        response = self.client.post(reverse_lazy('inventario:crear'), data)
+        self.assertIn(COOKIE, response.cookies)
+        self.assertEqual(self.codigos(), ["primaria", "nuevo"])
+
+    def test_usuario_jwt_lee_su_escritura(self):
+        """
+        Prueba que un cliente con JWT sin cookies lee de
+        default despues de modificar algo, y que los
+        otros usuarios siguen leyendo de la replica
+        """
+        def cliente_jwt(username, password):
+            """
+            Devuelve un cliente nuevo
+            autenticado con JWT
+            """
+            cliente = APIClient()
+            tokens = cliente.post(reverse_lazy('usuarios:token'),
+                                  {'username': username, 'password': password}).data
+            cliente.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+            # Pedir el token es una escritura, sin cookies como un cliente movil
+            cliente.cookies.clear()
+            return cliente
+
+        data = {'codigo': "nuevo", 'cantidad': 1, 'costo': 1, 'categoria': self.categoria.pk}
+        response = cliente_jwt("crucita", "crucita64").post(reverse_lazy('inventario:crear'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        url = reverse_lazy('inventario:buscar')
+        response = cliente_jwt("crucita", "crucita64").get(url)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']],
+                         ["primaria", "nuevo"])
+        response = cliente_jwt("danielrs", "danielrs19972705").get(url)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']],
+                         ["replica"])
+
+    def test_escritura_fallida(self):
+        """
+        Prueba que una peticion que no modifica
+        nada no marca al cliente
+        """
+        response = self.client.post(reverse_lazy('inventario:crear'), {})
+        self.assertNotIn(COOKIE, response.cookies)
+        self.assertEqual(self.codigos(), ["replica"])
+
+    def test_ventas_y_usuarios(self):
+        """
+        Prueba que las otras listas tambien
+        leen de la replica
+        """
+        self.assertEqual(self.client.get(reverse_lazy('ventas:buscar')).data, [])
+        usuarios = self.client.get(reverse_lazy('usuarios:buscar')).data
+        self.assertEqual(usuarios, [])
+
+    def test_escrituras_van_a_default(self):
+        """
+        Prueba que dentro de leer_de solo las lecturas
+        cambian de base de datos, y que los objetos de
+        la replica se guardan en default
+        """
+        router = ReplicaRouter()
+        with leer_de(ALIAS):
+            self.assertEqual(router.db_for_read(Producto), ALIAS)
+            producto = Producto.objects.get()
+            self.assertIsNone(router.db_for_write(Producto))
+        self.assertIsNone(router.db_for_read(Producto))
+        self.assertEqual(router.db_for_write(Producto, instance=producto), 'default')
+
+    def test_solo_se_migra_default(self):
+        """
+        Prueba que el router no permite
+        migrar las replicas
+        """
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'inventario'))
+        self.assertFalse(router.allow_migrate(ALIAS, 'inventario', model_name='producto'))
+
+    def test_cache_de_respuestas(self):
+        """
+        Prueba que no se guardan las respuestas leidas de
+        la replica justo despues de un cambio, la replica
+        podria no tenerlo todavia
+        """
+        url = reverse_lazy('inventario:buscar')
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with override_settings(REPLICAS_RETRASO=0):
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    @override_settings(REPLICAS=[])
+    def test_sin_replicas(self):
+        """
+        Prueba que sin replicas se
+        lee de default
+        """
+        self.assertEqual(self.codigos(), ["primaria"])
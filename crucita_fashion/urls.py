@@ -17,12 +17,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.static import static
 from django.conf import settings
+from crucita_fashion import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('inventario/', include('inventario.urls', namespace='inventario')),
     path('', include('usuarios.urls', namespace='usuarios')),
     path('ventas/', include('ventas.urls', namespace='ventas')),
+    path('perfilado/', views.PerfiladoView.as_view(), name='perfilado'),
+    path('metricas/', views.metricas, name='metricas'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,52 @@
+"""
+Modulo que contiene las vistas generales
+de la api
+"""
+import hmac
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from rest_framework import permissions, status, views
+from rest_framework.response import Response
+from crucita_fashion.permissions import IsStaff
+from crucita_fashion.perfilado import ESTADISTICAS
+from crucita_fashion.metricas import exposicion
+
+# Tipo de contenido del formato de texto de Prometheus
+TIPO_METRICAS = 'text/plain; version=0.0.4; charset=utf-8'
+
+class PerfiladoView(views.APIView):
+    """
+    Vista que devuelve las estadisticas del perfilado
+    de cada vista en el proceso que atiende la peticion,
+    y permite reiniciarlas
+    """
+    permission_classes = (permissions.IsAuthenticated, IsStaff)
+
+    def get(self, request): # pylint: disable=unused-argument,no-self-use
+        """
+        Devuelve las estadisticas
+        de cada vista
+        """
+        return Response(ESTADISTICAS.valores())
+
+    def delete(self, request): # pylint: disable=unused-argument,no-self-use
+        """
+        Reinicia las estadisticas
+        """
+        ESTADISTICAS.reiniciar()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+def metricas(request):
+    """
+    Vista que devuelve las metricas de todos los procesos
+    en el formato de texto de Prometheus. Requiere el
+    encabezado Authorization: Bearer <METRICAS_TOKEN>, sin
+    METRICAS_TOKEN la vista no existe
+    """
+    if not settings.METRICAS_TOKEN:
+        raise Http404
+    esperado = 'Bearer {}'.format(settings.METRICAS_TOKEN)
+    recibido = request.META.get('HTTP_AUTHORIZATION', '')
+    if not hmac.compare_digest(recibido.encode('utf-8'), esperado.encode('utf-8')):
+        return HttpResponseForbidden()
+    return HttpResponse(exposicion(), content_type=TIPO_METRICAS)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 
 class InventarioConfig(AppConfig):
     name = 'inventario'
+
+    def ready(self):
+        from inventario import cache  # noqa: F401
@@ -0,0 +1,116 @@
+'''
+Script que contiene el cache en memoria de los productos
+serializados, usado por la busqueda por codigo. Las
+entradas se invalidan al guardar o eliminar productos y
+con la senal productos_actualizados, que tambien invalidan
+las respuestas guardadas de las listas de productos y
+categorias (crucita_fashion.respuestas)
+'''
+from collections import OrderedDict
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from crucita_fashion.cache import CacheLRU
+from crucita_fashion.respuestas import invalidar_grupo
+from crucita_fashion.metricas import registrar_colector
+from inventario.models import Producto, Categoria
+from inventario.serializers import ProductoSerializer
+from inventario.signals import productos_actualizados
+
+# Cada entrada es codigo: (pk, producto serializado)
+CACHE_CODIGOS = CacheLRU(settings.PRODUCTOS_CACHE_MAXIMO, settings.PRODUCTOS_CACHE_TTL)
+
+@registrar_colector
+def metricas_codigos():
+    '''
+    Devuelve las lecturas del cache de
+    codigos para las metricas
+    '''
+    return [
+        ('cache_requests_total', {'cache': 'codigos', 'resultado': 'acierto'},
+         CACHE_CODIGOS.aciertos),
+        ('cache_requests_total', {'cache': 'codigos', 'resultado': 'fallo'},
+         CACHE_CODIGOS.fallos),
+    ]
+
+# Grupos de las respuestas guardadas de las listas
+GRUPO_PRODUCTOS = 'productos'
+GRUPO_CATEGORIAS = 'categorias'
+
+def producto_por_codigo(codigo):
+    '''
+    Devuelve el producto serializado con las urls relativas,
+    o None si no existe. Los productos que no existen no se
+    guardan en el cache
+    '''
+    entrada = CACHE_CODIGOS.obtener(codigo)
+    if entrada is not None:
+        return entrada[1]
+
+    producto = Producto.objects.filter(codigo=codigo).first()
+    if producto is None:
+        return None
+    datos = dict(ProductoSerializer(producto).data)
+    CACHE_CODIGOS.guardar(codigo, (producto.pk, datos))
+    return datos
+
+def invalidar_productos(pks):
+    '''
+    Elimina del cache los productos indicados, se buscan
+    por pk porque el codigo pudo cambiar
+    '''
+    CACHE_CODIGOS.eliminar_si(lambda entrada: entrada[0] in pks)
+
+def invalidar(pks):
+    '''
+    Elimina los productos del cache ahora y de nuevo al
+    confirmar la transaccion, por si otra peticion guardo
+    la version anterior mientras la transaccion seguia abierta
+    '''
+    pks = frozenset(pks)
+    invalidar_productos(pks)
+    transaction.on_commit(lambda: invalidar_productos(pks))
+
+@receiver(post_save, sender=Producto)
+@receiver(post_delete, sender=Producto)
+def producto_modificado(sender, instance, **kwargs): # pylint: disable=unused-argument
+    '''
+    Invalida el producto guardado
+    o eliminado
+    '''
+    invalidar([instance.pk])
+    invalidar_grupo(GRUPO_PRODUCTOS)
+
+@receiver(productos_actualizados)
+def productos_modificados(sender, pks, **kwargs): # pylint: disable=unused-argument
+    '''
+    Invalida los productos actualizados
+    en lote
+    '''
+    invalidar(pks)
+    invalidar_grupo(GRUPO_PRODUCTOS)
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def categoria_modificada(sender, instance, **kwargs): # pylint: disable=unused-argument
+    '''
+    Invalida las respuestas de
+    las categorias
+    '''
+    invalidar_grupo(GRUPO_CATEGORIAS)
+
+def con_urls_absolutas(datos, request):
+    '''
+    Devuelve una copia del producto serializado con la
+    foto y las variantes como urls absolutas del request
+    '''
+    datos = dict(datos)
+    if datos.get('foto'):
+        datos['foto'] = request.build_absolute_uri(datos['foto'])
+    if datos.get('variantes'):
+        datos['variantes'] = OrderedDict(
+            (variante, request.build_absolute_uri(url))
+            for variante, url in datos['variantes'].items()
+        )
+    return datos
@@ -0,0 +1,52 @@
+'''
+Script que contiene los filtros usados por
+las vistas de este modulo
+'''
+from django_filters import rest_framework as filters
+from rest_framework.filters import OrderingFilter
+from inventario.models import Producto
+
+class ProductoFilter(filters.FilterSet):
+    '''
+    Filtros de la busqueda de productos. Todos los filtros
+    son sobre columnas indexadas: rangos de cantidad y costo
+    (ej: cantidad__lte=20, costo__gte=10&costo__lte=50) y
+    prefijo del codigo (codigo__startswith=CAM)
+    '''
+
+    class Meta:
+        model = Producto
+        fields = {
+            'codigo': ['exact', 'startswith'],
+            'cantidad': ['exact', 'gte', 'lte'],
+            'costo': ['exact', 'gte', 'lte'],
+            'categoria': ['exact'],
+            'talla': ['exact'],
+        }
+
+class ProductoOrderingFilter(OrderingFilter):
+    '''
+    Ordenamiento de la busqueda de productos
+    (ej: ordering=-costo). Siempre agrega la llave
+    primaria al final para que los productos con el
+    mismo valor salgan siempre en el mismo orden.
+
+    CursorPagination solo guarda en el cursor el valor
+    del primer campo y cuantos productos con ese valor
+    ya se devolvieron (un OFFSET), no la llave primaria.
+    Ordenando por pk (el orden por defecto) el cursor es
+    exacto, pero con otro campo un producto que se crea,
+    modifica o borra con el valor del cursor desplaza la
+    pagina siguiente, y muchos valores repetidos hacen
+    el OFFSET mas costoso
+    '''
+
+    def get_ordering(self, request, queryset, view):
+        '''
+        Devuelve el orden pedido seguido
+        de la llave primaria
+        '''
+        ordering = list(super().get_ordering(request, queryset, view))
+        if not any(campo.lstrip('-') in ('pk', 'id') for campo in ordering):
+            ordering.append('pk')
+        return tuple(ordering)
@@ -0,0 +1,126 @@
+'''
+Script que genera las variantes de la foto de un
+producto (miniatura, tarjeta y completa) en WebP. Las
+variantes se generan fuera de la peticion en un grupo de
+hilos, Pillow libera el GIL mientras redimensiona y
+codifica, por lo que los hilos trabajan en paralelo
+'''
+import io
+import logging
+import posixpath
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+LOGGER = logging.getLogger(__name__)
+
+# Lado mayor en pixeles de cada variante
+VARIANTES = OrderedDict((
+    ('miniatura', 160),
+    ('tarjeta', 480),
+    ('completa', 1200),
+))
+
+FORMATO = 'WEBP'
+EXTENSION = 'webp'
+CALIDAD = 80
+
+_EJECUTOR = {'instancia': None, 'candado': Lock()}
+
+def ruta_variante(nombre_foto, variante):
+    '''
+    Devuelve la ruta dentro del storage de una variante de
+    la foto, ej: coleccion/variantes/camisa.jpg.miniatura.webp.
+    Se mantiene la extension original para que camisa.jpg y
+    camisa.png no compartan variantes
+    '''
+    carpeta, archivo = posixpath.split(nombre_foto)
+    return posixpath.join(carpeta, 'variantes', '{}.{}.{}'.format(archivo, variante, EXTENSION))
+
+def urls_variantes(nombre_foto, request=None):
+    '''
+    Devuelve un diccionario con la url de cada variante
+    de la foto, o None si el producto no tiene foto. Las
+    variantes que todavia no existen (se generan en otro
+    hilo) usan la url de la foto original
+    '''
+    if not nombre_foto:
+        return None
+    urls = OrderedDict()
+    for variante in VARIANTES:
+        ruta = ruta_variante(nombre_foto, variante)
+        if not default_storage.exists(ruta):
+            ruta = nombre_foto
+        url = default_storage.url(ruta)
+        urls[variante] = request.build_absolute_uri(url) if request is not None else url
+    return urls
+
+def generar_variantes(nombre_foto, reemplazar=True):
+    '''
+    Genera y guarda las variantes de la foto. Con
+    reemplazar=False solo genera las que falten.
+    Devuelve los nombres de las variantes generadas
+    '''
+    faltantes = [
+        variante for variante in VARIANTES
+        if reemplazar or not default_storage.exists(ruta_variante(nombre_foto, variante))
+    ]
+    if not faltantes:
+        return []
+
+    with default_storage.open(nombre_foto, 'rb') as archivo:
+        imagen = Image.open(archivo)
+        imagen.load()
+
+    if imagen.mode not in ('RGB', 'RGBA'):
+        transparente = imagen.mode in ('LA', 'P') or 'transparency' in imagen.info
+        imagen = imagen.convert('RGBA' if transparente else 'RGB')
+
+    for variante in faltantes:
+        lado = VARIANTES[variante]
+        copia = imagen.copy()
+        copia.thumbnail((lado, lado), Image.LANCZOS)
+        salida = io.BytesIO()
+        copia.save(salida, FORMATO, quality=CALIDAD)
+        ruta = ruta_variante(nombre_foto, variante)
+        if default_storage.exists(ruta):
+            default_storage.delete(ruta)
+        default_storage.save(ruta, ContentFile(salida.getvalue()))
+    return faltantes
+
+def _generar_variantes_registrando_errores(nombre_foto):
+    '''
+    Genera las variantes dentro de un hilo del grupo,
+    los errores se registran porque nadie espera el resultado
+    '''
+    try:
+        generar_variantes(nombre_foto)
+    except Exception: # pylint: disable=broad-except
+        LOGGER.exception("No se pudieron generar las variantes de %s", nombre_foto)
+
+def _ejecutor():
+    '''
+    Devuelve el grupo de hilos, se crea la primera vez
+    que se usa para que cada proceso de gunicorn tenga
+    el suyo despues del fork
+    '''
+    with _EJECUTOR['candado']:
+        if _EJECUTOR['instancia'] is None:
+            _EJECUTOR['instancia'] = ThreadPoolExecutor(
+                max_workers=settings.IMAGENES_WORKERS
+            )
+        return _EJECUTOR['instancia']
+
+def programar_variantes(nombre_foto):
+    '''
+    Genera las variantes de la foto en el grupo de hilos,
+    o en el mismo hilo si IMAGENES_SINCRONO esta activo
+    '''
+    if settings.IMAGENES_SINCRONO:
+        generar_variantes(nombre_foto)
+    else:
+        _ejecutor().submit(_generar_variantes_registrando_errores, nombre_foto)
@@ -0,0 +1,216 @@
+'''
+Script que contiene la importacion de productos desde
+archivos CSV o JSONL. Los archivos se leen fila por fila
+y los productos se guardan por lotes de tamano fijo, por
+lo que la memoria usada no depende del tamano del archivo
+'''
+import csv
+import json
+import re
+from django.db import transaction
+from rest_framework import serializers
+from .models import Producto, Categoria
+from .serializers import validar_talla, validar_costo
+
+FORMATOS = ('csv', 'jsonl')
+
+TAMANO_LOTE = 500
+
+# Maximo de errores que se guardan en el reporte, el resto solo se cuentan
+MAX_ERRORES = 1000
+
+# Mayor valor que acepta un PositiveIntegerField en todas las bases de datos
+MAX_CANTIDAD = 2147483647
+
+# Parte decimal nula que IntegerField de DRF acepta, ej: "3.0"
+DECIMAL_NULO = re.compile(r'\.0*\s*$')
+
+def validar_cantidad(valor):
+    '''
+    Convierte la cantidad de una fila en un entero con
+    las reglas de IntegerField de DRF: se rechazan los
+    booleanos y los numeros con parte decimal
+    '''
+    if isinstance(valor, bool) or valor is None:
+        raise serializers.ValidationError("La cantidad debe ser un entero")
+    try:
+        cantidad = int(DECIMAL_NULO.sub('', str(valor)))
+    except ValueError:
+        raise serializers.ValidationError("La cantidad debe ser un entero")
+    if cantidad < 0:
+        raise serializers.ValidationError("La cantidad no puede ser negativa")
+    if cantidad > MAX_CANTIDAD:
+        raise serializers.ValidationError(
+            "La cantidad no puede ser mayor a {}".format(MAX_CANTIDAD)
+        )
+    return cantidad
+
+def leer_csv(lineas):
+    '''
+    Recorre un archivo CSV con encabezado y devuelve
+    cada fila como (numero de fila, diccionario)
+    '''
+    for numero, fila in enumerate(csv.DictReader(lineas), start=2):
+        yield numero, fila
+
+def leer_jsonl(lineas):
+    '''
+    Recorre un archivo con un objeto JSON por linea y
+    devuelve cada fila como (numero de linea, diccionario).
+    Si la linea no es un objeto JSON valido la fila es None
+    '''
+    for numero, linea in enumerate(lineas, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            fila = json.loads(linea)
+        except ValueError:
+            fila = None
+        yield numero, fila if isinstance(fila, dict) else None
+
+LECTORES = {
+    'csv': leer_csv,
+    'jsonl': leer_jsonl,
+}
+
+class ImportadorProductos:
+    '''
+    Clase que importa productos creando los que no
+    existen y actualizando los que ya existen segun
+    su codigo. Cada lote se guarda en su propia transaccion
+    con un bulk_create y un UPDATE en lote
+    '''
+    campos = ('cantidad', 'costo', 'categoria', 'talla')
+
+    def __init__(self, tamano_lote=TAMANO_LOTE, progreso=None):
+        '''
+        Carga las categorias, que se pueden indicar por
+        su pk o por su nombre. progreso es una funcion que
+        se llama con el reporte despues de guardar cada lote
+        '''
+        self.tamano_lote = tamano_lote
+        self.progreso = progreso
+        self.categorias = {}
+        for categoria in Categoria.objects.all():
+            self.categorias[str(categoria.pk)] = categoria
+            self.categorias[categoria.nombre] = categoria
+        self.reporte = {
+            'procesadas': 0,
+            'creados': 0,
+            'actualizados': 0,
+            'errores': [],
+            'errores_omitidos': 0,
+        }
+
+    def importar(self, lineas, formato):
+        '''
+        Importa los productos de las lineas de un archivo
+        en el formato indicado y devuelve el reporte. Si el
+        archivo no se puede leer lanza un ValidationError, los
+        lotes guardados hasta ese momento se mantienen
+        '''
+        lote = {}
+        try:
+            for numero, fila in LECTORES[formato](lineas):
+                self.reporte['procesadas'] += 1
+                try:
+                    producto = self.validar_fila(fila)
+                except serializers.ValidationError as error:
+                    self.registrar_error(numero, error.detail)
+                    continue
+                # Si un codigo se repite en el mismo lote gana la ultima fila
+                lote[producto['codigo']] = producto
+                if len(lote) >= self.tamano_lote:
+                    self.guardar_lote(lote)
+                    lote = {}
+        except (UnicodeDecodeError, csv.Error) as error:
+            raise serializers.ValidationError({
+                'archivo': "No se pudo leer el archivo despues de la fila {}: {}".format(
+                    self.reporte['procesadas'], error
+                )
+            })
+        if lote:
+            self.guardar_lote(lote)
+        return self.reporte
+
+    def validar_fila(self, fila):
+        '''
+        Convierte una fila del archivo en los datos de un
+        producto aplicando las mismas reglas que ProductoSerializer
+        '''
+        if fila is None:
+            raise serializers.ValidationError("La fila no es un objeto JSON valido")
+
+        errores = {}
+        producto = {}
+
+        codigo = str(fila.get('codigo') or '').strip()
+        if not codigo:
+            errores['codigo'] = "Este campo es requerido"
+        elif len(codigo) > 500:
+            errores['codigo'] = "El codigo no puede tener mas de 500 caracteres"
+        producto['codigo'] = codigo
+
+        try:
+            producto['cantidad'] = validar_cantidad(fila.get('cantidad'))
+        except serializers.ValidationError as error:
+            errores['cantidad'] = error.detail[0]
+
+        try:
+            producto['costo'] = validar_costo(float(fila.get('costo')))
+        except (TypeError, ValueError):
+            errores['costo'] = "El costo debe ser un numero"
+        except serializers.ValidationError as error:
+            errores['costo'] = error.detail[0]
+
+        talla = fila.get('talla')
+        producto['talla'] = str(talla).strip() if talla not in (None, '') else None
+
+        categoria = self.categorias.get(str(fila.get('categoria') or '').strip())
+        if categoria is None:
+            errores['categoria'] = "La categoria no existe"
+        else:
+            producto['categoria'] = categoria
+            try:
+                validar_talla(categoria, producto['talla'])
+            except serializers.ValidationError as error:
+                errores['talla'] = error.detail[0]
+
+        if errores:
+            raise serializers.ValidationError(errores)
+        return producto
+
+    def registrar_error(self, numero, detalle):
+        '''
+        Guarda el error de una fila en el reporte
+        mientras no se pase del maximo de errores
+        '''
+        if len(self.reporte['errores']) < MAX_ERRORES:
+            self.reporte['errores'].append({'fila': numero, 'errores': detalle})
+        else:
+            self.reporte['errores_omitidos'] += 1
+
+    def guardar_lote(self, lote):
+        '''
+        Crea los productos nuevos del lote y actualiza
+        los existentes en una sola transaccion
+        '''
+        with transaction.atomic():
+            existentes = dict(
+                Producto.objects.filter(codigo__in=list(lote)).values_list('codigo', 'pk')
+            )
+            nuevos = []
+            actualizar = []
+            for codigo, datos in lote.items():
+                if codigo in existentes:
+                    actualizar.append(Producto(pk=existentes[codigo], **datos))
+                else:
+                    nuevos.append(Producto(**datos))
+            Producto.objects.crear_en_lote(nuevos)
+            Producto.objects.actualizar_en_lote(actualizar, self.campos)
+
+        self.reporte['creados'] += len(nuevos)
+        self.reporte['actualizados'] += len(actualizar)
+        if self.progreso is not None:
+            self.progreso(self.reporte)
@@ -0,0 +1,44 @@
+'''
+Comando que genera las variantes de las fotos
+de los productos que ya estaban en el inventario
+'''
+from django.core.management.base import BaseCommand
+from inventario.imagenes import generar_variantes
+from inventario.models import Producto
+
+class Command(BaseCommand):
+    '''
+    Genera las variantes que faltan de las fotos
+    subidas antes de que existieran las variantes
+    '''
+    help = "Genera las variantes WebP que faltan de las fotos de los productos"
+
+    def add_arguments(self, parser):
+        '''
+        Argumentos del comando
+        '''
+        parser.add_argument('--reemplazar', action='store_true',
+                            help="Vuelve a generar tambien las variantes que ya existen")
+
+    def handle(self, *args, **options):
+        '''
+        Recorre las fotos de los productos generando
+        sus variantes, una foto que no se pueda leer
+        se reporta y no detiene el comando
+        '''
+        fotos = (
+            Producto.objects.exclude(foto='').exclude(foto__isnull=True)
+            .order_by('foto').values_list('foto', flat=True).distinct()
+        )
+        generadas = 0
+        errores = 0
+        for nombre in fotos.iterator():
+            try:
+                if generar_variantes(nombre, reemplazar=options['reemplazar']):
+                    generadas += 1
+            except Exception as error: # pylint: disable=broad-except
+                errores += 1
+                self.stderr.write("{}: {}".format(nombre, error))
+        self.stdout.write(self.style.SUCCESS(
+            "Variantes generadas para {} fotos, {} con errores".format(generadas, errores)
+        ))
@@ -0,0 +1,59 @@
+'''
+Comando que importa productos al inventario
+desde un archivo CSV o JSONL
+'''
+import os
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from inventario.importacion import ImportadorProductos, FORMATOS, TAMANO_LOTE
+
+class Command(BaseCommand):
+    '''
+    Importa productos creando los que no existen y
+    actualizando los existentes segun su codigo
+    '''
+    help = "Importa productos desde un archivo CSV o JSONL (upsert por codigo)"
+
+    def add_arguments(self, parser):
+        '''
+        Argumentos del comando
+        '''
+        parser.add_argument('archivo', help="Ruta del archivo a importar")
+        parser.add_argument('--formato', choices=FORMATOS,
+                            help="Formato del archivo, por defecto se toma de la extension")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                            help="Numero de productos que se guardan por transaccion")
+
+    def handle(self, *args, **options):
+        '''
+        Importa el archivo mostrando el progreso
+        despues de cada lote
+        '''
+        formato = options['formato'] or os.path.splitext(options['archivo'])[1][1:].lower()
+        if formato not in FORMATOS:
+            raise CommandError("No se reconoce el formato del archivo, use --formato")
+
+        def progreso(reporte):
+            '''
+            Muestra el progreso de la importacion
+            '''
+            self.stdout.write(
+                "Procesadas {procesadas} filas: {creados} creados, "
+                "{actualizados} actualizados".format(**reporte)
+            )
+
+        importador = ImportadorProductos(tamano_lote=options['lote'], progreso=progreso)
+        with open(options['archivo'], encoding='utf-8-sig', newline='') as lineas:
+            try:
+                reporte = importador.importar(lineas, formato)
+            except serializers.ValidationError as error:
+                raise CommandError(error.detail['archivo'])
+
+        for error in reporte['errores']:
+            self.stderr.write("Fila {fila}: {errores}".format(**error))
+        errores = len(reporte['errores']) + reporte['errores_omitidos']
+        self.stdout.write(self.style.SUCCESS(
+            "Importacion terminada: {} filas, {} creados, {} actualizados, {} con errores".format(
+                reporte['procesadas'], reporte['creados'], reporte['actualizados'], errores
+            )
+        ))
@@ -0,0 +1,38 @@
+# Generated by Django 2.1.5 on 2026-10-18 13:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0002_producto_modificado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['categoria', 'talla'], name='producto_categoria_talla'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['cantidad'], name='producto_cantidad'),
+        ),
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['costo'], name='producto_costo'),
+        ),
+        # El indice (categoria, talla) reemplaza al indice de la llave foranea
+        migrations.AlterField(
+            model_name='producto',
+            name='categoria',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='inventario.Categoria'),
+        ),
+        # Indice parcial de los productos agotados, Django 2.1 no
+        # soporta Index(condition=...)
+        migrations.RunSQL(
+            ['CREATE INDEX producto_agotados ON inventario_producto (id) WHERE cantidad = 0'],
+            ['DROP INDEX producto_agotados'],
+        ),
+    ]
@@ -2,7 +2,10 @@
 Script que contendra los modelos para esta
 aplicacion
 '''
-from django.db import models # pylint: disable=unused-import
+from django.db import connections, models # pylint: disable=unused-import
+from django.db.models import Case, F, When, Value
+from django.utils import timezone
+from inventario.signals import productos_actualizados
 
 TALLA_ROPA = [
     "XXS",
@@ -43,6 +46,83 @@ class Categoria(models.Model):
     '''
     nombre = models.CharField(unique=True, max_length=100)
 
+class ProductoQuerySet(models.QuerySet):
+    '''
+    QuerySet de los productos con las operaciones
+    que se hacen sobre varios productos a la vez
+    '''
+
+    def descontar_existencias(self, cantidades):
+        '''
+        Descuenta de la cantidad de cada producto lo indicado
+        en el diccionario cantidades ({pk: unidades}) con un
+        solo UPDATE condicional. Solo se actualizan los productos
+        que tienen suficientes unidades, y se devuelve cuantos
+        fueron actualizados, si es menor que len(cantidades)
+        hay productos sin existencias suficientes o inexistentes.
+        Debe llamarse dentro de una transaccion para poder
+        deshacer el descuento en ese caso
+        '''
+        if not cantidades:
+            return 0
+        unidades = Case(
+            *[When(pk=pk, then=Value(cantidad)) for pk, cantidad in cantidades.items()],
+            output_field=models.PositiveIntegerField()
+        )
+        actualizados = self.filter(
+            pk__in=list(cantidades),
+            cantidad__gte=unidades
+        ).update(cantidad=F('cantidad') - unidades, modificado=timezone.now())
+        productos_actualizados.send(sender=self.model, pks=list(cantidades))
+        return actualizados
+
+    def crear_en_lote(self, productos):
+        '''
+        Inserta los productos con un solo bulk_create y avisa
+        con productos_actualizados, ya que bulk_create no envia
+        post_save. Devuelve los productos creados
+        '''
+        creados = self.bulk_create(productos)
+        productos_actualizados.send(
+            sender=self.model,
+            pks=[producto.pk for producto in creados if producto.pk is not None]
+        )
+        return creados
+
+    def actualizar_en_lote(self, productos, campos):
+        '''
+        Guarda los campos indicados de los productos recibidos
+        con un UPDATE ... CASE por grupo de productos, en lugar
+        de un UPDATE por producto. Los productos tienen que tener
+        pk. Devuelve el numero de filas actualizadas
+        '''
+        campos = [self.model._meta.get_field(campo) for campo in campos]
+        conexion = connections[self.db]
+        # Cada producto usa dos parametros por campo (WHEN pk THEN valor) y uno
+        # en pk__in, se cuenta uno mas por el parametro de modificado
+        tamano = conexion.ops.bulk_batch_size(campos * 2 + ['pk', 'modificado'],
+                                              productos) or len(productos)
+        ahora = timezone.now()
+        actualizados = 0
+        for inicio in range(0, len(productos), tamano):
+            grupo = productos[inicio:inicio + tamano]
+            valores = {
+                campo.attname: Case(
+                    *[
+                        When(pk=producto.pk, then=Value(getattr(producto, campo.attname),
+                                                        output_field=campo))
+                        for producto in grupo
+                    ],
+                    output_field=campo
+                )
+                for campo in campos
+            }
+            actualizados += self.filter(pk__in=[producto.pk for producto in grupo]).update(
+                modificado=ahora, **valores
+            )
+        productos_actualizados.send(sender=self.model, pks=[producto.pk for producto in productos])
+        return actualizados
+
 class Producto(models.Model):
     '''
     Creacion de la tabla Producto, esta contendra
@@ -51,6 +131,17 @@ class Producto(models.Model):
     codigo = models.CharField(unique=True, max_length=500)
     cantidad = models.PositiveIntegerField()
     costo = models.FloatField()
-    categoria = models.ForeignKey(Categoria, on_delete=models.CASCADE)
+    # El indice (categoria, talla) tambien sirve para filtrar solo por categoria
+    categoria = models.ForeignKey(Categoria, on_delete=models.CASCADE, db_index=False)
     talla = models.CharField(null=True, max_length=100)
     foto = models.ImageField(null=True, upload_to='coleccion/')
+    modificado = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProductoQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['categoria', 'talla'], name='producto_categoria_talla'),
+            models.Index(fields=['cantidad'], name='producto_cantidad'),
+            models.Index(fields=['costo'], name='producto_costo'),
+        ]
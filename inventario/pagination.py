@@ -0,0 +1,25 @@
+'''
+Script que contiene las clases de paginacion
+usadas por las vistas de este modulo
+'''
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+class ProductoCursorPagination(CursorPagination):
+    '''
+    Paginacion por cursor para la busqueda de productos.
+    Ordena por la llave primaria, que esta indexada y solo
+    crece, por lo que las paginas no se desplazan cuando se
+    insertan productos nuevos y el costo de pedir una pagina
+    no depende del tamano del catalogo (no hay OFFSET)
+    '''
+    ordering = 'pk'
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        '''
+        Lee el tamano de pagina de la configuracion
+        del proyecto al momento de instanciarse
+        '''
+        self.page_size = settings.PRODUCTOS_PAGE_SIZE
+        self.max_page_size = settings.PRODUCTOS_MAX_PAGE_SIZE
@@ -2,8 +2,46 @@
 Script donde estan los serializers para este
 modulo
 '''
+import math
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
+from crucita_fashion.campos import CamposDinamicosMixin
+from crucita_fashion.lectura_rapida import CampoRapido
 from .models import Producto, Categoria, TALLA_ROPA, TALLA_ZAPATOS
+from .imagenes import programar_variantes, urls_variantes
+
+def validar_talla(categoria, talla):
+    '''
+    Valida la talla de un producto dependiendo si
+    su categoria es Ropa o Zapato. Los productos de
+    otras categorias no tienen talla
+    '''
+    if categoria.nombre == "Ropa":
+        if not talla in TALLA_ROPA:
+            raise serializers.ValidationError("La talla introducida no es valida para la ropa")
+    elif categoria.nombre == "Zapato":
+        if not talla in TALLA_ZAPATOS:
+            raise serializers.ValidationError("La talla introducida no es valida para zapatos")
+    else:
+        if talla is not None:
+            raise serializers.ValidationError("No aplica el campo talla para este producto")
+
+def validar_costo(costo):
+    '''
+    Valida que el costo de un producto sea
+    un numero positivo
+    '''
+    if isinstance(costo, str):
+        raise serializers.ValidationError("El costo introducido es un string")
+
+    if not math.isfinite(costo):
+        raise serializers.ValidationError("El costo debe ser un numero finito")
+
+    if costo <= 0:
+        raise serializers.ValidationError("El costo no puede ser negativo")
+
+    return costo
 
 class CategoriaSerializer(serializers.ModelSerializer):
     '''
@@ -14,50 +52,177 @@ class CategoriaSerializer(serializers.ModelSerializer):
         model = Categoria
         fields = "__all__"
 
-class ProductoSerializer(serializers.ModelSerializer):
+class CategoriaField(serializers.PrimaryKeyRelatedField):
+    '''
+    Campo para la categoria de un producto. Si en el contexto
+    del serializer ya estan las categorias ({pk: Categoria}) las
+    busca ahi en lugar de hacer una consulta por producto
+    '''
+
+    def to_internal_value(self, data):
+        '''
+        Devuelve la categoria con el pk recibido
+        '''
+        categorias = self.context.get('categorias')
+        if categorias is None:
+            return super().to_internal_value(data)
+        categoria = None
+        try:
+            categoria = categorias.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if categoria is None:
+            self.fail('does_not_exist', pk_value=data)
+        return categoria
+
+class ProductoListSerializer(serializers.ListSerializer): # pylint: disable=abstract-method
+    '''
+    Serializer usado cuando se crean varios productos a la
+    vez. Valida todos los productos en una pasada, trayendo
+    las categorias y los codigos ya usados en una consulta cada
+    uno, y los inserta con un solo bulk_create
+    '''
+
+    def to_internal_value(self, data):
+        '''
+        Carga en el contexto las categorias y los codigos
+        existentes que usan los productos recibidos antes de
+        validarlos, y verifica que no se repitan codigos
+        dentro de la lista
+        '''
+        if isinstance(data, list):
+            if len(data) > settings.PRODUCTOS_MAX_LOTE:
+                raise serializers.ValidationError(
+                    "No se pueden crear mas de {} productos a la vez".format(
+                        settings.PRODUCTOS_MAX_LOTE
+                    )
+                )
+            filas = [fila for fila in data if isinstance(fila, dict)]
+            categorias = set()
+            for fila in filas:
+                try:
+                    categorias.add(int(fila.get('categoria')))
+                except (TypeError, ValueError):
+                    pass
+            codigos = [str(fila['codigo']).strip() for fila in filas
+                       if fila.get('codigo') is not None]
+            self.context['categorias'] = Categoria.objects.in_bulk(list(categorias))
+            self.context['codigos_existentes'] = set(
+                Producto.objects.filter(codigo__in=codigos).values_list('codigo', flat=True)
+            )
+
+        validados = super().to_internal_value(data)
+
+        vistos = set()
+        errores = []
+        for producto in validados:
+            if producto['codigo'] in vistos:
+                errores.append({'codigo': ["El codigo esta repetido en la lista"]})
+            else:
+                errores.append({})
+            vistos.add(producto['codigo'])
+        if any(errores):
+            raise serializers.ValidationError(errores)
+
+        return validados
+
+    def create(self, validated_data):
+        '''
+        Inserta todos los productos en una sola
+        transaccion con un solo bulk_create
+        '''
+        with transaction.atomic():
+            return Producto.objects.crear_en_lote(
+                [Producto(**producto) for producto in validated_data]
+            )
+
+class ProductoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     '''
     Clase que representa el serializer de los productos
     dentro del inventario
     '''
+    codigo = serializers.CharField(max_length=500)
+    categoria = CategoriaField(queryset=Categoria.objects.all())
+    variantes = serializers.SerializerMethodField()
+    dependencias = {'variantes': ('foto',)}
+    campos_rapidos = {'variantes': CampoRapido('foto', urls_variantes)}
+
+    def get_variantes(self, producto):
+        '''
+        Devuelve las urls de las variantes
+        de la foto del producto
+        '''
+        return urls_variantes(producto.foto.name, self.context.get('request'))
+
+    def create(self, validated_data):
+        '''
+        Crea el producto y genera las variantes
+        de su foto si se subio una
+        '''
+        producto = super().create(validated_data)
+        self.programar_variantes(producto, validated_data)
+        return producto
+
+    def update(self, instance, validated_data):
+        '''
+        Actualiza el producto y genera las variantes
+        de su foto si se subio una nueva
+        '''
+        producto = super().update(instance, validated_data)
+        self.programar_variantes(producto, validated_data)
+        return producto
+
+    @staticmethod
+    def programar_variantes(producto, validated_data):
+        '''
+        Programa la generacion de las variantes de la
+        foto para despues de que se confirme la transaccion
+        '''
+        if validated_data.get('foto'):
+            nombre_foto = producto.foto.name
+            transaction.on_commit(lambda: programar_variantes(nombre_foto))
 
     def validate(self, data): #pylint: disable=arguments-differ
         '''
         Metodo que valida la talla de un Producto
         dependiendo si es una Ropa o un Zapato
         '''
-        categoria = data['categoria']
         talla = None
 
         if 'talla' in data.keys():
             talla = data['talla']
 
-        # Area de verificacion de la talla
-        if categoria.nombre == "Ropa":
-            if not talla in TALLA_ROPA:
-                raise serializers.ValidationError("La talla introducida no es valida para la ropa")
-        elif categoria.nombre == "Zapato":
-            if not talla in TALLA_ZAPATOS:
-                raise serializers.ValidationError("La talla introducida no es valida para zapatos")
-        else:
-            if talla is not None:
-                raise serializers.ValidationError("No aplica el campo talla para este producto")
+        validar_talla(data['categoria'], talla)
 
         return data
 
+    def validate_codigo(self, codigo):
+        '''
+        Metodo que valida que el codigo de un Producto
+        no este siendo usado por otro producto
+        '''
+        existentes = self.context.get('codigos_existentes')
+        if existentes is None:
+            productos = Producto.objects.filter(codigo=codigo)
+            if self.instance is not None:
+                productos = productos.exclude(pk=self.instance.pk)
+            repetido = productos.exists()
+        else:
+            repetido = codigo in existentes
+
+        if repetido:
+            raise serializers.ValidationError("Ya existe un producto con este codigo")
+
+        return codigo
+
     def validate_costo(self, costo): # pylint: disable=no-self-use
         '''
         Metodo que valida el costo de un
         Producto. Se ejecuta automaticamente con is_valid
         '''
-        # Area de verificacion del costo
-        if isinstance(costo, str):
-            raise serializers.ValidationError("El costo introducido es un string")
-
-        if costo <= 0:
-            raise serializers.ValidationError("El costo no puede ser negativo")
-
-        return costo
+        return validar_costo(costo)
 
     class Meta:
         model = Producto
-        fields = ('codigo', 'cantidad', 'costo', 'categoria', 'talla', 'foto')
+        fields = ('codigo', 'cantidad', 'costo', 'categoria', 'talla', 'foto', 'variantes')
+        list_serializer_class = ProductoListSerializer
@@ -0,0 +1,9 @@
+'''
+Script que contiene las senales
+de este modulo
+'''
+from django.dispatch import Signal
+
+# Se envia despues de actualizar productos con un UPDATE sobre
+# varias filas (no se envian post_save), pks son los productos
+productos_actualizados = Signal(providing_args=['pks']) # pylint: disable=invalid-name
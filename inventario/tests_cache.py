@@ -0,0 +1,102 @@
+'''
+Script que contiene las pruebas de la busqueda
+de productos por codigo y de su cache
+'''
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.cache import CACHE_CODIGOS
+from inventario.models import Producto, Categoria
+from inventario.serializers import ProductoSerializer
+
+class ProductoCodigoViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la
+    vista de busqueda por codigo
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Crea un producto, vacia el cache e inicia
+        sesion con un usuario del staff
+        '''
+        CACHE_CODIGOS.limpiar()
+        self.producto = Producto.objects.create(
+            codigo="7701234",
+            cantidad=4,
+            costo=10,
+            categoria=Categoria.objects.create(nombre="Ropa"),
+            talla="M"
+        )
+        self.url = reverse_lazy('inventario:codigo', args=(self.producto.codigo,))
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "dwest06", "password": "jaja123"})
+
+    def test_buscar_por_codigo(self):
+        '''
+        Prueba que devuelve el producto y que la
+        segunda vez no consulta los productos
+        '''
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(response.data, ProductoSerializer(self.producto).data)
+        self.assertEqual(len(CACHE_CODIGOS), 1)
+        aciertos = CACHE_CODIGOS.aciertos
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['cantidad'], 4)
+        self.assertEqual(CACHE_CODIGOS.aciertos, aciertos + 1)
+
+    def test_codigo_que_no_existe(self):
+        '''
+        Prueba que devuelve 404 si no
+        existe el codigo
+        '''
+        url = reverse_lazy('inventario:codigo', args=("no-existe",))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, msg=response.data)
+        self.assertEqual(len(CACHE_CODIGOS), 0)
+
+    def test_cliente_no_puede_buscar(self):
+        '''
+        Prueba que un cliente no puede
+        usar la vista
+        '''
+        self.client.logout()
+        self.client.post(reverse_lazy('usuarios:login'),
+                         data={"username": "rafaelrs", "password": "jaja123"})
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_guardar_invalida_el_cache(self):
+        '''
+        Prueba que al guardar el producto, incluso
+        cambiando su codigo, se invalida el cache
+        '''
+        self.client.get(self.url)
+        self.producto.codigo = "7709999"
+        self.producto.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, msg=response.data)
+
+    def test_eliminar_invalida_el_cache(self):
+        '''
+        Prueba que al eliminar el producto
+        se invalida el cache
+        '''
+        self.client.get(self.url)
+        self.producto.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, msg=response.data)
+
+    def test_descontar_existencias_invalida_el_cache(self):
+        '''
+        Prueba que las actualizaciones en lote
+        invalidan el cache
+        '''
+        self.client.get(self.url)
+        Producto.objects.descontar_existencias({self.producto.pk: 3})
+        self.assertEqual(self.client.get(self.url).data['cantidad'], 1)
+        self.producto.refresh_from_db()
+        self.producto.costo = 12
+        Producto.objects.actualizar_en_lote([self.producto], ['costo'])
+        self.assertEqual(self.client.get(self.url).data['costo'], 12)
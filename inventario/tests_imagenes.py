@@ -0,0 +1,166 @@
+'''
+Script que contiene las pruebas de la generacion
+de variantes de las fotos de los productos
+'''
+import io
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse_lazy
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from inventario.imagenes import VARIANTES, generar_variantes, ruta_variante, urls_variantes
+from inventario.models import Producto, Categoria
+from inventario.serializers import ProductoSerializer
+
+def foto_de_prueba(nombre="camisa.jpg", tamano=(2000, 1000)):
+    '''
+    Devuelve un archivo subido con una
+    imagen JPEG del tamano indicado
+    '''
+    contenido = io.BytesIO()
+    Image.new('RGB', tamano, color=(200, 30, 30)).save(contenido, 'JPEG')
+    return SimpleUploadedFile(nombre, contenido.getvalue(), content_type='image/jpeg')
+
+class VariantesTest(TestCase):
+    '''
+    Clase que contiene las pruebas de
+    las variantes de las fotos
+    '''
+
+    def setUp(self):
+        '''
+        Usa una carpeta temporal como
+        MEDIA_ROOT
+        '''
+        self.media = tempfile.mkdtemp()
+        self.configuracion = override_settings(MEDIA_ROOT=self.media, IMAGENES_SINCRONO=True)
+        self.configuracion.enable()
+
+    def tearDown(self):
+        '''
+        Elimina la carpeta temporal
+        '''
+        self.configuracion.disable()
+        shutil.rmtree(self.media)
+
+    def test_ruta_variante(self):
+        '''
+        Prueba que las variantes se guardan en la
+        carpeta variantes junto a la foto original
+        '''
+        self.assertEqual(ruta_variante("coleccion/camisa.jpg", "miniatura"),
+                         "coleccion/variantes/camisa.jpg.miniatura.webp")
+        self.assertNotEqual(ruta_variante("coleccion/camisa.jpg", "miniatura"),
+                            ruta_variante("coleccion/camisa.png", "miniatura"))
+
+    def test_generar_variantes(self):
+        '''
+        Prueba que se genera cada variante en WebP
+        sin pasarse de su tamano
+        '''
+        nombre = default_storage.save("coleccion/camisa.jpg", foto_de_prueba())
+        generar_variantes(nombre)
+        for variante, lado in VARIANTES.items():
+            with default_storage.open(ruta_variante(nombre, variante)) as archivo:
+                imagen = Image.open(archivo)
+                self.assertEqual(imagen.format, 'WEBP')
+                self.assertEqual(max(imagen.size), lado)
+
+    def test_comando_genera_las_variantes_que_faltan(self):
+        '''
+        Prueba que el comando genera las variantes de
+        las fotos subidas antes de que existieran y
+        no vuelve a generar las que ya existen
+        '''
+        nombre = default_storage.save("coleccion/camisa.jpg", foto_de_prueba())
+        Producto.objects.create(
+            codigo="1",
+            cantidad=1,
+            costo=1,
+            categoria=Categoria.objects.create(nombre="Accesorio"),
+            foto=nombre
+        )
+        default_storage.save(ruta_variante(nombre, 'miniatura'), ContentFile(b"existente"))
+        salida = io.StringIO()
+        call_command('generar_variantes', stdout=salida)
+        self.assertIn("Variantes generadas para 1 fotos, 0 con errores", salida.getvalue())
+        for variante in VARIANTES:
+            self.assertTrue(default_storage.exists(ruta_variante(nombre, variante)))
+        with default_storage.open(ruta_variante(nombre, 'miniatura')) as archivo:
+            self.assertEqual(archivo.read(), b"existente")
+        self.assertEqual(generar_variantes(nombre, reemplazar=False), [])
+
+    def test_serializer_devuelve_urls_de_las_variantes(self):
+        '''
+        Prueba que el serializer devuelve la url de cada
+        variante de la foto, o la de la foto original
+        mientras la variante no exista
+        '''
+        nombre = default_storage.save("coleccion/camisa.jpg", foto_de_prueba())
+        producto = Producto(
+            codigo="1",
+            cantidad=1,
+            costo=1,
+            categoria=Categoria.objects.create(nombre="Accesorio"),
+            foto=nombre
+        )
+        variantes = ProductoSerializer(producto).data['variantes']
+        self.assertEqual(variantes['tarjeta'], "/media/coleccion/camisa.jpg")
+        generar_variantes(nombre)
+        variantes = ProductoSerializer(producto).data['variantes']
+        self.assertEqual(variantes, urls_variantes(nombre))
+        self.assertEqual(variantes['tarjeta'],
+                         "/media/coleccion/variantes/camisa.jpg.tarjeta.webp")
+
+class SubirFotoTest(APITransactionTestCase):
+    '''
+    Clase que prueba que al subir la foto de un
+    producto se generan sus variantes
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Usa una carpeta temporal como MEDIA_ROOT e
+        inicia sesion con un usuario del staff
+        '''
+        self.media = tempfile.mkdtemp()
+        self.configuracion = override_settings(MEDIA_ROOT=self.media, IMAGENES_SINCRONO=True)
+        self.configuracion.enable()
+        self.categoria = Categoria.objects.create(nombre="Accesorio")
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def tearDown(self):
+        '''
+        Elimina la carpeta temporal
+        '''
+        self.configuracion.disable()
+        shutil.rmtree(self.media)
+
+    def test_crear_producto_con_foto(self):
+        '''
+        Prueba que al crear un producto con foto
+        se generan sus variantes
+        '''
+        data = {
+            'codigo': "1",
+            'cantidad': 1,
+            'costo': 1,
+            'categoria': self.categoria.pk,
+            'foto': foto_de_prueba(),
+        }
+        response = self.client.post(reverse_lazy('inventario:crear'), data, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        nombre = Producto.objects.get().foto.name
+        for variante in VARIANTES:
+            self.assertTrue(default_storage.exists(ruta_variante(nombre, variante)))
+            self.assertTrue(response.data['variantes'][variante].endswith(
+                ruta_variante(nombre, variante)
+            ))
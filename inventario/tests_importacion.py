@@ -0,0 +1,241 @@
+'''
+Script que contiene las pruebas de la importacion
+de productos desde archivos CSV y JSONL
+'''
+import io
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.importacion import ImportadorProductos
+from inventario.models import Producto, Categoria
+
+CSV_PRODUCTOS = (
+    "codigo,cantidad,costo,categoria,talla\n"
+    "1,5,10.5,Ropa,M\n"
+    "2,3,20,Zapato,9.5\n"
+    "3,1,5,Accesorio,\n"
+)
+
+class ImportadorProductosTest(TestCase):
+    '''
+    Clase que contiene las pruebas del
+    importador de productos
+    '''
+
+    def setUp(self):
+        '''
+        Crea las categorias usadas por los
+        archivos de prueba
+        '''
+        for categoria in ["Ropa", "Zapato", "Accesorio"]:
+            Categoria.objects.create(nombre=categoria)
+
+    def test_importar_csv(self):
+        '''
+        Prueba que se crean los productos
+        de un archivo CSV
+        '''
+        reporte = ImportadorProductos().importar(io.StringIO(CSV_PRODUCTOS), 'csv')
+        self.assertEqual(reporte['creados'], 3, msg=reporte)
+        self.assertEqual(reporte['errores'], [])
+        producto = Producto.objects.get(codigo="2")
+        self.assertEqual(producto.categoria.nombre, "Zapato")
+        self.assertEqual(producto.talla, "9.5")
+        self.assertIsNone(Producto.objects.get(codigo="3").talla)
+
+    def test_importar_actualiza_productos_existentes(self):
+        '''
+        Prueba que los productos cuyo codigo ya existe
+        se actualizan en lugar de crearse
+        '''
+        Producto.objects.create(
+            codigo="1",
+            cantidad=1,
+            costo=1,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        reporte = ImportadorProductos().importar(io.StringIO(CSV_PRODUCTOS), 'csv')
+        self.assertEqual(reporte['creados'], 2, msg=reporte)
+        self.assertEqual(reporte['actualizados'], 1, msg=reporte)
+        producto = Producto.objects.get(codigo="1")
+        self.assertEqual((producto.cantidad, producto.costo, producto.talla), (5, 10.5, "M"))
+        self.assertEqual(producto.categoria.nombre, "Ropa")
+
+    def test_importar_por_lotes(self):
+        '''
+        Prueba que los productos se guardan por lotes
+        y se reporta el progreso despues de cada uno
+        '''
+        progreso = []
+        importador = ImportadorProductos(
+            tamano_lote=2,
+            progreso=lambda reporte: progreso.append(reporte['creados'])
+        )
+        importador.importar(io.StringIO(CSV_PRODUCTOS), 'csv')
+        self.assertEqual(progreso, [2, 3])
+        self.assertEqual(Producto.objects.count(), 3)
+
+    def test_importar_con_errores_por_fila(self):
+        '''
+        Prueba que las filas invalidas se reportan con
+        su numero y no impiden importar el resto
+        '''
+        archivo = CSV_PRODUCTOS + (
+            "4,1,-1,Accesorio,\n"
+            "5,1,1,Ropa,XXL\n"
+            "6,uno,1,Accesorio,\n"
+            "7,1,1,Carteras,\n"
+            "8,1,nan,Accesorio,\n"
+            "9,1,inf,Accesorio,\n"
+        )
+        reporte = ImportadorProductos().importar(io.StringIO(archivo), 'csv')
+        self.assertEqual(reporte['creados'], 3, msg=reporte)
+        self.assertEqual([error['fila'] for error in reporte['errores']], [5, 6, 7, 8, 9, 10])
+        self.assertIn('costo', reporte['errores'][0]['errores'])
+        self.assertIn('talla', reporte['errores'][1]['errores'])
+        self.assertIn('cantidad', reporte['errores'][2]['errores'])
+        self.assertIn('categoria', reporte['errores'][3]['errores'])
+        self.assertIn('costo', reporte['errores'][4]['errores'])
+        self.assertIn('costo', reporte['errores'][5]['errores'])
+
+    def test_importar_rechaza_cantidades_que_no_son_enteros_validos(self):
+        '''
+        Prueba que la cantidad se valida como en
+        ProductoSerializer: sin decimales, sin booleanos
+        y dentro del rango de PositiveIntegerField
+        '''
+        archivo = (
+            '{"codigo": "1", "cantidad": 1.9, "costo": 1, "categoria": "Accesorio"}\n'
+            '{"codigo": "2", "cantidad": true, "costo": 1, "categoria": "Accesorio"}\n'
+            '{"codigo": "3", "cantidad": 2147483648, "costo": 1, "categoria": "Accesorio"}\n'
+            '{"codigo": "4", "cantidad": "1.9", "costo": 1, "categoria": "Accesorio"}\n'
+            '{"codigo": "5", "cantidad": 2.0, "costo": 1, "categoria": "Accesorio"}\n'
+            '{"codigo": "6", "cantidad": 2147483647, "costo": 1, "categoria": "Accesorio"}\n'
+        )
+        reporte = ImportadorProductos().importar(io.StringIO(archivo), 'jsonl')
+        self.assertEqual(reporte['creados'], 2, msg=reporte)
+        self.assertEqual([error['fila'] for error in reporte['errores']], [1, 2, 3, 4])
+        for error in reporte['errores']:
+            self.assertIn('cantidad', error['errores'])
+        self.assertEqual(Producto.objects.get(codigo="5").cantidad, 2)
+        self.assertEqual(Producto.objects.get(codigo="6").cantidad, 2147483647)
+
+    def test_actualizar_en_lote_respeta_el_limite_de_parametros(self):
+        '''
+        Prueba que ningun UPDATE de actualizar_en_lote usa
+        mas parametros de los que permite la base de datos
+        '''
+        limite = connection.features.max_query_params
+        if limite is None:
+            self.skipTest("La base de datos no limita los parametros")
+        categoria = Categoria.objects.get(nombre="Accesorio")
+        Producto.objects.bulk_create([
+            Producto(codigo=str(numero), cantidad=1, costo=1, categoria=categoria)
+            for numero in range(400)
+        ])
+        productos = list(Producto.objects.all())
+        campos = ['cantidad', 'costo']
+        parametros = []
+
+        def contar(execute, sql, params, many, context): # pylint: disable=too-many-arguments
+            '''
+            Guarda el numero de parametros
+            de cada UPDATE
+            '''
+            if sql.startswith('UPDATE'):
+                parametros.append(len(params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(contar):
+            self.assertEqual(Producto.objects.actualizar_en_lote(productos, campos), 400)
+        self.assertGreater(len(parametros), 1)
+        self.assertLessEqual(max(parametros), limite)
+
+    def test_importar_jsonl(self):
+        '''
+        Prueba que se importan los productos de un
+        archivo JSONL y que las lineas que no son JSON
+        se reportan como errores
+        '''
+        categoria = Categoria.objects.get(nombre="Ropa").pk
+        archivo = (
+            '{"codigo": "1", "cantidad": 2, "costo": 3, "categoria": %d, "talla": "S"}\n'
+            '\n'
+            'esto no es json\n'
+            '{"codigo": "2", "cantidad": 2, "costo": 3, "categoria": "Accesorio"}\n'
+        ) % categoria
+        reporte = ImportadorProductos().importar(io.StringIO(archivo), 'jsonl')
+        self.assertEqual(reporte['creados'], 2, msg=reporte)
+        self.assertEqual([error['fila'] for error in reporte['errores']], [3])
+
+    def test_comando_importar_productos(self):
+        '''
+        Prueba que el comando importa el archivo
+        indicado
+        '''
+        descriptor, ruta = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(descriptor, 'w') as archivo:
+            archivo.write(CSV_PRODUCTOS)
+        try:
+            salida = io.StringIO()
+            call_command('importar_productos', ruta, lote=2, stdout=salida)
+        finally:
+            os.remove(ruta)
+        self.assertEqual(Producto.objects.count(), 3)
+        self.assertIn("3 creados", salida.getvalue())
+
+class ProductoImportarViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    de importacion de productos
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Crea las categorias e inicia sesion
+        con un usuario del staff
+        '''
+        for categoria in ["Ropa", "Zapato", "Accesorio"]:
+            Categoria.objects.create(nombre=categoria)
+        self.url = reverse_lazy('inventario:importar')
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def test_importar_archivo(self):
+        '''
+        Prueba que se importa un archivo enviado
+        a la vista
+        '''
+        archivo = SimpleUploadedFile("productos.csv", CSV_PRODUCTOS.encode('utf-8'))
+        response = self.client.post(self.url, {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(response.data['creados'], 3)
+        self.assertEqual(Producto.objects.count(), 3)
+
+    def test_importar_formato_invalido(self):
+        '''
+        Prueba que no se aceptan archivos en
+        otro formato
+        '''
+        archivo = SimpleUploadedFile("productos.xls", b"1,2,3")
+        response = self.client.post(self.url, {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+
+    def test_cliente_no_puede_importar(self):
+        '''
+        Prueba que un cliente no puede
+        importar productos
+        '''
+        self.client.logout()
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "rafaelrs", "password": "jaja123"})
+        archivo = SimpleUploadedFile("productos.csv", CSV_PRODUCTOS.encode('utf-8'))
+        response = self.client.post(self.url, {'archivo': archivo}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
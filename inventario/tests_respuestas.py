@@ -0,0 +1,176 @@
+'''
+Script que contiene las pruebas del cache de
+respuestas de las listas de productos y categorias
+'''
+import shutil
+import tempfile
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.models import Categoria, Producto
+from crucita_fashion.respuestas import CONTADORES
+
+@override_settings(RESPUESTAS_CACHE_ACTIVO=True)
+class RespuestaCacheTest(APITestCase):
+    '''
+    Clase que contiene las pruebas del
+    cache de respuestas
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Vacia el cache, crea productos e inicia
+        sesion con un usuario del staff
+        '''
+        caches['respuestas'].clear()
+        CONTADORES.reiniciar()
+        self.categoria = Categoria.objects.create(nombre="Ropa")
+        for codigo in ("1", "2", "3"):
+            Producto.objects.create(codigo=codigo, cantidad=1, costo=1, categoria=self.categoria)
+        self.url = reverse_lazy('inventario:buscar')
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def consultas_productos(self, *args, **kwargs):
+        '''
+        Pide la busqueda y devuelve la respuesta y
+        las consultas a la tabla de productos
+        '''
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, *args, **kwargs)
+        return response, [consulta['sql'] for consulta in consultas
+                          if 'inventario_producto' in consulta['sql']]
+
+    def test_acierto_sin_consultas(self):
+        '''
+        Prueba que la segunda busqueda se responde
+        desde el cache sin consultar los productos
+        '''
+        primera, _ = self.consultas_productos()
+        segunda, consultas = self.consultas_productos()
+        self.assertEqual(primera['X-Cache'], 'MISS')
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(consultas, [])
+        self.assertEqual(segunda.content, primera.content)
+        self.assertEqual(segunda['ETag'], primera['ETag'])
+        self.assertEqual(CONTADORES.valores()['productos'], {'aciertos': 1, 'fallos': 1})
+
+    def test_parametros_normalizados(self):
+        '''
+        Prueba que el orden de los parametros
+        no cambia la llave
+        '''
+        self.client.get(self.url, {'codigo': "1", 'cantidad': 1})
+        response = self.client.get(self.url + "?cantidad=1&codigo=1")
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get(self.url, {'codigo': "2"})['X-Cache'], 'MISS')
+
+    def test_etag_desde_el_cache(self):
+        '''
+        Prueba que se responde 304 con el
+        ETag guardado en el cache
+        '''
+        etag = self.client.get(self.url)['ETag']
+        response, consultas = self.consultas_productos(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(consultas, [])
+
+    def test_invalidacion(self):
+        '''
+        Prueba que guardar, eliminar o actualizar en lote
+        productos invalida las respuestas guardadas
+        '''
+        modificaciones = (
+            lambda: Producto.objects.filter(codigo="1").first().save(),
+            lambda: Producto.objects.get(codigo="3").delete(),
+            lambda: Producto.objects.descontar_existencias(
+                {Producto.objects.get(codigo="2").pk: 1}
+            ),
+            lambda: Producto.objects.crear_en_lote([
+                Producto(codigo="4", cantidad=1, costo=1, categoria=self.categoria)
+            ]),
+        )
+        for modificar in modificaciones:
+            self.client.get(self.url)
+            modificar()
+            response = self.client.get(self.url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([producto['codigo'] for producto in response.data['results']],
+                         ["1", "2", "4"])
+        self.assertEqual(response.data['results'][1]['cantidad'], 0)
+
+    def test_invalidacion_compartida(self):
+        '''
+        Prueba que con un cache compartido otra instancia
+        del cache (la de otro worker) ve la nueva version
+        del grupo despues de una modificacion
+        '''
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, True)
+        compartido = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                      'LOCATION': directorio}
+        otro_worker = FileBasedCache(directorio, {})
+        with self.settings(CACHES={'default': compartido, 'respuestas': compartido}):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+            antes = otro_worker.get('respuestas:version:productos')
+            self.assertIsNotNone(antes)
+            Producto.objects.filter(codigo="1").first().save()
+            despues = otro_worker.get('respuestas:version:productos')
+            self.assertNotEqual(despues, antes)
+            self.assertIsNotNone(otro_worker.get('respuestas:cambio:productos'))
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+
+    def test_rol_en_la_llave(self):
+        '''
+        Prueba que las respuestas de cada
+        rol se guardan por separado
+        '''
+        url = reverse_lazy('inventario:categorias')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.client.logout()
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "rafaelrs", "password": "jaja123"})
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_categorias(self):
+        '''
+        Prueba que crear una categoria invalida
+        la lista de categorias
+        '''
+        url = reverse_lazy('inventario:categorias')
+        self.client.get(url)
+        Categoria.objects.create(nombre="Accesorio")
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([categoria['nombre'] for categoria in response.data],
+                         ["Accesorio", "Ropa"])
+
+    @override_settings(RESPUESTAS_CACHE_ACTIVO=False)
+    def test_desactivado(self):
+        '''
+        Prueba que sin el cache las respuestas
+        no se guardan
+        '''
+        self.client.get(self.url)
+        _, consultas = self.consultas_productos()
+        self.assertNotEqual(consultas, [])
+
+    def test_estadisticas(self):
+        '''
+        Prueba que la vista de estadisticas
+        devuelve los contadores
+        '''
+        self.client.get(self.url)
+        self.client.get(self.url)
+        response = self.client.get(reverse_lazy('inventario:cache'))
+        self.assertEqual(response.data['respuestas']['productos'],
+                         {'aciertos': 1, 'fallos': 1})
+        self.assertIn('aciertos', response.data['codigos'])
@@ -42,7 +42,8 @@ class ProductoSerializerTest(TestCase):
             'costo': 1,
             'categoria': self.categoria_ropa,
             'talla': "M",
-            'foto': None
+            'foto': None,
+            'variantes': None
         }
         producto_serializer = ProductoSerializer(self.producto_1)
         self.assertEqual(producto_serializer.data, producto, msg="Los dos productos no son iguales")
@@ -269,4 +270,41 @@ class ProductoSerializerTest(TestCase):
         }
         producto_serializer = ProductoSerializer(data=producto)
         self.assertTrue(producto_serializer.is_valid(), msg=producto_serializer.errors)
-    
\ No newline at end of file
+
+    def test_is_valid_codigo_repetido(self):
+        '''
+        Prueba que is_valid devuelve false si ya
+        existe un producto con el mismo codigo, y
+        true si el producto repetido es el que se edita
+        '''
+        self.producto_1.save()
+        producto = {
+            'codigo': "1",
+            'cantidad': 1,
+            'costo': 1,
+            'categoria': self.categoria_ropa,
+            'talla': "M"
+        }
+        producto_serializer = ProductoSerializer(data=producto)
+        self.assertFalse(producto_serializer.is_valid(), msg=producto_serializer.errors)
+        producto_serializer = ProductoSerializer(self.producto_1, data=producto)
+        self.assertTrue(producto_serializer.is_valid(), msg=producto_serializer.errors)
+
+    def test_categoria_del_contexto(self):
+        '''
+        Prueba que con las categorias en el contexto cada
+        valor devuelve la categoria o un error
+        '''
+        accesorio = Categoria.objects.get(nombre="Accesorio")
+        contexto = {'categorias': {accesorio.pk: accesorio}}
+        producto = {'codigo': "1", 'cantidad': 1, 'costo': 1}
+        serializer = ProductoSerializer(data=dict(producto, categoria=accesorio.pk),
+                                        context=contexto)
+        self.assertTrue(serializer.is_valid(), msg=serializer.errors)
+        self.assertEqual(serializer.validated_data['categoria'], accesorio)
+        for categoria, codigo in ((self.categoria_ropa, 'does_not_exist'),
+                                  ("ropa", 'incorrect_type'), ([1], 'incorrect_type')):
+            serializer = ProductoSerializer(data=dict(producto, categoria=categoria),
+                                            context=contexto)
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(serializer.errors['categoria'][0].code, codigo)
@@ -2,6 +2,10 @@
 Script que contiene las pruebas relacionadas
 con las vistas del modulo inventario
 '''
+import json
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse_lazy
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -129,6 +133,124 @@ class ProductoCrearViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
 
 
+    def test_crear_varios_productos(self):
+        '''
+        Prueba que si se envia una lista se crean
+        todos los productos de la lista
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        data = [dict(self.data, codigo=str(codigo)) for codigo in range(5)]
+        data.append({
+            'codigo': "zapato",
+            'cantidad': 1,
+            'costo': 1,
+            'categoria': (Categoria.objects.get(nombre="Zapato")).pk,
+            'talla': "9.5",
+        })
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(Producto.objects.count(), 6)
+
+    def test_crear_varios_productos_con_errores(self):
+        '''
+        Prueba que si algun producto de la lista tiene
+        errores no se crea ninguno y se devuelven los
+        errores de cada producto en su posicion
+        '''
+        Producto.objects.create(
+            codigo="existente",
+            cantidad=1,
+            costo=1,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        data = [
+            self.data,
+            dict(self.data, codigo="2", costo=-1),
+            dict(self.data, codigo="3", categoria=100),
+            dict(self.data, codigo="existente"),
+            dict(self.data, codigo="4", talla="9"),
+        ]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('costo', response.data[1])
+        self.assertIn('categoria', response.data[2])
+        self.assertIn('codigo', response.data[3])
+        self.assertIn('non_field_errors', response.data[4])
+        self.assertEqual(Producto.objects.count(), 1)
+
+    def test_crear_varios_productos_con_codigo_repetido(self):
+        '''
+        Prueba que no se crean los productos si un
+        codigo se repite dentro de la lista
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        response = self.client.post(url, [self.data, self.data], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertEqual(response.data[0], {})
+        self.assertIn('codigo', response.data[1])
+        self.assertEqual(Producto.objects.count(), 0)
+
+    def test_crear_varios_productos_con_codigo_existente_y_espacios(self):
+        '''
+        Prueba que un codigo existente con espacios alrededor
+        se rechaza igual que el codigo sin espacios
+        '''
+        Producto.objects.create(
+            codigo="existente",
+            cantidad=1,
+            costo=1,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        data = [self.data, dict(self.data, codigo=" existente ")]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertIn('codigo', response.data[1])
+        self.assertEqual(Producto.objects.count(), 1)
+
+    def test_crear_varios_productos_con_numero_fijo_de_consultas(self):
+        '''
+        Prueba que crear una lista de productos hace el
+        mismo numero de consultas sin importar su tamano
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        with CaptureQueriesContext(connection) as uno:
+            response = self.client.post(url, [self.data], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        data = [dict(self.data, codigo="lote" + str(codigo)) for codigo in range(50)]
+        with CaptureQueriesContext(connection) as cincuenta:
+            response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        self.assertEqual(len(uno), len(cincuenta))
+
+    @override_settings(PRODUCTOS_MAX_LOTE=2)
+    def test_crear_varios_productos_excede_el_maximo(self):
+        '''
+        Prueba que no se pueden crear mas productos
+        a la vez que el maximo configurado
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy('inventario:crear')
+        data = [dict(self.data, codigo=str(codigo)) for codigo in range(3)]
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertEqual(Producto.objects.count(), 0)
+
+
 class ProductoDetallesViewTest(APITestCase):
     '''
     Clase que prueba la vista que muestra
@@ -263,6 +385,46 @@ class ProductoDetallesViewTest(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, msg=response.data)
 
+    def test_detalles_con_etag_devuelve_304(self):
+        '''
+        Prueba que si el cliente envia el ETag o la fecha
+        de la ultima respuesta recibe 304 sin cuerpo
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+        url = reverse_lazy('inventario:editar', args=((Producto.objects.get(codigo="2")).pk,))
+        response = self.client.get(url)
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detalles_cambia_etag_al_modificar(self):
+        '''
+        Prueba que al modificar el producto cambia
+        su ETag y se devuelve la nueva version
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+        producto = Producto.objects.get(codigo="2")
+        url = reverse_lazy('inventario:editar', args=(producto.pk,))
+        etag = self.client.get(url)['ETag']
+        data = {
+            'codigo': producto.codigo,
+            'cantidad': 9,
+            'costo': producto.costo,
+            'categoria': producto.categoria.pk,
+            'talla': producto.talla,
+        }
+        self.client.put(url, data=data, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['cantidad'], 9)
+
 class ProductoBuscarViewTest(APITestCase):
     '''
     Clase que contiene las pruebas relacionadas
@@ -344,7 +506,7 @@ class ProductoBuscarViewTest(APITestCase):
             ProductoSerializer(producto).data for producto in Producto.objects.filter(codigo="2")
         ]
         self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
-        self.assertEqual(response.data, resultado_esperado, msg=self.mensaje_query)
+        self.assertEqual(response.data['results'], resultado_esperado, msg=self.mensaje_query)
 
     def test_busqueda_con_categoria_valida(self):
         '''
@@ -363,7 +525,7 @@ class ProductoBuscarViewTest(APITestCase):
             for producto in Producto.objects.filter(categoria=categoria)
         ]
         self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
-        self.assertEqual(response.data, resultado_esperado, msg=self.mensaje_query)
+        self.assertEqual(response.data['results'], resultado_esperado, msg=self.mensaje_query)
 
     def test_busqueda_con_varios_campos(self):
         '''
@@ -380,7 +542,7 @@ class ProductoBuscarViewTest(APITestCase):
             for producto in Producto.objects.filter(categoria=categoria, talla="M")
         ]
         self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
-        self.assertEqual(response.data, resultado_esperado, msg=self.mensaje_query)
+        self.assertEqual(response.data['results'], resultado_esperado, msg=self.mensaje_query)
 
     def test_busqueda_con_campo_invalido(self):
         '''
@@ -394,4 +556,341 @@ class ProductoBuscarViewTest(APITestCase):
         response = self.client.get(url)
         resultado_esperado = []
         self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
-        self.assertEqual(response.data, resultado_esperado, msg=self.mensaje_query)
+        self.assertEqual(response.data['results'], resultado_esperado, msg=self.mensaje_query)
+
+    @override_settings(PRODUCTOS_PAGE_SIZE=1)
+    def test_busqueda_paginada_por_cursor(self):
+        '''
+        Prueba que la busqueda devuelve los productos
+        por paginas ordenadas por pk y que el cursor
+        permite pedir la siguiente pagina
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["2"])
+        self.assertIsNone(response.data['previous'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["3"])
+        self.assertIsNone(response.data['next'])
+
+    @override_settings(PRODUCTOS_PAGE_SIZE=1)
+    def test_cursor_estable_con_inserciones(self):
+        '''
+        Prueba que un producto insertado despues de pedir
+        la primera pagina no desplaza las paginas siguientes
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        siguiente = self.client.get(url).data['next']
+        Producto.objects.create(
+            codigo="4",
+            cantidad=1,
+            costo=2,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        response = self.client.get(siguiente)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["3"])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["4"])
+
+    def test_tamano_de_pagina_configurable(self):
+        '''
+        Prueba que el cliente puede pedir un tamano
+        de pagina con el parametro page_size
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar") + "?page_size=1"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_busqueda_por_rango(self):
+        '''
+        Prueba que se puede buscar por rangos
+        de cantidad y costo
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        response = self.client.get(url, {'cantidad__gte': 2, 'costo__gte': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["3"])
+        response = self.client.get(url, {'cantidad__lte': 1})
+        self.assertEqual(response.data['results'], [])
+        response = self.client.get(url, {'costo__gte': 0.5, 'costo__lte': 2})
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["2"])
+
+    def test_busqueda_por_prefijo_del_codigo(self):
+        '''
+        Prueba que se puede buscar por el
+        inicio del codigo
+        '''
+        Producto.objects.create(
+            codigo="20",
+            cantidad=1,
+            costo=2,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        response = self.client.get(reverse_lazy("inventario:buscar"), {'codigo__startswith': "2"})
+        self.assertEqual([producto['codigo'] for producto in response.data['results']],
+                         ["2", "20"])
+
+    @override_settings(PRODUCTOS_PAGE_SIZE=1)
+    def test_busqueda_ordenada_por_costo(self):
+        '''
+        Prueba que se puede ordenar por costo y
+        que el cursor respeta ese orden
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        response = self.client.get(reverse_lazy("inventario:buscar"), {'ordering': "-costo"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["3"])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([producto['codigo'] for producto in response.data['results']], ["2"])
+
+    @override_settings(PRODUCTOS_PAGE_SIZE=1)
+    def test_busqueda_ordenada_con_valores_repetidos(self):
+        '''
+        Prueba que con valores repetidos en el orden
+        pedido cada producto aparece en una sola pagina
+        '''
+        accesorio = Categoria.objects.get(nombre="Accesorio")
+        for codigo in ("4", "5", "6"):
+            Producto.objects.create(codigo=codigo, cantidad=1, costo=7, categoria=accesorio)
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar") + "?ordering=costo"
+        codigos = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+            codigos += [producto['codigo'] for producto in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(sorted(codigos), sorted(Producto.objects.values_list('codigo', flat=True)))
+
+    def test_busqueda_ordenada_por_campo_invalido(self):
+        '''
+        Prueba que los campos que no se pueden
+        ordenar se ignoran
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        response = self.client.get(reverse_lazy("inventario:buscar"), {'ordering': "foto"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['results']],
+                         ["2", "3"])
+
+    def test_busqueda_con_campos_seleccionados(self):
+        '''
+        Prueba que con fields solo se devuelven y se
+        leen de la base de datos los campos pedidos
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, {'fields': "codigo,cantidad", 'ordering': "-costo"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([dict(producto) for producto in response.data['results']],
+                         [{'codigo': "3", 'cantidad': 2}, {'codigo': "2", 'cantidad': 2}])
+        listado = [consulta['sql'] for consulta in consultas
+                   if 'ORDER BY' in consulta['sql']][0]
+        self.assertNotIn('"foto"', listado)
+        self.assertNotIn('"talla"', listado)
+
+    def test_busqueda_omitiendo_campos(self):
+        '''
+        Prueba que con omit se devuelven todos los
+        campos menos los indicados
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        response = self.client.get(reverse_lazy("inventario:buscar"), {'omit': "foto,variantes"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(set(response.data['results'][0]),
+                         {'codigo', 'cantidad', 'costo', 'categoria', 'talla'})
+
+    @override_settings(RESPUESTAS_CACHE_ACTIVO=False)
+    def test_busqueda_con_etag_devuelve_304_sin_serializar(self):
+        '''
+        Prueba que la busqueda responde 304 con una sola
+        consulta de validadores y sin leer los productos
+        (sin el cache de respuestas, que no hace consultas)
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        consultas_productos = [consulta['sql'] for consulta in consultas
+                               if 'inventario_producto' in consulta['sql']]
+        self.assertEqual(len(consultas_productos), 1, msg=consultas_productos)
+
+    def test_busqueda_cambia_etag_al_eliminar(self):
+        '''
+        Prueba que el ETag de la busqueda cambia
+        cuando se elimina un producto
+        '''
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "danielrs", "password": "danielrs19972705"})
+        url = reverse_lazy("inventario:buscar")
+        etag = self.client.get(url)['ETag']
+        Producto.objects.get(codigo="2").delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(len(response.data['results']), 1)
+
+class ProductoExportarViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    que exporta el inventario
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Crea algunos productos e inicia sesion
+        con un usuario del staff
+        '''
+        for categoria in ["Ropa", "Zapato", "Accesorio"]:
+            Categoria.objects.create(nombre=categoria)
+        self.ropa = Categoria.objects.get(nombre="Ropa")
+        Producto.objects.create(codigo="2", cantidad=2, costo=1.5, categoria=self.ropa, talla="M")
+        Producto.objects.create(
+            codigo="3",
+            cantidad=1,
+            costo=3,
+            categoria=Categoria.objects.get(nombre="Accesorio")
+        )
+        self.url = reverse_lazy('inventario:exportar')
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def test_exportar_csv(self):
+        '''
+        Prueba que se exportan todos los productos
+        en CSV con una respuesta por partes
+        '''
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        contenido = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(contenido, [
+            "codigo,cantidad,costo,categoria,talla,foto",
+            "2,2,1.5,{},M,".format(self.ropa.pk),
+            "3,1,3.0,{},,".format(Categoria.objects.get(nombre="Accesorio").pk),
+        ])
+
+    def test_exportar_jsonl(self):
+        '''
+        Prueba que se exporta un objeto JSON
+        por producto
+        '''
+        response = self.client.get(self.url + "?formato=jsonl")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lineas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(len(lineas), 2)
+        self.assertEqual(json.loads(lineas[0]), {
+            'codigo': "2", 'cantidad': 2, 'costo': 1.5,
+            'categoria': self.ropa.pk, 'talla': "M", 'foto': ''
+        })
+
+    def test_exportar_formato_invalido(self):
+        '''
+        Prueba que no se puede exportar en
+        otro formato
+        '''
+        response = self.client.get(self.url + "?formato=xls")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+
+    def test_cliente_no_puede_exportar(self):
+        '''
+        Prueba que un cliente no puede
+        exportar el inventario
+        '''
+        self.client.logout()
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "rafaelrs", "password": "jaja123"})
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
+
+class ProductoLoteViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    que devuelve varios productos a la vez
+    '''
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Crea productos e inicia sesion
+        con un usuario del staff
+        '''
+        categoria = Categoria.objects.create(nombre="Accesorio")
+        self.productos = [
+            Producto.objects.create(codigo=str(numero), cantidad=1, costo=numero,
+                                    categoria=categoria)
+            for numero in range(1, 6)
+        ]
+        self.url = reverse_lazy('inventario:lote')
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def test_lote_por_ids_en_orden(self):
+        '''
+        Prueba que devuelve los productos en el orden
+        pedido, en una consulta, y reporta los faltantes
+        '''
+        ids = [self.productos[3].pk, self.productos[0].pk, 999, self.productos[2].pk]
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {'ids': ",".join(str(pk) for pk in ids)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['productos']],
+                         ["4", "1", "3"])
+        self.assertEqual(response.data['faltantes'], [999])
+        consultas_productos = [consulta['sql'] for consulta in consultas
+                               if 'FROM "inventario_producto"' in consulta['sql']]
+        self.assertEqual(len(consultas_productos), 1, msg=consultas_productos)
+
+    def test_lote_por_codigos(self):
+        '''
+        Prueba que se pueden pedir los productos por
+        codigo y que los repetidos se devuelven una vez
+        '''
+        response = self.client.get(self.url, {'codigos': "5,2,5,X"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual([producto['codigo'] for producto in response.data['productos']],
+                         ["5", "2"])
+        self.assertEqual(response.data['faltantes'], ["X"])
+
+    def test_lote_parametros_invalidos(self):
+        '''
+        Prueba que se rechazan los ids invalidos y las
+        peticiones sin ids ni codigos o con ambos
+        '''
+        for parametros in ({}, {'ids': "1", 'codigos': "1"}, {'ids': "1,a"}, {'ids': ","},
+                           {'ids': "1,\u00b2"}, {'ids': "1,-2"}, {'ids': "0"},
+                           {'ids': "2147483648"}, {'ids': "99999999999999999999"}):
+            response = self.client.get(self.url, parametros)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST,
+                             msg=parametros)
+
+    @override_settings(PRODUCTOS_MAX_LOTE=2)
+    def test_lote_excede_el_maximo(self):
+        '''
+        Prueba que no se pueden pedir mas
+        productos que el maximo
+        '''
+        response = self.client.get(self.url, {'codigos': "1,2,3"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
@@ -11,7 +11,13 @@ app_name = "inventario"
 urlpatterns = [
     path('productos/', views.ProductoBuscarView.as_view(), name='buscar'),
     path('productos/<int:pk>', views.ProductoDetallesView.as_view(), name='editar'),
+    path('productos/codigo/<str:codigo>', views.ProductoCodigoView.as_view(), name='codigo'),
+    path('productos/lote', views.ProductoLoteView.as_view(), name='lote'),
     path('productos/crear', views.ProductoCrearView.as_view(), name='crear'),
+    path('productos/importar', views.ProductoImportarView.as_view(), name='importar'),
+    path('productos/exportar', views.ProductoExportarView.as_view(), name='exportar'),
+    path('categorias/', views.CategoriaBuscarView.as_view(), name='categorias'),
+    path('cache/estadisticas', views.CacheEstadisticasView.as_view(), name='cache'),
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
@@ -2,19 +2,45 @@
 Script que contendra las vistas de este
 modulo
 '''
+import io
+import os
+from collections import OrderedDict
+from django.conf import settings
+from django.db.models import Count, Max
 from django.shortcuts import render # pylint: disable=unused-import
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
 from rest_framework import permissions
-from inventario.models import Producto
-from inventario.serializers import ProductoSerializer
+from rest_framework import serializers
+from rest_framework import status
+from rest_framework import views
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from inventario.models import Producto, Categoria
+from inventario.serializers import ProductoSerializer, CategoriaSerializer
 from inventario.permissions import IsStaff
+from inventario.pagination import ProductoCursorPagination
+from inventario.filters import ProductoFilter, ProductoOrderingFilter
+from inventario.importacion import ImportadorProductos, FORMATOS
+from inventario.cache import (producto_por_codigo, con_urls_absolutas, CACHE_CODIGOS,
+                              GRUPO_PRODUCTOS, GRUPO_CATEGORIAS)
+from crucita_fashion.exportacion import respuesta_exportacion, formato_exportacion
+from crucita_fashion.condicional import GetCondicionalMixin, calcular_etag
+from crucita_fashion.campos import CamposDinamicosViewMixin
+from crucita_fashion.lectura_rapida import LecturaRapidaMixin
+from crucita_fashion.respuestas import RespuestaCacheMixin, CONTADORES
+from crucita_fashion.replicas import LecturaReplicaMixin
+
+# Mayor valor de la columna pk (AutoField), los ids mayores no caben en la consulta
+MAX_PK = 2147483647
 
 # Create your views here.
 class ProductoCrearView(generics.CreateAPIView):
     '''
     Vista que se encarga de la creacion de un
-    nuevo producto para anadir al sistema
+    nuevo producto para anadir al sistema. Si recibe
+    una lista crea todos los productos de la lista
+    en una sola transaccion
     '''
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
@@ -23,10 +49,20 @@ class ProductoCrearView(generics.CreateAPIView):
         IsStaff,
     )
 
-class ProductoDetallesView(generics.RetrieveUpdateDestroyAPIView): # pylint: disable=too-many-ancestors
+    def get_serializer(self, *args, **kwargs):
+        '''
+        Usa el serializer de listas cuando la
+        informacion recibida es una lista
+        '''
+        if isinstance(kwargs.get('data'), list):
+            kwargs['many'] = True
+        return super().get_serializer(*args, **kwargs)
+
+class ProductoDetallesView(GetCondicionalMixin, generics.RetrieveUpdateDestroyAPIView): # pylint: disable=too-many-ancestors
     '''
     Vista que permite modificar, ver o eliminar
-    la informacion de un producto dentro del sistema
+    la informacion de un producto dentro del sistema.
+    Las respuestas GET llevan ETag y Last-Modified
     '''
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
@@ -35,16 +71,232 @@ class ProductoDetallesView(generics.RetrieveUpdateDestroyAPIView): # pylint: dis
         IsStaff,
     )
 
-class ProductoBuscarView(generics.ListAPIView):
+    def get_validadores(self, request, *args, **kwargs):
+        '''
+        Calcula los validadores con la fecha de
+        modificacion del producto, si no existe
+        se deja que la vista responda 404
+        '''
+        modificado = self.get_queryset().filter(pk=kwargs['pk']).values_list(
+            'modificado', flat=True
+        ).first()
+        if modificado is None:
+            return None
+        return calcular_etag(kwargs['pk'], modificado.isoformat()), modificado
+
+class ProductoBuscarView(RespuestaCacheMixin, LecturaReplicaMixin, GetCondicionalMixin, # pylint: disable=too-many-ancestors
+                         LecturaRapidaMixin, CamposDinamicosViewMixin, generics.ListAPIView):
     '''
     Vista que permite buscar uno o varios productos
-    en el sistema
+    en el sistema. Los resultados se devuelven
+    paginados por cursor y llevan ETag y Last-Modified.
+    Ver ProductoFilter para los filtros disponibles y
+    CamposDinamicosMixin para los parametros fields y omit.
+    Las respuestas se guardan en el cache de respuestas
+    y se leen de una replica si hay
     '''
+    cache_grupo = GRUPO_PRODUCTOS
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
-    filter_backends = (DjangoFilterBackend,)
-    filter_fields = ('codigo', 'cantidad', 'costo', 'categoria')
+    pagination_class = ProductoCursorPagination
+    filter_backends = (DjangoFilterBackend, ProductoOrderingFilter)
+    filterset_class = ProductoFilter
+    ordering_fields = ('codigo', 'cantidad', 'costo', 'modificado')
+    ordering = ('pk',)
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+
+    def get_validadores(self, request, *args, **kwargs):
+        '''
+        Calcula los validadores con la ultima fecha de
+        modificacion y el numero de productos filtrados,
+        el numero cambia cuando se elimina un producto
+        '''
+        resumen = self.filter_queryset(self.get_queryset()).aggregate(
+            ultimo=Max('modificado'),
+            total=Count('pk')
+        )
+        ultimo = resumen['ultimo']
+        etag = calcular_etag(
+            request.get_full_path(),
+            ultimo.isoformat() if ultimo else '',
+            resumen['total']
+        )
+        return etag, ultimo
+
+class CategoriaBuscarView(RespuestaCacheMixin, generics.ListAPIView):
+    '''
+    Vista que devuelve todas las categorias ordenadas
+    por nombre. Las respuestas se guardan en el cache
+    de respuestas
+    '''
+    queryset = Categoria.objects.order_by('nombre')
+    serializer_class = CategoriaSerializer
+    cache_grupo = GRUPO_CATEGORIAS
+    permission_classes = (
+        permissions.IsAuthenticated,
+    )
+
+class CacheEstadisticasView(views.APIView):
+    '''
+    Vista que devuelve los aciertos y fallos de los caches
+    del inventario en el proceso que atiende la peticion
+    '''
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+
+    def get(self, request): # pylint: disable=unused-argument,no-self-use
+        '''
+        Devuelve los contadores del cache de respuestas
+        por grupo y los del cache de codigos
+        '''
+        return Response({
+            'respuestas': CONTADORES.valores(),
+            'codigos': {
+                'aciertos': CACHE_CODIGOS.aciertos,
+                'fallos': CACHE_CODIGOS.fallos,
+                'entradas': len(CACHE_CODIGOS),
+            },
+        })
+
+class ProductoCodigoView(views.APIView):
+    '''
+    Vista que devuelve un producto por su codigo, pensada
+    para la caja al escanear el codigo de barras. Los
+    productos se guardan serializados en un cache en memoria
+    '''
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+
+    def get(self, request, codigo):
+        '''
+        Devuelve el producto del codigo
+        o 404 si no existe
+        '''
+        datos = producto_por_codigo(codigo)
+        if datos is None:
+            return Response({'detail': "No existe un producto con ese codigo"},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(con_urls_absolutas(datos, request))
+
+class ProductoLoteView(views.APIView):
+    '''
+    Vista que devuelve varios productos en una sola consulta,
+    indicados por pk (?ids=1,2,3) o por codigo (?codigos=A,B).
+    Los productos se devuelven en el orden pedido y los que
+    no existen se reportan en faltantes
+    '''
     permission_classes = (
         permissions.IsAuthenticated,
         IsStaff,
     )
+
+    @staticmethod
+    def leer_parametro(request):
+        '''
+        Devuelve el campo de busqueda (pk o codigo) y los
+        valores pedidos sin repetir, o lanza un ValidationError
+        '''
+        pedidos = [parametro for parametro in ('ids', 'codigos')
+                   if parametro in request.query_params]
+        if len(pedidos) != 1:
+            raise serializers.ValidationError("Debe indicar ids o codigos, pero no ambos")
+
+        valores = [valor.strip() for valor in request.query_params[pedidos[0]].split(',')]
+        valores = list(OrderedDict.fromkeys(valor for valor in valores if valor))
+        if not valores:
+            raise serializers.ValidationError({pedidos[0]: "Debe indicar al menos un valor"})
+        if len(valores) > settings.PRODUCTOS_MAX_LOTE:
+            raise serializers.ValidationError({
+                pedidos[0]: "No se pueden pedir mas de {} productos".format(
+                    settings.PRODUCTOS_MAX_LOTE
+                )
+            })
+        if pedidos[0] == 'codigos':
+            return 'codigo', valores
+        try:
+            ids = [int(valor) for valor in valores]
+        except ValueError:
+            raise serializers.ValidationError({'ids': "Los ids deben ser numeros enteros"})
+        if any(pk < 1 or pk > MAX_PK for pk in ids):
+            raise serializers.ValidationError({'ids': "Los ids deben ser numeros enteros"})
+        return 'pk', ids
+
+    def get(self, request):
+        '''
+        Devuelve los productos encontrados
+        y los faltantes
+        '''
+        campo, valores = self.leer_parametro(request)
+        encontrados = Producto.objects.in_bulk(valores, field_name=campo)
+        productos = [encontrados[valor] for valor in valores if valor in encontrados]
+        return Response({
+            'productos': ProductoSerializer(productos, many=True,
+                                            context={'request': request}).data,
+            'faltantes': [valor for valor in valores if valor not in encontrados],
+        })
+
+class ProductoImportarView(views.APIView):
+    '''
+    Vista que importa productos desde un archivo CSV
+    o JSONL enviado en el campo archivo. Crea los productos
+    nuevos y actualiza los existentes segun su codigo, y
+    devuelve un reporte con los errores de cada fila
+    '''
+    parser_classes = (MultiPartParser,)
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+
+    def post(self, request):
+        '''
+        Lee el archivo recibido por partes y
+        lo importa por lotes
+        '''
+        archivo = request.data.get('archivo')
+        if archivo is None:
+            return Response({'archivo': "Este campo es requerido"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        formato = request.data.get('formato') or os.path.splitext(archivo.name)[1][1:].lower()
+        if formato not in FORMATOS:
+            return Response({'formato': "El formato debe ser uno de {}".format(FORMATOS)},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        lineas = io.TextIOWrapper(archivo.file, encoding='utf-8-sig', newline='')
+        try:
+            reporte = ImportadorProductos().importar(lineas, formato)
+        finally:
+            lineas.detach()
+        return Response(reporte, status=status.HTTP_200_OK)
+
+class ProductoExportarView(views.APIView):
+    '''
+    Vista que exporta todo el inventario en CSV o JSONL
+    (parametro formato). Los productos se leen de la base
+    de datos por partes y se envian a medida que se leen,
+    con las mismas columnas que acepta la importacion
+    '''
+    columnas = ('codigo', 'cantidad', 'costo', 'categoria', 'talla', 'foto')
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+
+    def get(self, request):
+        '''
+        Devuelve la respuesta con los productos
+        ordenados por pk
+        '''
+        formato = formato_exportacion(request)
+        productos = Producto.objects.order_by('pk').values(*self.columnas).iterator(
+            chunk_size=2000
+        )
+        return respuesta_exportacion(productos, self.columnas, formato, 'productos')
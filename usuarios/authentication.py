@@ -0,0 +1,55 @@
+"""
+Script que contiene la autenticacion por
+tokens JWT de los usuarios
+"""
+from django.contrib.auth.models import Group
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTTokenUserAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+class UsuarioToken(TokenUser): # pylint: disable=abstract-method
+    """
+    Usuario construido solo con la informacion del
+    token, incluyendo su grupo. No consulta la base
+    de datos
+    """
+
+    def __str__(self):
+        """
+        Devuelve una representacion
+        del usuario
+        """
+        return 'UsuarioToken {}'.format(self.pk)
+
+    @cached_property
+    def grupo_id(self):
+        """
+        Devuelve el id del grupo
+        guardado en el token
+        """
+        return self.token.get('grupo_id')
+
+    @cached_property
+    def grupo(self):
+        """
+        Devuelve el grupo guardado en el token,
+        sin consultar la base de datos
+        """
+        if self.grupo_id is None:
+            return None
+        return Group(pk=self.grupo_id, name=self.token.get('grupo'))
+
+class JWTUsuarioAuthentication(JWTTokenUserAuthentication):
+    """
+    Autenticacion que valida el token del encabezado
+    Authorization: Bearer <token> y devuelve un
+    UsuarioToken, sin consultar sesiones ni usuarios
+    """
+
+    def get_user(self, validated_token):
+        """
+        Devuelve el usuario representado
+        por el token
+        """
+        super().get_user(validated_token)
+        return UsuarioToken(validated_token)
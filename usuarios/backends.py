@@ -0,0 +1,24 @@
+"""
+Script que contiene el backend de autenticacion
+de los usuarios del sistema
+"""
+from django.contrib.auth.backends import ModelBackend
+from usuarios.models import Usuario
+
+class UsuarioBackend(ModelBackend):
+    """
+    Backend que carga el grupo del usuario en la misma
+    consulta que el usuario, asi los permisos pueden
+    revisar el rol sin consultar la base de datos
+    """
+
+    def get_user(self, user_id):
+        """
+        Devuelve el usuario de la sesion
+        junto con su grupo
+        """
+        try:
+            usuario = Usuario.objects.select_related('grupo').get(pk=user_id)
+        except Usuario.DoesNotExist:
+            return None
+        return usuario if self.user_can_authenticate(usuario) else None
@@ -3,6 +3,7 @@ Script que contiene los permisos
 que estan relacionado con los usuarios
 """
 from rest_framework import permissions
+from usuarios.roles import rol_de
 
 class EsSuperUsuarioOAdministrador(permissions.BasePermission):
     """
@@ -17,9 +18,7 @@ class EsSuperUsuarioOAdministrador(permissions.BasePermission):
         que trata de acceder a la vista es
         SuperUsuario
         """
-        usuario = request.user
-        grupo = usuario.grupo
-        return grupo.name in ["SuperUsuario", "Administrador"]
+        return rol_de(request.user).es_administracion
 
 class IsNotAuthenticated(permissions.BasePermission):
     """
@@ -66,9 +65,8 @@ class AdministradorNoModificaSuperUsuarios(permissions.BasePermission):
         eliminar o ver los detalles del SuperUsuario o
         de otro administrador
         """
-        is_grupo_usuario_admin = request.user.grupo.name == "Administrador"
-        is_grupo_obj_superuser = (obj.grupo.name == "SuperUsuario" or
-                                  obj.grupo.name == "Administrador")
+        is_grupo_usuario_admin = rol_de(request.user).es_administrador
+        is_grupo_obj_superuser = rol_de(obj).es_administracion
         if is_grupo_usuario_admin and is_grupo_obj_superuser:
             return False
 
@@ -92,10 +90,7 @@ class UsuarioNoSeModificaAsiMismo(permissions.BasePermission):
         Este metodo verifica que un usuario no pueda modificar
         su propia informacion
         """
-        usuario_request = request.user
-        usuario_a_modificar = obj
-
-        return usuario_request != usuario_a_modificar
+        return request.user.pk != obj.pk
 
 class VendedorOnly(permissions.BasePermission):
     """
@@ -108,8 +103,7 @@ class VendedorOnly(permissions.BasePermission):
         Metodo que implementa el permiso
         de VendedorOnly
         """
-        usuario = request.user
-        return str(usuario.grupo) == "Vendedor"
+        return rol_de(request.user).es_vendedor
 
     def has_object_permission(self, request, view, obj):
         """
@@ -117,8 +111,7 @@ class VendedorOnly(permissions.BasePermission):
         de los usuarios que el vendedor puede ver
         solo sea del tipo Cliente
         """
-        grupo = obj.grupo
-        return str(grupo) == "Cliente"
+        return rol_de(obj).es_cliente
 
 class OwnerOnly(permissions.BasePermission):
     """
@@ -130,6 +123,4 @@ class OwnerOnly(permissions.BasePermission):
         Metodo que implementa que el usuario
         solo puede ver su perfil
         """
-        usuario_loggeado = request.user
-        perfil_usuario = obj
-        return usuario_loggeado == perfil_usuario
+        return request.user.pk == obj.pk
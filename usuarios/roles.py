@@ -0,0 +1,57 @@
+"""
+Script que contiene los roles de los usuarios. Cada
+grupo tiene un rol calculado una sola vez al importar
+el modulo, de forma que los permisos solo consultan
+atributos del rol en lugar de comparar nombres de grupos
+"""
+from collections import namedtuple
+from usuarios.models import GRUPOS
+
+GRUPOS_STAFF = frozenset(("SuperUsuario", "Administrador", "Vendedor"))
+GRUPOS_ADMINISTRACION = frozenset(("SuperUsuario", "Administrador"))
+
+Rol = namedtuple('Rol', (
+    'nombre',
+    'es_staff',
+    'es_administracion',
+    'es_superusuario',
+    'es_administrador',
+    'es_vendedor',
+    'es_cliente',
+))
+
+def _crear_rol(nombre):
+    """
+    Precalcula los atributos del rol
+    del grupo indicado
+    """
+    return Rol(
+        nombre=nombre,
+        es_staff=nombre in GRUPOS_STAFF,
+        es_administracion=nombre in GRUPOS_ADMINISTRACION,
+        es_superusuario=nombre == "SuperUsuario",
+        es_administrador=nombre == "Administrador",
+        es_vendedor=nombre == "Vendedor",
+        es_cliente=nombre == "Cliente",
+    )
+
+# Rol de los usuarios anonimos o sin grupo
+SIN_ROL = _crear_rol(None)
+
+ROLES = {nombre: _crear_rol(nombre) for nombre in GRUPOS}
+
+def rol_de(usuario):
+    """
+    Devuelve el rol del usuario. El rol se guarda en el
+    usuario, por lo que todos los permisos de una peticion
+    usan el mismo. El grupo debe cargarse junto con el usuario
+    (select_related) para no hacer una consulta extra
+    """
+    grupo_id = getattr(usuario, 'grupo_id', None)
+    guardado = getattr(usuario, '_rol', None)
+    if guardado is not None and guardado[0] == grupo_id:
+        return guardado[1]
+
+    rol = SIN_ROL if grupo_id is None else ROLES.get(usuario.grupo.name, SIN_ROL)
+    usuario._rol = (grupo_id, rol) # pylint: disable=protected-access
+    return rol
@@ -3,6 +3,11 @@ Script que contiene los serializers
 para el modelo Usuario
 """
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from crucita_fashion.campos import CamposDinamicosMixin
 from .models import Usuario, Group
 
 class UsuarioSerializer(serializers.ModelSerializer):
@@ -98,7 +103,7 @@ class RegistroSerializer(serializers.ModelSerializer):
             'repeat_password'
         )
 
-class DetallesSerializer(serializers.ModelSerializer):
+class DetallesSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """
     Clase que implementa el serializer
     para los detalles de un usuario
@@ -107,3 +112,57 @@ class DetallesSerializer(serializers.ModelSerializer):
     class Meta:
         model = Usuario
         fields = ('first_name', 'last_name', 'email', 'grupo', 'username')
+
+def agregar_grupo(token, usuario):
+    """
+    Guarda el grupo del usuario
+    en los claims del token
+    """
+    token['grupo_id'] = usuario.grupo_id
+    token['grupo'] = usuario.grupo.name if usuario.grupo_id is not None else None
+
+class TokenGrupoSerializer(TokenObtainPairSerializer): # pylint: disable=abstract-method
+    """
+    Serializer que entrega el par de tokens (access y
+    refresh) del usuario con su grupo como claim, asi las
+    peticiones autenticadas con el token no consultan la
+    base de datos para conocer el rol del usuario
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        """
+        Agrega el grupo del usuario
+        al token
+        """
+        token = super().get_token(user)
+        agregar_grupo(token, user)
+        return token
+
+class TokenRefrescarSerializer(TokenRefreshSerializer): # pylint: disable=abstract-method
+    """
+    Serializer que entrega un nuevo token de acceso a partir
+    del refresh. El grupo se lee otra vez de la base de datos,
+    asi un usuario al que le cambian el grupo o que se desactiva
+    no conserva su rol durante la vida del refresh
+    """
+
+    def validate(self, attrs):
+        """
+        Valida el refresh y el usuario y devuelve
+        el token de acceso con el grupo actual
+        """
+        refresh = RefreshToken(attrs['refresh'])
+        usuario = Usuario.objects.select_related('grupo').filter(
+            pk=refresh[api_settings.USER_ID_CLAIM], is_active=True
+        ).first()
+        if usuario is None:
+            raise TokenError("El usuario no existe o esta inactivo")
+        agregar_grupo(refresh, usuario)
+
+        data = {'access': str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            data['refresh'] = str(refresh)
+        return data
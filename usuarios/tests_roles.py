@@ -0,0 +1,88 @@
+"""
+Script que contiene las pruebas de los roles
+de los usuarios y de las consultas que hacen
+los permisos
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework import status
+from rest_framework.test import APITestCase
+from usuarios.models import Usuario
+from usuarios.roles import rol_de, SIN_ROL
+
+class RolTest(TestCase):
+    """
+    Clase que contiene las pruebas
+    de la funcion rol_de
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def test_rol_de_cada_grupo(self):
+        """
+        Prueba que cada usuario recibe el
+        rol de su grupo
+        """
+        roles = {
+            "danielrs": ("SuperUsuario", True, True),
+            "crucita": ("Administrador", True, True),
+            "dwest06": ("Vendedor", True, False),
+            "rafaelrs": ("Cliente", False, False),
+        }
+        for username, esperado in roles.items():
+            rol = rol_de(Usuario.objects.get(username=username))
+            self.assertEqual((rol.nombre, rol.es_staff, rol.es_administracion), esperado)
+
+    def test_rol_de_usuario_anonimo(self):
+        """
+        Prueba que un usuario anonimo
+        no tiene rol
+        """
+        self.assertIs(rol_de(AnonymousUser()), SIN_ROL)
+
+    def test_rol_se_calcula_una_vez(self):
+        """
+        Prueba que despues de la primera vez el
+        rol se obtiene sin consultar la base de datos
+        """
+        usuario = Usuario.objects.get(username="crucita")
+        rol = rol_de(usuario)
+        with self.assertNumQueries(0):
+            self.assertIs(rol_de(usuario), rol)
+
+class PermisosSinConsultasTest(APITestCase):
+    """
+    Clase que prueba que los permisos no hacen
+    consultas adicionales para obtener el grupo
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def test_permisos_no_consultan_el_grupo(self):
+        """
+        Prueba que al revisar los permisos de un usuario
+        autenticado el grupo se carga junto con el usuario
+        """
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+        cliente = Usuario.objects.get(username="rafaelrs")
+        url = reverse_lazy('usuarios:administracion', args=(cliente.pk,))
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        consultas_grupo = [consulta['sql'] for consulta in consultas
+                           if consulta['sql'].startswith('SELECT "auth_group"')]
+        self.assertEqual(consultas_grupo, [])
+
+    def test_sesiones_de_model_backend_siguen_activas(self):
+        """
+        Prueba que las sesiones iniciadas con ModelBackend
+        antes del cambio de backend no se cierran
+        """
+        usuario = Usuario.objects.get(username="crucita")
+        self.client.force_login(usuario, backend='django.contrib.auth.backends.ModelBackend')
+        cliente = Usuario.objects.get(username="rafaelrs")
+        url = reverse_lazy('usuarios:administracion', args=(cliente.pk,))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
@@ -0,0 +1,117 @@
+"""
+Script que contiene las pruebas
+de la autenticacion con tokens JWT
+"""
+import base64
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.test import APITestCase
+from rest_framework import status
+from usuarios.models import Usuario, Group
+
+class TokenViewTest(APITestCase):
+    """
+    Clase que contiene las pruebas de la
+    autenticacion con tokens JWT
+    """
+    fixtures = ['groups.json', 'usuarios.json']
+
+    def setUp(self):
+        """
+        Pide el par de tokens de un
+        usuario administrador
+        """
+        data = {"username": "crucita", "password": "crucita64"}
+        self.tokens = self.client.post(reverse_lazy("usuarios:token"), data=data).data
+
+    def test_token_lleva_el_grupo(self):
+        """
+        Prueba que el token de acceso lleva
+        el grupo del usuario
+        """
+        token = AccessToken(self.tokens['access'])
+        self.assertEqual(token['grupo'], "Administrador")
+        self.assertEqual(token['grupo_id'], Group.objects.get(name="Administrador").pk)
+
+    def test_token_credenciales_invalidas(self):
+        """
+        Prueba que no se entrega el token si
+        las credenciales son invalidas
+        """
+        data = {"username": "crucita", "password": "otra"}
+        response = self.client.post(reverse_lazy("usuarios:token"), data=data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+
+    def test_refrescar_y_verificar_token(self):
+        """
+        Prueba que el refresh entrega un nuevo token de
+        acceso con el grupo y que el token es valido
+        """
+        response = self.client.post(reverse_lazy("usuarios:token_refrescar"),
+                                    data={"refresh": self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(AccessToken(response.data['access'])['grupo'], "Administrador")
+        response = self.client.post(reverse_lazy("usuarios:token_verificar"),
+                                    data={"token": response.data['access']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+
+    def test_refrescar_usa_el_grupo_actual(self):
+        """
+        Prueba que al refrescar el token se usa el grupo
+        actual del usuario y que un usuario desactivado
+        no puede refrescarlo
+        """
+        usuario = Usuario.objects.get(username="crucita")
+        usuario.grupo = Group.objects.get(name="Cliente")
+        usuario.save()
+        url = reverse_lazy("usuarios:token_refrescar")
+        response = self.client.post(url, data={"refresh": self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['grupo'], "Cliente")
+        self.assertEqual(token['grupo_id'], usuario.grupo_id)
+        response = self.client.get(reverse_lazy("usuarios:buscar"),
+                                   HTTP_AUTHORIZATION='Bearer ' + response.data['access'])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
+
+        usuario.is_active = False
+        usuario.save()
+        response = self.client.post(url, data={"refresh": self.tokens['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, msg=response.data)
+
+    def test_peticion_con_token_no_consulta_sesion_ni_usuario(self):
+        """
+        Prueba que una peticion autenticada con el token
+        no consulta las sesiones, los usuarios ni los grupos
+        """
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.tokens['access']) # pylint: disable=no-member
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(reverse_lazy("inventario:buscar"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        tablas = ('django_session', 'usuarios_usuario', 'auth_group')
+        consultas_auth = [consulta['sql'] for consulta in consultas
+                          if any(tabla in consulta['sql'] for tabla in tablas)]
+        self.assertEqual(consultas_auth, [])
+
+    def test_token_de_cliente_no_tiene_acceso_a_staff(self):
+        """
+        Prueba que los permisos usan el grupo
+        guardado en el token
+        """
+        data = {"username": "rafaelrs", "password": "jaja123"}
+        tokens = self.client.post(reverse_lazy("usuarios:token"), data=data).data
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + tokens['access']) # pylint: disable=no-member
+        response = self.client.get(reverse_lazy("inventario:buscar"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
+
+    def test_autenticacion_basica_sigue_aceptada(self):
+        """
+        Prueba que agregar el token no quita la
+        autenticacion basica de DRF
+        """
+        credenciales = base64.b64encode(b"crucita:crucita64").decode('ascii')
+        self.client.credentials(HTTP_AUTHORIZATION="Basic " + credenciales) # pylint: disable=no-member
+        response = self.client.get(reverse_lazy("inventario:buscar"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
@@ -825,6 +825,18 @@ class UsuarioBuscarView(APITestCase):
         self.assertEqual(response.data, resultado_esperado,
                          msg="Los resultados no son iguales")
 
+    def test_busqueda_con_campos_seleccionados(self):
+        """
+        Prueba que solo se devuelven los
+        campos pedidos
+        """
+        self.client.post(self.login, data=self.data)
+        response = self.client.get(self.url, {'username': "rafaelrs", 'fields': "username,grupo"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        usuario = Usuario.objects.get(username="rafaelrs")
+        self.assertEqual([dict(resultado) for resultado in response.data],
+                         [{'username': "rafaelrs", 'grupo': usuario.grupo_id}])
+
     def test_busqueda_con_username_inexistente(self):
         """
         Prueba que una busqueda con un username inexistente
@@ -5,6 +5,7 @@ con esta aplicacion
 # pylint: skip-file
 from django.urls import path
 from rest_framework.urlpatterns import format_suffix_patterns
+from rest_framework_simplejwt.views import TokenVerifyView
 from usuarios import views
 
 app_name = "usuarios"
@@ -15,6 +16,9 @@ urlpatterns = [
      path('usuarios/admin/detalle/<int:pk>',
           views.AdministracionUsuariosView.as_view(), name="administracion"),
      path('login/', views.LoginView.as_view(), name="login"),
+     path('token/', views.TokenObtenerView.as_view(), name="token"),
+     path('token/refrescar/', views.TokenRefrescarView.as_view(), name="token_refrescar"),
+     path('token/verificar/', TokenVerifyView.as_view(), name="token_verificar"),
      path('usuarios/vendedor/detalles/<int:pk>', views.VendedorUsuarioView.as_view(),
           name="vendedor_detalles"),
      path('perfil/<int:pk>', views.PerfilView.as_view(), name="perfil"),
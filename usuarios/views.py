@@ -7,8 +7,15 @@ from django.contrib.auth import authenticate, login
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, permissions, views, status
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from usuarios.models import Usuario
-from usuarios.serializers import UsuarioSerializer, RegistroSerializer, DetallesSerializer
+from usuarios.serializers import (
+    UsuarioSerializer,
+    RegistroSerializer,
+    DetallesSerializer,
+    TokenGrupoSerializer,
+    TokenRefrescarSerializer,
+)
 from usuarios.permissions import (
     EsSuperUsuarioOAdministrador,
     IsNotAuthenticated,
@@ -18,6 +25,9 @@ from usuarios.permissions import (
     OwnerOnly,
 )
 from crucita_fashion.permissions import IsStaff
+from crucita_fashion.campos import CamposDinamicosViewMixin
+from crucita_fashion.lectura_rapida import LecturaRapidaMixin
+from crucita_fashion.replicas import LecturaReplicaMixin
 
 # Create your views here.
 
@@ -61,6 +71,23 @@ class LoginView(views.APIView):
             return Response(status=status.HTTP_200_OK)
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
+class TokenObtenerView(TokenObtainPairView):
+    """
+    Vista que entrega el par de tokens JWT (access y
+    refresh) del usuario. A diferencia del LoginView no
+    crea una sesion, las peticiones se autentican con el
+    encabezado Authorization: Bearer <access>
+    """
+    serializer_class = TokenGrupoSerializer
+
+class TokenRefrescarView(TokenRefreshView):
+    """
+    Vista que entrega un nuevo token de acceso a partir
+    del refresh, con el grupo actual del usuario. Rechaza
+    el refresh de los usuarios desactivados
+    """
+    serializer_class = TokenRefrescarSerializer
+
 class AdministracionCrearUsuariosView(generics.CreateAPIView):
     """
     Vista que se encarga de la creacion de los
@@ -103,7 +130,7 @@ class AdministracionUsuariosView(generics.RetrieveDestroyAPIView): # pylint: dis
         - Vendedor
         - Cliente
     """
-    queryset = Usuario.objects.all()
+    queryset = Usuario.objects.select_related('grupo')
     serializer_class = DetallesSerializer
     permission_classes = (
         permissions.IsAuthenticated,
@@ -117,19 +144,21 @@ class VendedorUsuarioView(generics.RetrieveAPIView):
     Clase que maneja la vista de los detalles
     de un usuario siendo vendedor
     """
-    queryset = Usuario.objects.all()
+    queryset = Usuario.objects.select_related('grupo')
     serializer_class = DetallesSerializer
     permission_classes = (
         permissions.IsAuthenticated,
         VendedorOnly,
     )
 
-class UsuarioBuscarView(generics.ListAPIView):
+class UsuarioBuscarView(LecturaReplicaMixin, LecturaRapidaMixin, CamposDinamicosViewMixin, # pylint: disable=too-many-ancestors
+                        generics.ListAPIView):
     """
     Vista que implementa la busqueda de algun
-    usuario registrado en el sistema
+    usuario registrado en el sistema, se lee
+    de una replica si hay
     """
-    queryset = Usuario.objects.all()
+    queryset = Usuario.objects.select_related('grupo')
     serializer_class = DetallesSerializer
     filter_backends = (DjangoFilterBackend,)
     filter_fields = ('username', 'email', 'first_name', 'last_name', 'grupo',)
@@ -144,7 +173,7 @@ class PerfilView(generics.RetrieveUpdateAPIView):
     al usuario actualizar la informacion de
     su perfil
     """
-    queryset = Usuario.objects.all()
+    queryset = Usuario.objects.select_related('grupo')
     serializer_class = UsuarioSerializer
     permission_classes = (
         permissions.IsAuthenticated,
@@ -0,0 +1,77 @@
+# Generated by Django 2.1.5 on 2026-10-18 11:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copiar_productos_a_lineas(apps, schema_editor):
+    '''
+    Convierte cada producto de una venta en una linea
+    de una unidad al costo actual del producto
+    '''
+    Ventas = apps.get_model('ventas', 'Ventas')
+    LineaVenta = apps.get_model('ventas', 'LineaVenta')
+    alias = schema_editor.connection.alias
+    relaciones = Ventas.producto.through.objects.using(alias).select_related('producto')
+    LineaVenta.objects.using(alias).bulk_create([
+        LineaVenta(
+            venta_id=relacion.ventas_id,
+            producto_id=relacion.producto_id,
+            cantidad=1,
+            precio_unitario=relacion.producto.costo,
+        )
+        for relacion in relaciones.iterator()
+    ], batch_size=1000)
+
+
+def copiar_lineas_a_productos(apps, schema_editor):
+    '''
+    Devuelve las lineas de las ventas a la relacion
+    entre ventas y productos
+    '''
+    Ventas = apps.get_model('ventas', 'Ventas')
+    LineaVenta = apps.get_model('ventas', 'LineaVenta')
+    Relacion = Ventas.producto.through
+    alias = schema_editor.connection.alias
+    Relacion.objects.using(alias).bulk_create([
+        Relacion(ventas_id=linea.venta_id, producto_id=linea.producto_id)
+        for linea in LineaVenta.objects.using(alias).iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0001_initial'),
+        ('ventas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LineaVenta',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.PositiveIntegerField()),
+                ('precio_unitario', models.FloatField()),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventario.Producto')),
+                ('venta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lineas', to='ventas.Ventas')),
+            ],
+            options={
+                'ordering': ('pk',),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='lineaventa',
+            unique_together={('venta', 'producto')},
+        ),
+        migrations.RunPython(copiar_productos_a_lineas, copiar_lineas_a_productos),
+        migrations.RemoveField(
+            model_name='ventas',
+            name='producto',
+        ),
+        migrations.AddField(
+            model_name='ventas',
+            name='producto',
+            field=models.ManyToManyField(through='ventas.LineaVenta', to='inventario.Producto'),
+        ),
+    ]
@@ -12,8 +12,23 @@ class Ventas(models.Model):
     Tabla de Ventas, guarda los datos necesarios
     al momento de una venta
     '''
-    producto = models.ManyToManyField(Producto)
+    producto = models.ManyToManyField(Producto, through='LineaVenta')
     codigo = models.CharField(unique=True, max_length=500)
     costo_total = models.FloatField()
     fecha = models.DateField()
     hora = models.DateTimeField()
+
+class LineaVenta(models.Model):
+    '''
+    Tabla de las lineas de una venta, guarda cuantas
+    unidades de un producto se vendieron y el precio
+    que tenia el producto al momento de la venta
+    '''
+    venta = models.ForeignKey(Ventas, related_name='lineas', on_delete=models.CASCADE)
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE)
+    cantidad = models.PositiveIntegerField()
+    precio_unitario = models.FloatField()
+
+    class Meta:
+        unique_together = ('venta', 'producto')
+        ordering = ('pk',)
@@ -1,13 +1,125 @@
 '''
 Script de los serializers del modulo de ventas
 '''
+from collections import OrderedDict
+from django.db import transaction
+from django.db.models import F, FloatField, Sum
 from rest_framework import serializers
-from .models import Ventas
+from inventario.models import Producto
+from crucita_fashion.campos import CamposDinamicosMixin
+from crucita_fashion.lectura_rapida import CampoRapido
+from .models import Ventas, LineaVenta
 
-class VentasSerializer(serializers.ModelSerializer):
+class LineaVentaSerializer(serializers.ModelSerializer):
+    '''
+    Clase que representa el serializer de las lineas
+    de una venta. El producto se recibe como su pk y se
+    valida junto con el resto de las lineas en VentasSerializer
+    para no hacer una consulta por cada linea
+    '''
+    producto = serializers.IntegerField(source='producto_id')
+    cantidad = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = LineaVenta
+        fields = ('producto', 'cantidad', 'precio_unitario')
+        read_only_fields = ('precio_unitario',)
+
+class VentasSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     '''
     Clase que representa el serializer de las Ventas
     '''
+    producto = serializers.SerializerMethodField()
+    lineas = LineaVentaSerializer(many=True, required=False)
+    dependencias = {'producto': ('lineas',)}
+    campos_rapidos = {'producto': CampoRapido('producto_id', relacion='lineas')}
+
+    def get_producto(self, venta): # pylint: disable=no-self-use
+        '''
+        Devuelve los pk de los productos vendidos a partir
+        de las lineas de la venta
+        '''
+        return [linea.producto_id for linea in venta.lineas.all()]
+
+    def validate_lineas(self, lineas): # pylint: disable=no-self-use
+        '''
+        Metodo que valida las lineas de una venta. Junta las
+        lineas de un mismo producto y trae todos los productos
+        vendidos en una sola consulta
+        '''
+        if not lineas:
+            raise serializers.ValidationError("La venta debe tener al menos un producto")
+
+        cantidades = OrderedDict()
+        for linea in lineas:
+            producto = linea['producto_id']
+            cantidades[producto] = cantidades.get(producto, 0) + linea['cantidad']
+
+        productos = Producto.objects.only('costo').in_bulk(list(cantidades))
+        faltantes = [pk for pk in cantidades if pk not in productos]
+        if faltantes:
+            raise serializers.ValidationError(
+                "Los productos {} no existen".format(faltantes)
+            )
+
+        return [
+            {'producto': productos[pk], 'cantidad': cantidad}
+            for pk, cantidad in cantidades.items()
+        ]
+
+    def validate(self, data): #pylint: disable=arguments-differ
+        '''
+        Metodo que valida que al crear una venta
+        se indiquen sus lineas
+        '''
+        if self.instance is None and 'lineas' not in data:
+            raise serializers.ValidationError({'lineas': "Este campo es requerido"})
+        return data
+
+    def create(self, validated_data):
+        '''
+        Crea la venta con todas sus lineas en un solo INSERT y
+        descuenta las unidades vendidas de cada producto en la
+        misma transaccion. El costo total se calcula en la base
+        de datos a partir de las lineas. Si algun producto no
+        tiene existencias no se registra la venta
+        '''
+        lineas = validated_data.pop('lineas')
+        with transaction.atomic():
+            venta = Ventas.objects.create(costo_total=0, **validated_data)
+            cantidades = {linea['producto'].pk: linea['cantidad'] for linea in lineas}
+            descontados = Producto.objects.descontar_existencias(cantidades)
+            if descontados != len(cantidades):
+                raise serializers.ValidationError(
+                    {'lineas': "No hay existencias suficientes de los productos vendidos"}
+                )
+            LineaVenta.objects.bulk_create([
+                LineaVenta(
+                    venta=venta,
+                    producto=linea['producto'],
+                    cantidad=linea['cantidad'],
+                    precio_unitario=linea['producto'].costo,
+                )
+                for linea in lineas
+            ])
+            venta.costo_total = venta.lineas.aggregate(
+                total=Sum(F('cantidad') * F('precio_unitario'), output_field=FloatField())
+            )['total']
+            venta.save(update_fields=['costo_total'])
+        return venta
+
+    def update(self, instance, validated_data):
+        '''
+        Actualiza los datos de la venta. Las lineas
+        no se pueden modificar una vez creada la venta
+        '''
+        if 'lineas' in validated_data:
+            raise serializers.ValidationError(
+                {'lineas': "Las lineas de una venta no se pueden modificar"}
+            )
+        return super().update(instance, validated_data)
+
     class Meta:
         model = Ventas
-        fields = ('producto', 'codigo', 'costo_total', 'fecha', 'hora')
+        fields = ('producto', 'lineas', 'codigo', 'costo_total', 'fecha', 'hora')
+        read_only_fields = ('costo_total',)
@@ -7,7 +7,7 @@ from django.test import TestCase # pylint: disable=unused-import
 from django.utils import timezone
 from inventario.models import Producto, Categoria # pylint: disable=unused-import
 from .serializers import VentasSerializer
-from .models import Ventas
+from .models import Ventas, LineaVenta
 
 class VentaSerializerTest(TestCase):
     '''
@@ -32,12 +32,16 @@ class VentaSerializerTest(TestCase):
             hora=self.hora,
         )
 
-        self.venta.producto.add(self.producto)
+        LineaVenta.objects.create(
+            venta=self.venta,
+            producto=self.producto,
+            cantidad=1,
+            precio_unitario=1,
+        )
 
         self.venta_json = {
-            'producto' : [self.producto.pk],
+            'lineas' : [{'producto': self.producto.pk, 'cantidad': 1}],
             'codigo' : '1b',
-            'costo_total': 1,
             'fecha': self.fecha,
             'hora' : self.hora,
         }
@@ -49,6 +53,7 @@ class VentaSerializerTest(TestCase):
         '''
         venta1 = {
             'producto' : [self.producto.pk],
+            'lineas' : [{'producto': self.producto.pk, 'cantidad': 1, 'precio_unitario': 1.0}],
             'codigo' : '1a',
             'costo_total': 1,
             'fecha': self.fecha,
@@ -86,7 +91,7 @@ class VentaSerializerTest(TestCase):
         de fecha es incorrecto
         '''
         venta1 = {
-            'producto' : Producto.objects.get(pk=1),
+            'lineas' : [{'producto': 1, 'cantidad': 1}],
             'codigo' : '1a',
             'costo_total': 1,
             'fecha': '1 1 2018',
@@ -109,7 +114,7 @@ class VentaSerializerTest(TestCase):
         de hora es incorrecto
         '''
         venta1 = {
-            'producto' : Producto.objects.get(pk=1),
+            'lineas' : [{'producto': 1, 'cantidad': 1}],
             'codigo' : '1a',
             'costo_total': 1,
             'fecha': date.today(),
@@ -132,3 +137,54 @@ class VentaSerializerTest(TestCase):
         }
         venta_serializer = VentasSerializer(data=venta1)
         self.assertFalse(venta_serializer.is_valid(), msg=venta_serializer.errors)
+
+    def test_lineas_requeridas_al_crear(self):
+        '''
+        Prueba que is_valid() devuelve false si la
+        venta no tiene lineas
+        '''
+        venta1 = dict(self.venta_json)
+        del venta1['lineas']
+        venta_serializer = VentasSerializer(data=venta1)
+        self.assertFalse(venta_serializer.is_valid(), msg=venta_serializer.errors)
+        venta1['lineas'] = []
+        venta_serializer = VentasSerializer(data=venta1)
+        self.assertFalse(venta_serializer.is_valid(), msg=venta_serializer.errors)
+
+    def test_lineas_con_producto_inexistente(self):
+        '''
+        Prueba que is_valid() devuelve false si alguna
+        linea tiene un producto que no existe
+        '''
+        self.venta_json['lineas'].append({'producto': 100, 'cantidad': 1})
+        venta_serializer = VentasSerializer(data=self.venta_json)
+        self.assertFalse(venta_serializer.is_valid(), msg=venta_serializer.errors)
+
+    def test_lineas_cantidad_positiva(self):
+        '''
+        Prueba que is_valid() devuelve false si la
+        cantidad de una linea no es positiva
+        '''
+        self.venta_json['lineas'][0]['cantidad'] = 0
+        venta_serializer = VentasSerializer(data=self.venta_json)
+        self.assertFalse(venta_serializer.is_valid(), msg=venta_serializer.errors)
+
+    def test_costo_total_calculado(self):
+        '''
+        Prueba que el costo total lo calcula el servidor
+        a partir de las lineas e ignora el enviado
+        '''
+        Producto.objects.filter(pk=1).update(cantidad=3, costo=2.5)
+        self.venta_json['costo_total'] = 100
+        self.venta_json['lineas'] = [
+            {'producto': 1, 'cantidad': 2},
+            {'producto': 2, 'cantidad': 1},
+        ]
+        venta_serializer = VentasSerializer(data=self.venta_json)
+        self.assertTrue(venta_serializer.is_valid(), msg=venta_serializer.errors)
+        venta = venta_serializer.save()
+        self.assertEqual(venta.costo_total, 6)
+        self.assertEqual(
+            list(venta.lineas.values_list('producto', 'cantidad', 'precio_unitario')),
+            [(1, 2, 2.5), (2, 1, 1.0)]
+        )
@@ -0,0 +1,250 @@
+'''
+Script que contiene las pruebas relacionadas
+con las vistas del modulo de ventas
+'''
+import json
+from datetime import date
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse_lazy
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.models import Producto, Categoria
+from ventas.models import Ventas, LineaVenta
+
+class VentasCrearViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    que se encarga de crear una venta
+    '''
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        '''
+        Inicializa la informacion necesaria para
+        realizar las pruebas
+        '''
+        self.url = reverse_lazy('ventas:crear')
+        self.venta = {
+            'lineas': [{'producto': 1, 'cantidad': 1}, {'producto': 2, 'cantidad': 1}],
+            'codigo': '1a',
+            'fecha': str(date.today()),
+            'hora': str(timezone.now()),
+        }
+
+    def test_crear_venta_descuenta_existencias(self):
+        '''
+        Prueba que al crear una venta se descuentan las
+        unidades vendidas de cada producto
+        '''
+        Producto.objects.filter(pk=1).update(cantidad=5)
+        self.venta['lineas'][0]['cantidad'] = 3
+        response = self.client.post(self.url, data=self.venta, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        self.assertEqual(Producto.objects.get(pk=1).cantidad, 2)
+        self.assertEqual(Producto.objects.get(pk=2).cantidad, 0)
+        self.assertEqual(response.data['costo_total'], 4)
+        self.assertEqual(response.data['producto'], [1, 2])
+
+    def test_crear_venta_sin_existencias(self):
+        '''
+        Prueba que si un producto no tiene existencias la
+        venta no se registra y no se descuenta ningun producto
+        '''
+        Producto.objects.filter(pk=2).update(cantidad=0)
+        response = self.client.post(self.url, data=self.venta, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertEqual(Ventas.objects.count(), 0)
+        self.assertEqual(Producto.objects.get(pk=1).cantidad, 1)
+
+    def test_crear_venta_descuenta_en_una_consulta(self):
+        '''
+        Prueba que el descuento de las existencias se hace
+        con un solo UPDATE sin importar cuantos productos
+        se vendan
+        '''
+        cantidades = {1: 1, 2: 1}
+        with self.assertNumQueries(1):
+            descontados = Producto.objects.descontar_existencias(cantidades)
+        self.assertEqual(descontados, 2)
+
+    def test_crear_venta_con_numero_fijo_de_consultas(self):
+        '''
+        Prueba que crear una venta hace el mismo numero
+        de consultas sin importar cuantos productos tenga
+        '''
+        categoria = Categoria.objects.get(nombre="Accesorio")
+        productos = [
+            Producto.objects.create(codigo=str(numero), cantidad=1, costo=1, categoria=categoria)
+            for numero in range(10)
+        ]
+        self.venta['lineas'] = [{'producto': productos[0].pk, 'cantidad': 1}]
+        with CaptureQueriesContext(connection) as una_linea:
+            response = self.client.post(self.url, data=self.venta, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+
+        self.venta['codigo'] = '1b'
+        self.venta['lineas'] = [
+            {'producto': producto.pk, 'cantidad': 1} for producto in productos[1:]
+        ]
+        with CaptureQueriesContext(connection) as nueve_lineas:
+            response = self.client.post(self.url, data=self.venta, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+        self.assertEqual(len(una_linea), len(nueve_lineas))
+
+    def test_modificar_lineas_de_una_venta(self):
+        '''
+        Prueba que las lineas de una venta no se
+        pueden modificar despues de creada
+        '''
+        response = self.client.post(self.url, data=self.venta, format='json')
+        url = reverse_lazy('ventas:detalles', args=(Ventas.objects.get().pk,))
+        response = self.client.patch(url, data={'lineas': self.venta['lineas']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        response = self.client.patch(url, data={'codigo': '1c'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+
+class VentasBuscarViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    que lista las ventas
+    '''
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        '''
+        Crea varias ventas con productos para
+        realizar las pruebas
+        '''
+        productos = list(Producto.objects.all())
+        for numero in range(10):
+            venta = Ventas.objects.create(
+                codigo=str(numero),
+                costo_total=2,
+                fecha=date.today(),
+                hora=timezone.now(),
+            )
+            LineaVenta.objects.bulk_create([
+                LineaVenta(venta=venta, producto=producto, cantidad=1, precio_unitario=1)
+                for producto in productos
+            ])
+
+    def test_listar_ventas_con_numero_fijo_de_consultas(self):
+        '''
+        Prueba que listar las ventas hace una consulta
+        para las ventas y otra para sus lineas sin
+        importar cuantas ventas haya
+        '''
+        url = reverse_lazy('ventas:buscar')
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]['producto'], [1, 2])
+
+    def test_detalles_de_venta_con_numero_fijo_de_consultas(self):
+        '''
+        Prueba que ver los detalles de una venta hace
+        una consulta para la venta y otra para sus lineas
+        '''
+        url = reverse_lazy('ventas:detalles', args=(Ventas.objects.first().pk,))
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+
+    def test_listar_ventas_sin_lineas(self):
+        '''
+        Prueba que si no se piden los productos ni
+        las lineas no se consultan las lineas
+        '''
+        url = reverse_lazy('ventas:buscar')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'fields': "codigo,costo_total"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK, msg=response.data)
+        self.assertEqual(dict(response.data[0]), {'codigo': "0", 'costo_total': 2})
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'omit': "lineas"})
+        self.assertEqual(response.data[0]['producto'], [1, 2])
+        self.assertNotIn('lineas', response.data[0])
+
+class VentasExportarViewTest(APITestCase):
+    '''
+    Clase que contiene las pruebas de la vista
+    que exporta las ventas
+    '''
+    fixtures = ['fixtures', 'groups.json', 'usuarios.json']
+
+    def setUp(self):
+        '''
+        Crea dos ventas en fechas distintas e inicia
+        sesion con un usuario del staff
+        '''
+        productos = list(Producto.objects.order_by('pk'))
+        for codigo, fecha, lineas in (('v1', date(2019, 1, 1), 2), ('v2', date(2019, 2, 1), 1)):
+            venta = Ventas.objects.create(
+                codigo=codigo,
+                costo_total=lineas,
+                fecha=fecha,
+                hora=timezone.now(),
+            )
+            LineaVenta.objects.bulk_create([
+                LineaVenta(venta=venta, producto=producto, cantidad=1, precio_unitario=1)
+                for producto in productos[:lineas]
+            ])
+        self.url = reverse_lazy('ventas:exportar')
+        login = reverse_lazy('usuarios:login')
+        self.client.post(login, data={"username": "crucita", "password": "crucita64"})
+
+    def test_exportar_una_fila_por_linea(self):
+        '''
+        Prueba que en CSV se exporta una fila
+        por cada linea de venta
+        '''
+        response = self.client.get(self.url + "?formato=csv")
+        self.assertEqual(response['Content-Type'], "text/csv; charset=utf-8")
+        filas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(filas[0], "venta,fecha,hora,costo_total,producto,cantidad,precio_unitario")
+        self.assertEqual([fila.split(',')[0] for fila in filas[1:]], ['v1', 'v1', 'v2'])
+        self.assertEqual(filas[1].split(',')[4], '12hy4')
+
+    def test_exportar_jsonl_agrupado_por_venta(self):
+        '''
+        Prueba que en JSONL se exporta un objeto
+        por venta con sus lineas
+        '''
+        response = self.client.get(self.url + "?formato=jsonl")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ventas = [
+            json.loads(linea)
+            for linea in b''.join(response.streaming_content).decode('utf-8').splitlines()
+        ]
+        self.assertEqual([venta['codigo'] for venta in ventas], ['v1', 'v2'])
+        self.assertEqual(ventas[0]['fecha'], '2019-01-01')
+        self.assertEqual(ventas[0]['lineas'], [
+            {'producto': '12hy4', 'cantidad': 1, 'precio_unitario': 1.0},
+            {'producto': '163gh4', 'cantidad': 1, 'precio_unitario': 1.0},
+        ])
+
+    def test_exportar_entre_fechas(self):
+        '''
+        Prueba que se pueden exportar solo las
+        ventas entre dos fechas
+        '''
+        response = self.client.get(self.url + "?formato=jsonl&desde=2019-01-15&hasta=2019-12-31")
+        ventas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(venta)['codigo'] for venta in ventas], ['v2'])
+        response = self.client.get(self.url + "?desde=15-01-2019")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        response = self.client.get(self.url + "?hasta=2020-02-30")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, msg=response.data)
+        self.assertEqual(response.data, {'hasta': "La fecha debe tener el formato AAAA-MM-DD"})
+
+    def test_exportar_sin_autenticar(self):
+        '''
+        Prueba que un usuario no autenticado
+        no puede exportar las ventas
+        '''
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN, msg=response.data)
@@ -9,9 +9,10 @@ from ventas import views
 app_name = 'ventas'
 
 urlpatterns = [
-    path('', views.VentasBuscarView.as_view()),
-    path('crear', views.VentasCrearView.as_view()),
-    path('<int:pk>', views.VentasDetallesView.as_view()),
+    path('', views.VentasBuscarView.as_view(), name='buscar'),
+    path('crear', views.VentasCrearView.as_view(), name='crear'),
+    path('<int:pk>', views.VentasDetallesView.as_view(), name='detalles'),
+    path('exportar', views.VentasExportarView.as_view(), name='exportar'),
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
@@ -2,17 +2,27 @@
 Script que contendra las vistas que manejara
 la informacion que proveera este modulo
 '''
+from itertools import groupby
+from operator import itemgetter
 from django.shortcuts import render # pylint: disable=unused-import
-from rest_framework import generics
-from ventas.models import Ventas
+from django.utils.dateparse import parse_date
+from rest_framework import generics, permissions, status, views
+from rest_framework.response import Response
+from ventas.models import Ventas, LineaVenta
 from ventas.serializers import VentasSerializer
+from crucita_fashion.exportacion import respuesta_exportacion, formato_exportacion
+from crucita_fashion.permissions import IsStaff
+from crucita_fashion.campos import CamposDinamicosViewMixin
+from crucita_fashion.lectura_rapida import LecturaRapidaMixin
+from crucita_fashion.replicas import LecturaReplicaMixin
 
 # Create your views here.
 
 class VentasCrearView(generics.CreateAPIView):
     '''
     Vista que se encarga de la creacion de una venta
-    para ser anadida al sistema
+    para ser anadida al sistema. Al crearla se descuentan
+    las existencias de los productos vendidos
     '''
     queryset = Ventas.objects.all()
     serializer_class = VentasSerializer
@@ -21,13 +31,86 @@ class VentasDetallesView(generics.RetrieveUpdateDestroyAPIView): # pylint: disab
     '''
     Vista que se encarga de ver, modificar o eliminar una venta
     '''
-    queryset = Ventas.objects.all()
+    queryset = Ventas.objects.prefetch_related('lineas')
     serializer_class = VentasSerializer
 
-class VentasBuscarView(generics.ListAPIView):
+class VentasBuscarView(LecturaReplicaMixin, LecturaRapidaMixin, CamposDinamicosViewMixin, # pylint: disable=too-many-ancestors
+                       generics.ListAPIView):
     '''
     Vista que se encarga de buscar y mostrar una Venta o una lista
-    de ventas
+    de ventas. Las lineas de todas las ventas se traen
+    en una sola consulta adicional, que se omite si no se
+    piden los campos producto ni lineas (?fields=). Se lee
+    de una replica si hay
     '''
-    queryset = Ventas.objects.all()
+    queryset = Ventas.objects.prefetch_related('lineas')
     serializer_class = VentasSerializer
+
+class VentasExportarView(views.APIView):
+    '''
+    Vista que exporta las ventas en CSV o JSONL (parametro
+    formato), opcionalmente entre dos fechas (parametros desde
+    y hasta). En CSV hay una fila por cada linea de venta y en
+    JSONL un objeto por venta con sus lineas. Las lineas se leen
+    de la base de datos por partes junto con su venta y se envian
+    a medida que se leen
+    '''
+    permission_classes = (
+        permissions.IsAuthenticated,
+        IsStaff,
+    )
+    campos = (
+        'venta__codigo', 'venta__fecha', 'venta__hora', 'venta__costo_total',
+        'producto__codigo', 'cantidad', 'precio_unitario',
+    )
+    columnas = ('venta', 'fecha', 'hora', 'costo_total', 'producto', 'cantidad', 'precio_unitario')
+
+    def get(self, request):
+        '''
+        Devuelve la respuesta con las lineas de las
+        ventas ordenadas por venta
+        '''
+        lineas = LineaVenta.objects.order_by('venta_id', 'pk')
+        formato = formato_exportacion(request)
+        for parametro, filtro in (('desde', 'venta__fecha__gte'), ('hasta', 'venta__fecha__lte')):
+            if parametro in request.query_params:
+                try:
+                    fecha = parse_date(request.query_params[parametro])
+                except ValueError:
+                    # Bien formada pero invalida (ej: 2020-02-30)
+                    fecha = None
+                if fecha is None:
+                    return Response({parametro: "La fecha debe tener el formato AAAA-MM-DD"},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                lineas = lineas.filter(**{filtro: fecha})
+
+        filas = (
+            dict(zip(self.columnas, linea))
+            for linea in lineas.values_list(*self.campos).iterator(chunk_size=2000)
+        )
+        if formato == 'jsonl':
+            filas = self.agrupar_por_venta(filas)
+        return respuesta_exportacion(filas, self.columnas, formato, 'ventas')
+
+    @staticmethod
+    def agrupar_por_venta(filas):
+        '''
+        Junta las lineas consecutivas de una misma
+        venta en un solo objeto
+        '''
+        for codigo, lineas in groupby(filas, key=itemgetter('venta')):
+            lineas = list(lineas)
+            yield {
+                'codigo': codigo,
+                'costo_total': lineas[0]['costo_total'],
+                'fecha': lineas[0]['fecha'],
+                'hora': lineas[0]['hora'],
+                'lineas': [
+                    {
+                        'producto': linea['producto'],
+                        'cantidad': linea['cantidad'],
+                        'precio_unitario': linea['precio_unitario'],
+                    }
+                    for linea in lineas
+                ],
+            }